@@ -0,0 +1,146 @@
+"""
+Backfill command for rebuilding article_words from stored headlines
+
+Run this after changing the word exclusion lists so that historical articles are
+tokenized the same way as newly scraped ones. Progress is checkpointed after every
+committed batch, so an interrupted run picks up where it left off. The daily word
+rollups, word co-occurrence and cached scoreboards are rebuilt once every article
+has been rewritten.
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from config import BACKFILL_CONFIG, WORD_PROCESSING_CONFIG
+from database import DatabaseManager
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Word processor owned by each tokenizer process
+_word_processor = None
+
+def _init_worker():
+    """Create the word processor once per tokenizer process"""
+    global _word_processor
+    from word_processor import WordProcessor
+    _word_processor = WordProcessor()
+
+def tokenize_batch(rows: List[Tuple[int, str]]) -> Dict[int, Dict[str, int]]:
+    """Tokenize a batch of (id, headline) rows into word frequencies per article ID"""
+    word_frequencies = _word_processor.analyze_headlines_batch(
+        [headline for _, headline in rows],
+        min_frequency=1,
+        top_n=WORD_PROCESSING_CONFIG['max_words_per_article']
+    )
+    return {article_id: words for (article_id, _), words in zip(rows, word_frequencies)}
+
+def load_checkpoint(path: str) -> Dict:
+    """Load backfill progress, or start from the beginning"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'last_article_id': 0, 'articles_processed': 0}
+
+def save_checkpoint(path: str, checkpoint: Dict):
+    """Atomically write backfill progress"""
+    checkpoint['updated_at'] = datetime.now(timezone.utc).isoformat()
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(temp_path, path)
+
+def run_backfill(batch_size: int = None, workers: int = None, checkpoint_file: str = None,
+                 restart: bool = False) -> int:
+    """Re-tokenize every stored headline and rewrite article_words, returning the number of articles processed"""
+    batch_size = batch_size or BACKFILL_CONFIG['batch_size']
+    workers = workers or BACKFILL_CONFIG['workers']
+    checkpoint_file = checkpoint_file or BACKFILL_CONFIG['checkpoint_file']
+    
+    if restart and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    
+    checkpoint = load_checkpoint(checkpoint_file)
+    if checkpoint['last_article_id']:
+        logger.info(f"Resuming backfill after article {checkpoint['last_article_id']} "
+                    f"({checkpoint['articles_processed']} articles already processed)")
+    
+    start = time.monotonic()
+    processed_this_run = 0
+    
+    with DatabaseManager() as db_manager, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        # Keep a bounded number of batches in flight so memory stays flat
+        pending = deque()
+        
+        def write_oldest():
+            nonlocal processed_this_run
+            article_words = pending.popleft().result()
+            db_manager.replace_article_words_batch(article_words)
+            
+            checkpoint['last_article_id'] = max(article_words)
+            checkpoint['articles_processed'] += len(article_words)
+            save_checkpoint(checkpoint_file, checkpoint)
+            
+            processed_this_run += len(article_words)
+            rate = processed_this_run / max(time.monotonic() - start, 1e-9)
+            logger.info(f"Backfilled through article {checkpoint['last_article_id']} "
+                        f"({checkpoint['articles_processed']} total, {rate:.0f} articles/s)")
+        
+        for rows in db_manager.iter_article_headlines(checkpoint['last_article_id'], batch_size):
+            pending.append(executor.submit(tokenize_batch, rows))
+            if len(pending) >= workers * 2:
+                write_oldest()
+        
+        while pending:
+            write_oldest()
+        
+        db_manager.rebuild_word_rollups()
+        db_manager.rebuild_word_cooccurrence()
+        db_manager.refresh_scoreboard_cache()
+    
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    
+    logger.info(f"Backfill completed: {processed_this_run} articles in {time.monotonic() - start:.1f}s")
+    return processed_this_run
+
+def main():
+    """Parse arguments and run the backfill"""
+    parser = argparse.ArgumentParser(description="Rebuild article_words from stored headlines")
+    parser.add_argument('--batch-size', type=int, default=BACKFILL_CONFIG['batch_size'],
+                        help="articles re-tokenized and rewritten per transaction")
+    parser.add_argument('--workers', type=int, default=BACKFILL_CONFIG['workers'],
+                        help="number of tokenizer processes")
+    parser.add_argument('--checkpoint-file', default=BACKFILL_CONFIG['checkpoint_file'],
+                        help="file used to record progress between runs")
+    parser.add_argument('--restart', action='store_true',
+                        help="ignore any saved progress and start from the first article")
+    parser.add_argument('--rollups-only', action='store_true',
+                        help="only rebuild the daily word rollups and co-occurrence from the stored article_words")
+    args = parser.parse_args()
+    
+    if args.rollups_only:
+        with DatabaseManager() as db_manager:
+            db_manager.rebuild_word_rollups()
+            db_manager.rebuild_word_cooccurrence()
+            db_manager.refresh_scoreboard_cache()
+        return
+    
+    run_backfill(
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_file=args.checkpoint_file,
+        restart=args.restart
+    )
+
+if __name__ == "__main__":
+    main()
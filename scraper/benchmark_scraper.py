@@ -0,0 +1,303 @@
+"""
+Throughput benchmark for the scraper's processing stages
+
+Word processing, RSS and HTML parsing and database ingest are timed on a seeded
+synthetic corpus at several corpus sizes. Results are printed and can be written
+to a JSON baseline; a later run given --compare fails when a stage has slowed
+down by more than the tolerance, so regressions show up between commits. With
+--recording, the HTML stage parses the homepages of an http_replay.py recording
+instead of synthetic pages.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from config import DATABASE_CONFIG, NEWS_SOURCES, SCRAPING_CONFIG, WORD_PROCESSING_CONFIG
+from synthetic_corpus import SyntheticCorpus
+
+SCRAPER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BENCHMARK_STAGES = ['clean', 'tokenize', 'analyze', 'rss_parse', 'html_parse', 'ingest']
+
+# Number of headlines or articles each stage processes per run
+DEFAULT_SIZES = [1000, 10000]
+
+# Fraction a stage's median may grow by over the baseline before it counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Source config the synthetic website pages are parsed with
+HTML_SOURCE_CONFIG = {
+    'name': 'Synthetic News',
+    'url': 'https://synthetic.example.com/',
+    'headline_selectors': ['h1', 'h2', 'h3', '.headline', '.title'],
+}
+
+def time_runs(run: Callable, setup: Callable, repeat: int) -> List[float]:
+    """Time repeated runs of a stage, calling setup (untimed) before each one"""
+    timings = []
+    for _ in range(repeat):
+        arguments = setup()
+        start = time.perf_counter()
+        run(*arguments)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def split_feeds(articles: List[Dict]) -> List[List[Dict]]:
+    """Split articles into feed-sized groups"""
+    size = SCRAPING_CONFIG['max_articles_per_source']
+    return [articles[index:index + size] for index in range(0, len(articles), size)]
+
+class ScraperBenchmark:
+    """Runs the benchmark stages against one synthetic corpus"""
+    
+    def __init__(self, seed: int = 0, repeat: int = 3, recording: str = None):
+        self.seed = seed
+        self.repeat = repeat
+        self.recording = recording
+        self.corpus = SyntheticCorpus(seed)
+        self._scraper = None
+    
+    @property
+    def scraper(self):
+        """Scraper whose parsing methods are timed, created on first use"""
+        if self._scraper is None:
+            from news_scraper import NewsScraper
+            self._scraper = NewsScraper()
+        return self._scraper
+    
+    def _processor(self):
+        """Get a word processor with a cold chunk cache"""
+        from word_processor import WordProcessor
+        return WordProcessor()
+    
+    def bench_clean(self, size: int) -> List[float]:
+        """Time text cleaning of headlines"""
+        headlines = self.corpus.headlines(size)
+        return time_runs(
+            lambda processor: [processor.clean_text(headline) for headline in headlines],
+            lambda: (self._processor(),),
+            self.repeat
+        )
+    
+    def bench_tokenize(self, size: int) -> List[float]:
+        """Time fast tokenization of headlines"""
+        headlines = self.corpus.headlines(size)
+        return time_runs(
+            lambda processor: [processor.fast_tokenize(headline) for headline in headlines],
+            lambda: (self._processor(),),
+            self.repeat
+        )
+    
+    def bench_analyze(self, size: int) -> List[float]:
+        """Time per-headline word frequency analysis, as done for each scraped source"""
+        headlines = self.corpus.headlines(size)
+        return time_runs(
+            lambda processor: processor.analyze_headlines_batch(
+                headlines, min_frequency=1, top_n=WORD_PROCESSING_CONFIG['max_words_per_article']
+            ),
+            lambda: (self._processor(),),
+            self.repeat
+        )
+    
+    def bench_rss_parse(self, size: int) -> List[float]:
+        """Time parsing feed-sized RSS documents into articles"""
+        feeds = [self.corpus.rss_feed(articles) for articles in split_feeds(self.corpus.articles(size))]
+        scraper = self.scraper
+        return time_runs(
+            lambda: [list(scraper.parse_feed_articles(feed)) for feed in feeds],
+            lambda: (),
+            self.repeat
+        )
+    
+    def _recorded_homepages(self, size: int) -> List[tuple]:
+        """Get size recorded homepages, cycling through the recording, each with its source config"""
+        from http_replay import Recording
+        recording = Recording(self.recording)
+        homepages = []
+        for source_config in NEWS_SOURCES.values():
+            response = recording.get(source_config['url'])
+            if response and response['status'] == 200:
+                homepages.append((response['body'], source_config))
+        if not homepages:
+            raise ValueError(f"no homepages recorded in {self.recording}")
+        return [homepages[index % len(homepages)] for index in range(size)]
+    
+    def bench_html_parse(self, size: int) -> List[float]:
+        """Time extracting headlines from feed-sized website pages, or from size recorded homepages"""
+        if self.recording:
+            pages = self._recorded_homepages(size)
+        else:
+            pages = [(self.corpus.html_page(articles), HTML_SOURCE_CONFIG)
+                     for articles in split_feeds(self.corpus.articles(size))]
+        scraper = self.scraper
+        return time_runs(
+            lambda: [scraper.parse_website_headlines(page, source_config) for page, source_config in pages],
+            lambda: (),
+            self.repeat
+        )
+    
+    def bench_ingest(self, size: int) -> List[float]:
+        """Time saving analyzed articles in per-source batches, with rollup maintenance"""
+        from database import DatabaseManager
+        processor = self._processor()
+        run_id = time.time_ns()
+        
+        def setup():
+            # Fresh articles each run, so every run inserts instead of skipping stored URLs
+            by_source = defaultdict(list)
+            for article in self.corpus.articles(size):
+                by_source[article['source']].append(article)
+            
+            batches = []
+            for source, source_articles in by_source.items():
+                for articles in split_feeds(source_articles):
+                    words = processor.analyze_headlines_batch([article['title'] for article in articles])
+                    batches.append((source, [
+                        {
+                            'headline': article['title'],
+                            'url': f"{article['link']}?run={run_id}",
+                            'published_date': article['published'],
+                            'content': article['summary'],
+                            'words': article_words
+                        }
+                        for article, article_words in zip(articles, words)
+                    ]))
+            return (batches,)
+        
+        def run(batches):
+            with DatabaseManager() as db_manager:
+                for source, batch in batches:
+                    db_manager.save_articles_batch(source, batch)
+        
+        return time_runs(run, setup, self.repeat)
+    
+    def run(self, stages: List[str], sizes: List[int]) -> List[Dict]:
+        """Run the stages at every size and summarize their timings"""
+        results = []
+        for stage in stages:
+            for size in sizes:
+                timings = getattr(self, f"bench_{stage}")(size)
+                median = statistics.median(timings)
+                results.append({
+                    'stage': stage,
+                    'size': size,
+                    'median_seconds': median,
+                    'min_seconds': min(timings),
+                    'items_per_second': size / median if median else None,
+                })
+                print(f"{stage:<12} {size:>8}  median {median * 1000:9.1f} ms  "
+                      f"{size / median if median else 0:12,.0f} items/s", file=sys.stderr)
+        return results
+
+def git_commit() -> str:
+    """Get the current commit, if the scraper is in a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=SCRAPER_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_results(baseline: Dict, report: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """Compare a report with a baseline, returning the stages that slowed down beyond the tolerance"""
+    baseline_results = {(result['stage'], result['size']): result for result in baseline['results']}
+    regressions = []
+    
+    for result in report['results']:
+        previous = baseline_results.get((result['stage'], result['size']))
+        if not previous:
+            continue
+        
+        ratio = result['median_seconds'] / previous['median_seconds']
+        status = 'ok'
+        if ratio > 1 + tolerance:
+            status = 'REGRESSION'
+            regressions.append(dict(result, baseline_median_seconds=previous['median_seconds'], ratio=ratio))
+        print(f"{result['stage']:<12} {result['size']:>8}  {previous['median_seconds'] * 1000:9.1f} ms -> "
+              f"{result['median_seconds'] * 1000:9.1f} ms  x{ratio:5.2f}  {status}", file=sys.stderr)
+    
+    return regressions
+
+def configure_database(database_url: str = None) -> str:
+    """Point the scraper at a scratch database, a temporary SQLite file by default
+    
+    The configured database is never used, since the ingest stage writes to it.
+    """
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='newswordy-bench-'), 'bench.db')}"
+    DATABASE_CONFIG['connection_string'] = database_url
+    
+    from database import create_tables
+    create_tables()
+    return database_url.split(':', 1)[0]
+
+def main():
+    """Parse arguments and run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark scraper throughput on a synthetic corpus")
+    parser.add_argument('--stages', type=lambda value: value.split(','), default=BENCHMARK_STAGES,
+                        help=f"comma-separated stages to run ({', '.join(BENCHMARK_STAGES)})")
+    parser.add_argument('--sizes', type=lambda value: [int(size) for size in value.split(',')], default=DEFAULT_SIZES,
+                        help="comma-separated corpus sizes (headlines or articles per run)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage and size")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic corpus seed")
+    parser.add_argument('--recording',
+                        help="http_replay.py recording whose homepages the html_parse stage parses (size = pages)")
+    parser.add_argument('--database-url',
+                        help="scratch database to ingest into (default: a temporary SQLite file)")
+    parser.add_argument('--output', help="write the results to this JSON file (e.g. a baseline)")
+    parser.add_argument('--compare', help="baseline JSON file to compare the results with")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown over the baseline, as a fraction of its median")
+    args = parser.parse_args()
+    
+    unknown = set(args.stages) - set(BENCHMARK_STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    
+    # Per-batch info logs would be timed along with the stages
+    logging.basicConfig(level=logging.WARNING)
+    
+    database = configure_database(args.database_url)
+    results = ScraperBenchmark(seed=args.seed, repeat=args.repeat, recording=args.recording).run(args.stages, args.sizes)
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'recording': args.recording,
+        'database': database,
+        'results': results,
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('seed') != args.seed:
+            print(f"Warning: baseline was generated with seed {baseline.get('seed')}", file=sys.stderr)
+        
+        regressions = compare_results(baseline, report, args.tolerance)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
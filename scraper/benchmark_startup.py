@@ -0,0 +1,106 @@
+"""
+Import-time benchmark for the scraper modules
+
+Each module is imported in a fresh interpreter several times and the median wall
+time is reported. The run fails if startup goes over budget or if a module pulls
+in one of the heavy dependencies that should only be imported on first use.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+SCRAPER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules timed by the benchmark, with what to run after importing them
+STARTUP_TARGETS = {
+    'word_processor': 'WordProcessor()',
+    'database': 'DatabaseManager',
+    'news_scraper': 'NewsScraper',
+}
+
+# Dependencies that must not be imported just by starting the scraper
+DEFERRED_MODULES = ['nltk', 'psycopg2']
+
+# Seconds allowed for the slowest target (median of all runs)
+DEFAULT_BUDGET = 1.0
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from {module} import *
+{statement}
+elapsed = time.perf_counter() - start
+loaded = sorted(name for name in {deferred!r} if name in sys.modules)
+print(json.dumps({{'seconds': elapsed, 'loaded': loaded}}))
+"""
+
+def measure_startup(module: str, statement: str, runs: int) -> Dict:
+    """Import a module in fresh interpreters and collect timings and loaded heavy modules"""
+    probe = PROBE.format(module=module, statement=statement, deferred=DEFERRED_MODULES)
+    timings = []
+    loaded = set()
+    
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', probe],
+            cwd=SCRAPER_DIR,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(output)
+        timings.append(result['seconds'])
+        loaded.update(result['loaded'])
+    
+    return {
+        'module': module,
+        'median_seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'deferred_modules_loaded': sorted(loaded),
+    }
+
+def check_deferred_imports(module: str = 'news_scraper') -> List[str]:
+    """Get the heavy dependencies loaded by importing a module (should be empty)"""
+    return measure_startup(module, STARTUP_TARGETS.get(module, ''), runs=1)['deferred_modules_loaded']
+
+def run_benchmark(runs: int = 5, budget: float = DEFAULT_BUDGET) -> bool:
+    """Time every startup target and report whether all stayed within the guard"""
+    passed = True
+    results = []
+    
+    for module, statement in STARTUP_TARGETS.items():
+        result = measure_startup(module, statement, runs)
+        results.append(result)
+        
+        status = 'ok'
+        if result['deferred_modules_loaded']:
+            status = f"imports {', '.join(result['deferred_modules_loaded'])}"
+            passed = False
+        elif result['median_seconds'] > budget:
+            status = 'over budget'
+            passed = False
+        
+        print(f"{module:<16} median {result['median_seconds'] * 1000:7.1f} ms  "
+              f"min {result['min_seconds'] * 1000:7.1f} ms  {status}")
+    
+    print(json.dumps({'budget_seconds': budget, 'results': results}, indent=2))
+    return passed
+
+def main():
+    """Parse arguments and run the startup benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark scraper import time")
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help="maximum median startup time in seconds")
+    args = parser.parse_args()
+    
+    if not run_benchmark(runs=args.runs, budget=args.budget):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -171,8 +171,29 @@ DATABASE_CONFIG = {
 # Scraping configuration
 SCRAPING_CONFIG = {
     'max_articles_per_source': 50,
-    'request_delay': 1,  # seconds between requests
-    'timeout': 30,  # seconds
+    'max_feed_bytes': 4 * 1024 * 1024,  # stop downloading a feed after this many bytes
+    'feed_chunk_size': 64 * 1024,  # bytes read and parsed at a time when streaming a feed
+    'feed_fingerprint_bytes': 64 * 1024,  # head of a feed (its newest items) hashed to detect unchanged feeds
+    'request_delay': 1,  # seconds between requests (to the same host when scraping concurrently)
+    'timeout': 30,  # seconds; longest read timeout, used for hosts without latency history
+    'connect_timeout': 5,  # seconds
+    'min_read_timeout': 10,  # seconds; shortest read timeout a host's latency history can bring it down to
+    'latency_timeout_factor': 4,  # read timeout as a multiple of the host's average latency
+    'retries': 2,  # retries of connection errors, 429 and 5xx responses (not read timeouts)
+    'retry_backoff': 1,  # seconds; jittered backoff ceiling before the first retry, doubling for each next one
+    'retry_backoff_max': 10,  # seconds
+    'pool_connections': 64,  # hosts kept in the connection pool
+    'circuit_failure_threshold': 3,  # consecutive failed requests before a host's circuit opens
+    'circuit_reset_after': 6 * 3600,  # seconds a circuit stays open, doubling after every failed probe
+    'circuit_max_reset_after': 7 * 24 * 3600,  # seconds
+    'host_state_file': os.getenv('HOST_STATE_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.host_state.json')),
+    'max_workers': 8,  # sources scraped in parallel (fetched in parallel with the pipeline); 1 scrapes sequentially
+    'pipeline': True,  # pipeline fetch, tokenize and write stages across sources (see scrape_pipeline.py)
+    'pipeline_queue_size': 4,  # sources' articles queued between pipeline stages before the stage feeding them waits
+    'max_requests_per_host': 1,  # concurrent in-flight requests allowed per host
+    'known_url_lookback_days': 30,  # stored articles preloaded into the duplicate URL index
+    'known_url_stop_after': 5,  # stop reading a feed after this many consecutive known articles
+    'feed_cache_file': os.getenv('FEED_CACHE_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.feed_cache.json')),
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
 }
 
@@ -180,6 +201,8 @@ SCRAPING_CONFIG = {
 WORD_PROCESSING_CONFIG = {
     'min_word_length': 3,
     'max_word_length': 20,
+    'fast_tokenizer': True,  # single-pass regex tokenizer instead of NLTK's word_tokenize
+    'max_words_per_article': 50,
     'common_words_to_exclude': [
         'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
         'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
@@ -189,6 +212,54 @@ WORD_PROCESSING_CONFIG = {
     ]
 }
 
+# Scrape metrics configuration
+METRICS_CONFIG = {
+    # Written after each run; Prometheus text format, or JSON if the name ends in .json
+    'file': os.getenv('METRICS_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scrape_metrics.prom')),
+    'latency_buckets': [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30],  # fetch latency histogram bounds in seconds
+}
+
+# Profiling configuration (news_scraper.py --profile)
+PROFILE_CONFIG = {
+    'directory': os.getenv('PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')),
+    'top_n': 25,  # hotspots and allocation sites listed in the summary
+    'traceback_frames': 1,  # frames kept per allocation by tracemalloc
+}
+
+# Word co-occurrence configuration
+COOCCURRENCE_CONFIG = {
+    # Words mentioned in at least this many articles get their co-occurring words tracked;
+    # associations of rarer words are read from article_words, which is cheap for them
+    'min_anchor_articles': 500,
+}
+
+# Backfill configuration
+BACKFILL_CONFIG = {
+    'batch_size': 1000,  # articles re-tokenized and rewritten per transaction
+    'workers': os.cpu_count() or 1,  # tokenizer processes
+    'checkpoint_file': os.path.join(os.path.dirname(os.path.abspath(__file__)), '.backfill_checkpoint.json'),
+}
+
+# Article export configuration
+EXPORT_CONFIG = {
+    'batch_size': 1000,  # articles read from the cursor and written per chunk
+    'columns': ['id', 'source', 'headline', 'url', 'published_date'],  # default columns (content is opt-in)
+}
+
+# Columnar snapshot configuration
+SNAPSHOT_CONFIG = {
+    'directory': os.getenv('SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')),
+    'batch_size': 5000,  # articles read from the cursor per batch
+    'overlap_minutes': 60,  # articles scraped this long before a snapshot are read again by the next one, in case they were committed after it
+}
+
+# HTTP record/replay configuration
+REPLAY_CONFIG = {
+    'directory': os.getenv('RECORDINGS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'recordings')),
+    'latency': 0,  # seconds before each replayed response starts, or 'recorded'
+    'bandwidth': None,  # bytes per second per replayed response (None for unlimited)
+}
+
 # Logging configuration
 LOGGING_CONFIG = {
     'level': 'INFO',
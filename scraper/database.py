@@ -3,12 +3,17 @@ Database models and connection for the Newswordy scraper
 """
 
 from datetime import datetime, timezone
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Float, Index, ForeignKey
+from sqlalchemy import create_engine, insert, delete, select, func, cast, text, or_, Column, Integer, String, Date, DateTime, Text, Float, Index, ForeignKey
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.exc import SQLAlchemyError
 import logging
-from config import DATABASE_CONFIG
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from config import DATABASE_CONFIG, COOCCURRENCE_CONFIG
+from word_processor import normalize_word_frequencies
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -22,13 +27,40 @@ def get_database_url():
     
     return f"postgresql://{DATABASE_CONFIG['user']}:{DATABASE_CONFIG['password']}@{DATABASE_CONFIG['host']}:{DATABASE_CONFIG['port']}/{DATABASE_CONFIG['database']}"
 
-try:
-    engine = create_engine(get_database_url())
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base = declarative_base()
-except Exception as e:
-    logger.error(f"Failed to create database engine: {e}")
-    raise
+# The engine (and the database driver it imports) is created on first use
+_engine = None
+_engine_lock = threading.Lock()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+Base = declarative_base()
+
+def get_engine():
+    """Get the database engine, creating it on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            try:
+                _engine = create_engine(get_database_url())
+                SessionLocal.configure(bind=_engine)
+            except Exception as e:
+                logger.error(f"Failed to create database engine: {e}")
+                raise
+    return _engine
+
+@contextmanager
+def use_database(database_url: str):
+    """Point the engine and new sessions at another database for the duration of the block"""
+    global _engine
+    with _engine_lock:
+        previous = _engine, DATABASE_CONFIG['connection_string']
+        _engine, DATABASE_CONFIG['connection_string'] = None, database_url
+    try:
+        yield
+    finally:
+        with _engine_lock:
+            if _engine is not None:
+                _engine.dispose()
+            _engine, DATABASE_CONFIG['connection_string'] = previous
+            SessionLocal.configure(bind=_engine)
 
 class Article(Base):
     """Model for storing scraped articles"""
@@ -38,13 +70,14 @@ class Article(Base):
     source = Column(String(50), nullable=False, index=True)
     headline = Column(Text, nullable=False)
     url = Column(String(500), nullable=False, unique=True)
-    published_date = Column(DateTime, nullable=True)
-    scraped_date = Column(DateTime, default=datetime.now(timezone.utc))
+    published_date = Column(DateTime(timezone=True), nullable=True)  # Stored in UTC
+    scraped_date = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     content = Column(Text, nullable=True)
     
-    # Create index on source and published_date for efficient queries
+    # Create indexes on source and published_date for efficient queries
     __table_args__ = (
         Index('idx_source_date', 'source', 'published_date'),
+        Index('idx_published_date', 'published_date'),
     )
     
     # Relationship to ArticleWord
@@ -58,7 +91,7 @@ class ArticleWord(Base):
     article_id = Column(Integer, ForeignKey('articles.id'), nullable=False, index=True)
     word = Column(String(100), nullable=False, index=True)
     frequency = Column(Integer, nullable=False, default=1)  # How many times this word appears in this article
-    created_date = Column(DateTime, default=datetime.now(timezone.utc))
+    created_date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     
     # Create indexes for efficient querying
     __table_args__ = (
@@ -69,23 +102,85 @@ class ArticleWord(Base):
     # Relationship to Article
     article = relationship("Article", back_populates="words")
 
+class WordDailyRollup(Base):
+    """Model for per-day, per-source word totals maintained at ingest time"""
+    __tablename__ = "word_daily_rollup"
+    
+    day = Column(Date, primary_key=True)  # UTC day of the articles' published_date
+    source = Column(String(50), primary_key=True)
+    word = Column(String(100), primary_key=True)
+    frequency = Column(Integer, nullable=False, default=0)  # Sum of the word's frequency over the day's articles
+    article_count = Column(Integer, nullable=False, default=0)  # How many of the day's articles contain the word
+    
+    # Create index for looking up one word across a range of days
+    __table_args__ = (
+        Index('idx_rollup_word_day', 'word', 'day'),
+    )
+
+class SourceDailyTotal(Base):
+    """Model for per-day, per-source article counts maintained at ingest time"""
+    __tablename__ = "source_daily_totals"
+    
+    day = Column(Date, primary_key=True)  # UTC day of the articles' published_date
+    source = Column(String(50), primary_key=True)
+    article_count = Column(Integer, nullable=False, default=0)
+
+class WordCooccurrence(Base):
+    """Model for per-day, per-source counts of the words appearing alongside an anchor word"""
+    __tablename__ = "word_cooccurrence"
+    
+    word = Column(String(100), primary_key=True)  # Anchor word (see CooccurrenceAnchor)
+    day = Column(Date, primary_key=True)  # UTC day of the articles' published_date
+    source = Column(String(50), primary_key=True)
+    co_word = Column(String(100), primary_key=True)  # Word in the same article, including the anchor itself
+    frequency = Column(Integer, nullable=False, default=0)  # Sum of co_word's frequency over the articles containing both
+    article_count = Column(Integer, nullable=False, default=0)  # How many of the day's articles contain both words
+
+class CooccurrenceAnchor(Base):
+    """Model for the words whose co-occurrences are tracked, i.e. words mentioned in many articles"""
+    __tablename__ = "cooccurrence_anchors"
+    
+    word = Column(String(100), primary_key=True)
+    promoted_date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
 class ScrapingLog(Base):
     """Model for logging scraping activities"""
     __tablename__ = "scraping_logs"
     
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     source = Column(String(50), nullable=False)
-    status = Column(String(20), nullable=False)  # success, error, partial
+    status = Column(String(20), nullable=False)  # success, error, unchanged, skipped
     articles_scraped = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)
-    start_time = Column(DateTime, default=datetime.now(timezone.utc))
+    start_time = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     end_time = Column(DateTime, nullable=True)
     duration_seconds = Column(Float, nullable=True)
+    fetch_seconds = Column(Float, nullable=True)
+    fetch_bytes = Column(Integer, nullable=True)
+    fetch_latency_seconds = Column(Float, nullable=True)  # slowest time to first byte of the source's requests
+    parse_seconds = Column(Float, nullable=True)
+    tokenize_seconds = Column(Float, nullable=True)
+    write_seconds = Column(Float, nullable=True)
+    articles_skipped = Column(Integer, nullable=True)  # already stored articles that were not saved again
+
+def as_utc(value: datetime):
+    """Convert a datetime to UTC (naive datetimes are taken to be UTC)"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def utc_day(value: datetime):
+    """Get the UTC day a published date falls on"""
+    if value is None:
+        return None
+    return as_utc(value).date()
 
 def create_tables():
     """Create all database tables"""
     try:
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
         logger.info("Database tables created successfully")
     except SQLAlchemyError as e:
         logger.error(f"Failed to create tables: {e}")
@@ -93,6 +188,7 @@ def create_tables():
 
 def get_db_session():
     """Get database session"""
+    get_engine()
     db = SessionLocal()
     try:
         yield db
@@ -103,6 +199,7 @@ class DatabaseManager:
     """Database manager for handling database operations"""
     
     def __init__(self):
+        get_engine()
         self.session = SessionLocal()
     
     def __enter__(self):
@@ -119,7 +216,7 @@ class DatabaseManager:
                 source=source,
                 headline=headline,
                 url=url,
-                published_date=published_date,
+                published_date=as_utc(published_date),
                 content=content
             )
             self.session.add(article)
@@ -132,6 +229,7 @@ class DatabaseManager:
     
     def save_article_words(self, article_id: int, word_freq_data: dict):
         """Save word frequencies for a specific article"""
+        word_freq_data = normalize_word_frequencies(word_freq_data)
         try:
             for word, frequency in word_freq_data.items():
                 article_word = ArticleWord(
@@ -148,50 +246,438 @@ class DatabaseManager:
             logger.error(f"Failed to save article words: {e}")
             raise
     
-    def get_word_frequencies_by_range(self, start_date: datetime, end_date: datetime, 
-                                    sources: list = None, limit: int = 100):
-        """Get word frequencies for a date range and optional source filter"""
+    def _upsert(self, model):
+        """Get a dialect-specific INSERT construct that supports ON CONFLICT clauses"""
+        if self.session.get_bind().dialect.name == 'sqlite':
+            return sqlite.insert(model)
+        return postgresql.insert(model)
+    
+    def save_articles_batch(self, source: str, articles: list) -> dict:
+        """Save a source's articles and their word frequencies in a single transaction
+        
+        Each article is a dict with 'headline', 'url', 'published_date', 'content' and
+        'words' (word -> frequency). Words are stored in normalized form. Articles
+        whose URL is already stored are skipped.
+        Returns a dict mapping the URL of each newly inserted article to its ID.
+        """
+        # Keep the first occurrence of each URL so the insert never conflicts with itself
+        articles_by_url = {}
+        for article in articles:
+            if article['url'] not in articles_by_url:
+                articles_by_url[article['url']] = dict(
+                    article, words=normalize_word_frequencies(article.get('words'))
+                )
+        
+        if not articles_by_url:
+            return {}
+        
+        try:
+            article_rows = [
+                {
+                    'source': source,
+                    'headline': article['headline'],
+                    'url': url,
+                    'published_date': as_utc(article.get('published_date')),
+                    'content': article.get('content')
+                }
+                for url, article in articles_by_url.items()
+            ]
+            statement = self._upsert(Article).values(article_rows).on_conflict_do_nothing(
+                index_elements=['url']
+            ).returning(Article.id, Article.url)
+            inserted = {url: article_id for article_id, url in self.session.execute(statement)}
+            
+            word_rows = [
+                {'article_id': article_id, 'word': word, 'frequency': frequency}
+                for url, article_id in inserted.items()
+                for word, frequency in articles_by_url[url]['words'].items()
+            ]
+            if word_rows:
+                self.session.execute(insert(ArticleWord), word_rows)
+            
+            new_articles = [articles_by_url[url] for url in inserted]
+            self._add_to_rollups(source, new_articles)
+            self._add_to_cooccurrence(source, new_articles)
+            
+            self.session.commit()
+            logger.info(f"Saved {len(inserted)} articles and {len(word_rows)} words for {source} "
+                        f"({len(articles_by_url) - len(inserted)} already stored)")
+            return inserted
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Failed to save article batch: {e}")
+            raise
+    
+    def _add_to_rollups(self, source: str, articles: list):
+        """Add newly inserted articles to the daily rollups as part of the current transaction"""
+        day_totals = Counter()
+        word_totals = {}
+        for article in articles:
+            day = utc_day(article.get('published_date'))
+            if day is None:
+                continue
+            
+            day_totals[day] += 1
+            for word, frequency in (article.get('words') or {}).items():
+                totals = word_totals.setdefault((day, word), [0, 0])
+                totals[0] += frequency
+                totals[1] += 1
+        
+        if not day_totals:
+            return
+        
+        # Rows are sorted so concurrent writers always lock them in the same order
+        statement = self._upsert(SourceDailyTotal).values([
+            {'day': day, 'source': source, 'article_count': count}
+            for day, count in sorted(day_totals.items())
+        ])
+        self.session.execute(statement.on_conflict_do_update(
+            index_elements=['day', 'source'],
+            set_={'article_count': SourceDailyTotal.article_count + statement.excluded.article_count}
+        ))
+        
+        if word_totals:
+            statement = self._upsert(WordDailyRollup).values([
+                {'day': day, 'source': source, 'word': word, 'frequency': frequency, 'article_count': count}
+                for (day, word), (frequency, count) in sorted(word_totals.items())
+            ])
+            self.session.execute(statement.on_conflict_do_update(
+                index_elements=['day', 'source', 'word'],
+                set_={
+                    'frequency': WordDailyRollup.frequency + statement.excluded.frequency,
+                    'article_count': WordDailyRollup.article_count + statement.excluded.article_count
+                }
+            ))
+    
+    def _add_to_cooccurrence(self, source: str, articles: list):
+        """Add newly inserted articles to the word co-occurrence index as part of the current transaction
+        
+        Only pairs whose first word is an anchor are kept. New anchors are promoted
+        separately by promote_cooccurrence_anchors, so concurrent writers all see the
+        same anchor set.
+        """
+        words = {word for article in articles for word in (article.get('words') or {})}
+        if not words:
+            return
+        
+        anchors = set(self.session.scalars(
+            select(CooccurrenceAnchor.word).where(CooccurrenceAnchor.word.in_(sorted(words)))
+        ))
+        
+        pair_totals = {}
+        for article in articles:
+            day = utc_day(article.get('published_date'))
+            article_words = article.get('words') or {}
+            if day is None:
+                continue
+            
+            for word in anchors.intersection(article_words):
+                for co_word, frequency in article_words.items():
+                    totals = pair_totals.setdefault((word, day, co_word), [0, 0])
+                    totals[0] += frequency
+                    totals[1] += 1
+        
+        if not pair_totals:
+            return
+        
+        # Rows are sorted so concurrent writers always lock them in the same order
+        statement = self._upsert(WordCooccurrence).values([
+            {'word': word, 'day': day, 'source': source, 'co_word': co_word,
+             'frequency': frequency, 'article_count': count}
+            for (word, day, co_word), (frequency, count) in sorted(pair_totals.items())
+        ])
+        self.session.execute(statement.on_conflict_do_update(
+            index_elements=['word', 'day', 'source', 'co_word'],
+            set_={
+                'frequency': WordCooccurrence.frequency + statement.excluded.frequency,
+                'article_count': WordCooccurrence.article_count + statement.excluded.article_count
+            }
+        ))
+    
+    def _published_day(self):
+        """Get a SQL expression for the UTC day of Article.published_date"""
+        if self.session.get_bind().dialect.name == 'sqlite':
+            return func.date(Article.published_date)
+        return cast(func.timezone('UTC', Article.published_date), Date)
+    
+    def rebuild_word_rollups(self):
+        """Recompute the daily rollups from articles and article_words in a single transaction
+        
+        Needed after article_words is rewritten outside of save_articles_batch, e.g. by the backfill.
+        """
+        try:
+            day = self._published_day().label('day')
+            self.session.execute(delete(WordDailyRollup))
+            self.session.execute(delete(SourceDailyTotal))
+            
+            self.session.execute(insert(SourceDailyTotal).from_select(
+                ['day', 'source', 'article_count'],
+                select(day, Article.source, func.count(Article.id)).where(
+                    Article.published_date.isnot(None)
+                ).group_by(day, Article.source)
+            ))
+            self.session.execute(insert(WordDailyRollup).from_select(
+                ['day', 'source', 'word', 'frequency', 'article_count'],
+                select(
+                    day, Article.source, ArticleWord.word,
+                    func.sum(ArticleWord.frequency), func.count(func.distinct(Article.id))
+                ).join(Article, Article.id == ArticleWord.article_id).where(
+                    Article.published_date.isnot(None)
+                ).group_by(day, Article.source, ArticleWord.word)
+            ))
+            
+            self.session.commit()
+            logger.info("Rebuilt daily word rollups")
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Failed to rebuild word rollups: {e}")
+            raise
+    
+    def promote_cooccurrence_anchors(self, start_date: datetime = None, end_date: datetime = None) -> int:
+        """Start tracking co-occurrences for words that have reached the anchor threshold
+        
+        Only words published within [start_date, end_date] are considered (a missing
+        bound leaves that side open). Each new anchor's co-occurrences are backfilled
+        from article_words in the same transaction. Must not run while articles are
+        being saved. Returns the number of promoted words.
+        """
         try:
-            # Build the query
-            query = self.session.query(
-                ArticleWord.word,
-                ArticleWord.frequency,
-                Article.source,
-                Article.published_date
-            ).join(Article, ArticleWord.article_id == Article.id).filter(
-                Article.published_date >= start_date,
-                Article.published_date <= end_date
+            recent_words = select(WordDailyRollup.word)
+            if start_date is not None:
+                recent_words = recent_words.where(WordDailyRollup.day >= utc_day(start_date))
+            if end_date is not None:
+                recent_words = recent_words.where(WordDailyRollup.day <= utc_day(end_date))
+            
+            promoted = self.session.scalars(
+                select(WordDailyRollup.word).where(
+                    WordDailyRollup.word.in_(recent_words.distinct()),
+                    WordDailyRollup.word.notin_(select(CooccurrenceAnchor.word))
+                ).group_by(WordDailyRollup.word).having(
+                    func.sum(WordDailyRollup.article_count) >= COOCCURRENCE_CONFIG['min_anchor_articles']
+                ).order_by(WordDailyRollup.word)
+            ).all()
+            
+            if promoted:
+                self.session.execute(insert(CooccurrenceAnchor), [{'word': word} for word in promoted])
+                self._backfill_cooccurrence(promoted)
+            
+            self.session.commit()
+            if promoted:
+                logger.info(f"Promoted {len(promoted)} co-occurrence anchor words")
+            return len(promoted)
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Failed to promote co-occurrence anchors: {e}")
+            raise
+    
+    def _backfill_cooccurrence(self, anchors: list = None):
+        """Compute the co-occurrences of anchor words from article_words as part of the current transaction
+        
+        Covers the given anchors, or every anchor when none are given.
+        """
+        anchor_words = ArticleWord.__table__.alias('anchor_words')
+        day = self._published_day().label('day')
+        
+        statement = select(
+            anchor_words.c.word, day, Article.source, ArticleWord.word,
+            func.sum(ArticleWord.frequency), func.count(func.distinct(Article.id))
+        ).select_from(anchor_words).join(
+            Article, Article.id == anchor_words.c.article_id
+        ).join(
+            ArticleWord, ArticleWord.article_id == anchor_words.c.article_id
+        ).where(
+            Article.published_date.isnot(None),
+            anchor_words.c.word.in_(anchors if anchors is not None else select(CooccurrenceAnchor.word))
+        ).group_by(anchor_words.c.word, day, Article.source, ArticleWord.word)
+        
+        self.session.execute(insert(WordCooccurrence).from_select(
+            ['word', 'day', 'source', 'co_word', 'frequency', 'article_count'], statement
+        ))
+    
+    def rebuild_word_cooccurrence(self):
+        """Recompute the co-occurrence index from scratch in a single transaction, re-deciding the anchors
+        
+        Needed after article_words is rewritten outside of save_articles_batch, e.g. by
+        the backfill. Run it after rebuild_word_rollups, whose totals decide the anchors.
+        """
+        try:
+            self.session.execute(delete(WordCooccurrence))
+            self.session.execute(delete(CooccurrenceAnchor))
+            
+            self.session.execute(insert(CooccurrenceAnchor).from_select(
+                ['word'],
+                select(WordDailyRollup.word).group_by(WordDailyRollup.word).having(
+                    func.sum(WordDailyRollup.article_count) >= COOCCURRENCE_CONFIG['min_anchor_articles']
+                )
+            ))
+            self._backfill_cooccurrence()
+            
+            self.session.commit()
+            logger.info("Rebuilt word co-occurrence")
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Failed to rebuild word co-occurrence: {e}")
+            raise
+    
+    def refresh_scoreboard_cache(self, start_date: datetime = None, end_date: datetime = None) -> int:
+        """Recompute cached scoreboards whose time period overlaps [start_date, end_date]
+        
+        A missing bound leaves that side open. The scoreboard cache only exists in the
+        Supabase database, so other databases have nothing to refresh.
+        """
+        if self.session.get_bind().dialect.name != 'postgresql':
+            return 0
+        
+        try:
+            refreshed = self.session.execute(
+                text("select refresh_scoreboard_cache(:start_date, :end_date)"),
+                {'start_date': as_utc(start_date), 'end_date': as_utc(end_date)}
+            ).scalar()
+            self.session.commit()
+            logger.info(f"Refreshed {refreshed} cached scoreboards")
+            return refreshed
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Failed to refresh scoreboard cache: {e}")
+            raise
+    
+    def iter_article_headlines(self, after_id: int = 0, batch_size: int = 1000):
+        """Stream (id, headline) rows in ID order over a server-side cursor, one list per batch
+        
+        Uses its own connection so the manager's session can write while rows are streamed.
+        """
+        statement = select(Article.id, Article.headline).where(
+            Article.id > after_id
+        ).order_by(Article.id)
+        
+        with self.session.get_bind().connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(statement)
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+    
+    def replace_article_words_batch(self, article_words: dict):
+        """Replace the stored word frequencies of many articles in a single transaction
+        
+        article_words maps article ID to a dict of word -> frequency. Words are stored
+        in normalized form.
+        """
+        if not article_words:
+            return
+        
+        try:
+            self.session.execute(
+                delete(ArticleWord).where(ArticleWord.article_id.in_(list(article_words)))
             )
             
-            # Add source filter if specified
-            if sources:
-                query = query.filter(Article.source.in_(sources))
+            word_rows = [
+                {'article_id': article_id, 'word': word, 'frequency': frequency}
+                for article_id, words in article_words.items()
+                for word, frequency in normalize_word_frequencies(words).items()
+            ]
+            if word_rows:
+                self.session.execute(insert(ArticleWord), word_rows)
             
-            # Execute query and aggregate results
-            results = query.all()
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.error(f"Failed to replace article words: {e}")
+            raise
+    
+    def get_recent_article_urls(self, since: datetime) -> list:
+        """Get URLs of articles scraped since a given time"""
+        try:
+            rows = self.session.query(Article.url).filter(
+                Article.scraped_date >= since
+            ).all()
+            return [url for (url,) in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to get recent article URLs: {e}")
+            raise
+    
+    def _word_frequencies_statement(self, start_date: datetime, end_date: datetime,
+                                    sources: list = None, by_source: bool = False):
+        """Build the grouped word frequency query for a date range and optional source filter"""
+        total = func.sum(ArticleWord.frequency).label('frequency')
+        group_columns = [Article.source, ArticleWord.word] if by_source else [ArticleWord.word]
+        
+        statement = select(*group_columns, total).join(
+            Article, ArticleWord.article_id == Article.id
+        ).where(
+            Article.published_date >= as_utc(start_date),
+            Article.published_date <= as_utc(end_date)
+        ).group_by(*group_columns)
+        
+        # Add source filter if specified
+        if sources:
+            statement = statement.where(Article.source.in_(sources))
+        
+        return statement, total
+    
+    def get_word_frequencies_by_range(self, start_date: datetime, end_date: datetime, 
+                                    sources: list = None, limit: int = 100, by_source: bool = False):
+        """Get the top word frequencies for a date range and optional source filter
+        
+        Returns a dict of word -> frequency in descending order, or with by_source a dict
+        of source -> {word: frequency} holding the top words of each source.
+        """
+        try:
+            statement, total = self._word_frequencies_statement(start_date, end_date, sources, by_source)
             
-            # Aggregate word frequencies
-            word_frequencies = {}
-            for word, freq, source, date in results:
-                if word in word_frequencies:
-                    word_frequencies[word] += freq
-                else:
-                    word_frequencies[word] = freq
+            if not by_source:
+                rows = self.session.execute(
+                    statement.order_by(total.desc(), ArticleWord.word).limit(limit)
+                ).all()
+                return {word: frequency for word, frequency in rows}
             
-            # Sort by frequency and return top results
-            sorted_words = sorted(word_frequencies.items(), key=lambda x: x[1], reverse=True)
-            return dict(sorted_words[:limit])
+            # Rank words within each source and keep the top of each
+            ranked = statement.add_columns(
+                func.row_number().over(
+                    partition_by=Article.source,
+                    order_by=(total.desc(), ArticleWord.word)
+                ).label('position')
+            ).subquery()
+            rows = self.session.execute(
+                select(ranked.c.source, ranked.c.word, ranked.c.frequency).where(
+                    ranked.c.position <= limit
+                ).order_by(ranked.c.source, ranked.c.position)
+            ).all()
             
+            word_frequencies = {}
+            for source, word, frequency in rows:
+                word_frequencies.setdefault(source, {})[word] = frequency
+            return word_frequencies
+        
         except SQLAlchemyError as e:
             logger.error(f"Failed to get word frequencies: {e}")
             raise
     
+    def iter_word_frequencies_by_range(self, start_date: datetime, end_date: datetime,
+                                       sources: list = None, by_source: bool = False,
+                                       batch_size: int = 1000):
+        """Stream the full word frequency distribution of a date range over a server-side cursor
+        
+        Yields (word, frequency) rows, or (source, word, frequency) with by_source, in
+        descending frequency order. Uses its own connection like iter_article_headlines.
+        """
+        statement, total = self._word_frequencies_statement(start_date, end_date, sources, by_source)
+        order = [Article.source] if by_source else []
+        statement = statement.order_by(*order, total.desc(), ArticleWord.word)
+        
+        with self.session.get_bind().connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(statement)
+            for row in result:
+                yield tuple(row)
+    
     def get_articles_by_date_range(self, start_date: datetime, end_date: datetime, 
                                  source: str = None):
-        """Get articles within a date range"""
+        """Get articles within a date range (iter_articles_by_date_range streams long ranges)"""
         query = self.session.query(Article).filter(
-            Article.published_date >= start_date,
-            Article.published_date <= end_date
+            Article.published_date >= as_utc(start_date),
+            Article.published_date <= as_utc(end_date)
         )
         
         if source:
@@ -199,15 +685,101 @@ class DatabaseManager:
         
         return query.all()
     
+    def iter_articles_by_date_range(self, start_date: datetime, end_date: datetime,
+                                    source: str = None, columns: list = None,
+                                    with_words: bool = False, undated: bool = False,
+                                    batch_size: int = 1000):
+        """Stream articles within a date range over a server-side cursor, one list of dicts per batch
+        
+        columns selects the article columns to read (all of them by default). With
+        with_words each article gets a 'words' dict of word -> frequency, loaded with
+        one query per batch rather than one per article. With undated, articles without
+        a published date are included by their scraped date.
+        """
+        article_columns = Article.__table__.columns
+        names = list(columns or article_columns.keys())
+        unknown = [name for name in names if name not in article_columns]
+        if unknown:
+            raise ValueError(f"Unknown article columns: {', '.join(unknown)}")
+        
+        # Article IDs are needed to attach words even when they are not exported
+        selected = names if not with_words or 'id' in names else ['id'] + names
+        
+        article_date = func.coalesce(Article.published_date, Article.scraped_date) if undated else Article.published_date
+        statement = select(*(article_columns[name] for name in selected)).where(
+            article_date >= as_utc(start_date),
+            article_date <= as_utc(end_date)
+        ).order_by(article_date, Article.id)
+        
+        if source:
+            statement = statement.where(Article.source == source)
+        
+        with self.session.get_bind().connect() as connection:
+            result = connection.execution_options(
+                stream_results=True, yield_per=batch_size
+            ).execute(statement)
+            for partition in result.partitions():
+                articles = [dict(row._mapping) for row in partition]
+                
+                if with_words:
+                    words = self._load_article_words(connection, [article['id'] for article in articles])
+                    for article in articles:
+                        article['words'] = words.get(article['id'], {})
+                        if 'id' not in names:
+                            del article['id']
+                
+                yield articles
+    
+    def get_article_days(self, scraped_since: datetime = None, dated_since: datetime = None) -> set:
+        """Get the UTC days of the articles scraped since one time or dated since another (of every article by default)
+        
+        Articles without a published date are dated, and fall on the day, they were scraped.
+        """
+        statement = select(Article.published_date, Article.scraped_date)
+        if scraped_since is not None and dated_since is not None:
+            statement = statement.where(or_(
+                Article.scraped_date >= as_utc(scraped_since),
+                func.coalesce(Article.published_date, Article.scraped_date) >= as_utc(dated_since)
+            ))
+        
+        with self.session.get_bind().connect() as connection:
+            result = connection.execution_options(stream_results=True, yield_per=10000).execute(statement)
+            return {utc_day(published_date or scraped_date) for published_date, scraped_date in result}
+    
+    def _load_article_words(self, connection, article_ids: list) -> dict:
+        """Get the word frequencies of many articles in one query, keyed by article ID"""
+        rows = connection.execute(
+            select(ArticleWord.article_id, ArticleWord.word, ArticleWord.frequency).where(
+                ArticleWord.article_id.in_(article_ids)
+            ).order_by(ArticleWord.article_id, ArticleWord.frequency.desc(), ArticleWord.word)
+        )
+        
+        words = {}
+        for article_id, word, frequency in rows:
+            words.setdefault(article_id, {})[word] = frequency
+        return words
+    
     def log_scraping_activity(self, source: str, status: str, articles_scraped: int = 0,
                             error_message: str = None, start_time: datetime = None,
-                            end_time: datetime = None):
-        """Log scraping activity"""
+                            end_time: datetime = None, timings=None):
+        """Log scraping activity, with the per-stage timings of the scrape if given"""
         try:
             duration = None
             if start_time and end_time:
                 duration = (end_time - start_time).total_seconds()
             
+            stage_columns = {}
+            if timings is not None:
+                stage_columns = {
+                    'fetch_seconds': timings.seconds['fetch'],
+                    'fetch_bytes': timings.fetch_bytes,
+                    'fetch_latency_seconds': max(timings.fetch_latencies, default=None),
+                    'parse_seconds': timings.seconds['parse'],
+                    'tokenize_seconds': timings.seconds['tokenize'],
+                    'write_seconds': timings.seconds['write'],
+                    'articles_skipped': timings.articles_skipped,
+                }
+            
             log_entry = ScrapingLog(
                 source=source,
                 status=status,
@@ -215,7 +787,8 @@ class DatabaseManager:
                 error_message=error_message,
                 start_time=start_time or datetime.now(timezone.utc),
                 end_time=end_time,
-                duration_seconds=duration
+                duration_seconds=duration,
+                **stage_columns
             )
             
             self.session.add(log_entry)
@@ -0,0 +1,118 @@
+"""
+Export command for streaming stored articles to JSONL or CSV
+
+Articles are read over a server-side cursor and written one batch at a time, so
+memory use stays flat however long the exported date range is.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sys
+from datetime import datetime
+from typing import Dict, Iterable, List, TextIO
+
+from config import EXPORT_CONFIG
+from database import DatabaseManager, as_utc
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ['jsonl', 'csv']
+
+def serialize_article(article: Dict, words_as_text: bool = False) -> Dict:
+    """Convert an article row into JSON-friendly values"""
+    row = {}
+    for name, value in article.items():
+        if isinstance(value, datetime):
+            value = as_utc(value).isoformat()
+        elif name == 'words' and words_as_text:
+            value = json.dumps(value)
+        row[name] = value
+    return row
+
+def write_jsonl(batches: Iterable[List[Dict]], output: TextIO) -> int:
+    """Write batches of articles as JSON lines, returning the number written"""
+    written = 0
+    for articles in batches:
+        output.write(''.join(json.dumps(serialize_article(article)) + '\n' for article in articles))
+        written += len(articles)
+    return written
+
+def write_csv(batches: Iterable[List[Dict]], output: TextIO, fieldnames: List[str]) -> int:
+    """Write batches of articles as CSV rows, returning the number written
+    
+    Word frequencies are stored in the 'words' column as a JSON object.
+    """
+    writer = csv.DictWriter(output, fieldnames=fieldnames)
+    writer.writeheader()
+    
+    written = 0
+    for articles in batches:
+        writer.writerows(serialize_article(article, words_as_text=True) for article in articles)
+        written += len(articles)
+    return written
+
+def export_articles(start_date: datetime, end_date: datetime, output: TextIO, export_format: str = 'jsonl',
+                    source: str = None, columns: List[str] = None, with_words: bool = False,
+                    batch_size: int = None) -> int:
+    """Stream the articles of a date range to a file, returning the number exported"""
+    columns = columns or EXPORT_CONFIG['columns']
+    batch_size = batch_size or EXPORT_CONFIG['batch_size']
+    
+    with DatabaseManager() as db_manager:
+        batches = db_manager.iter_articles_by_date_range(
+            start_date, end_date,
+            source=source,
+            columns=columns,
+            with_words=with_words,
+            batch_size=batch_size
+        )
+        
+        if export_format == 'csv':
+            fieldnames = columns + ['words'] if with_words else columns
+            return write_csv(batches, output, fieldnames)
+        return write_jsonl(batches, output)
+
+def parse_date(value: str) -> datetime:
+    """Parse an ISO date or datetime argument (naive values are taken to be UTC)"""
+    return as_utc(datetime.fromisoformat(value))
+
+def main():
+    """Parse arguments and run the export"""
+    parser = argparse.ArgumentParser(description="Export stored articles to JSONL or CSV")
+    parser.add_argument('--start', type=parse_date, required=True,
+                        help="start of the published date range (ISO date or datetime)")
+    parser.add_argument('--end', type=parse_date, required=True,
+                        help="end of the published date range (ISO date or datetime)")
+    parser.add_argument('--source', help="only export articles from this source")
+    parser.add_argument('--columns', type=lambda value: value.split(','), default=EXPORT_CONFIG['columns'],
+                        help="comma-separated article columns to export")
+    parser.add_argument('--with-words', action='store_true',
+                        help="include each article's word frequencies")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='jsonl', help="output format")
+    parser.add_argument('--output', default='-', help="output file (default: standard output)")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_CONFIG['batch_size'],
+                        help="articles read and written per chunk")
+    args = parser.parse_args()
+    
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8', newline='')
+    try:
+        exported = export_articles(
+            args.start, args.end, output,
+            export_format=args.format,
+            source=args.source,
+            columns=args.columns,
+            with_words=args.with_words,
+            batch_size=args.batch_size
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    logger.info(f"Exported {exported} articles")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Persistent cache of RSS feed validators used to skip unchanged feeds
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class FeedCache:
+    """Stores ETag, Last-Modified and a body fingerprint for each feed URL
+    
+    Validators of a changed feed are staged until its articles have been saved, so a
+    feed whose scrape fails is fetched and parsed in full again next time.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = self._load()
+        self.pending = {}
+    
+    def _load(self) -> Dict[str, Dict]:
+        """Load cached entries from disk"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable feed cache {self.path}: {e}")
+            return {}
+    
+    def save(self):
+        """Write cached entries to disk"""
+        if not self.path:
+            return
+        
+        with self._lock:
+            data = dict(self.entries)
+        
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save feed cache {self.path}: {e}")
+    
+    @staticmethod
+    def fingerprint(body: bytes) -> str:
+        """Hash a feed body"""
+        return hashlib.sha256(body).hexdigest()
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Get If-None-Match/If-Modified-Since headers for a feed URL"""
+        with self._lock:
+            entry = self.entries.get(url, {})
+        
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def is_unchanged(self, url: str, body_hash: str) -> bool:
+        """Check whether a feed body matches the cached fingerprint"""
+        with self._lock:
+            entry = self.entries.get(url)
+        return bool(entry) and entry.get('body_hash') == body_hash
+    
+    def update(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+               body_hash: Optional[str] = None):
+        """Record the validators of the latest fetch of a feed"""
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            if etag is not None:
+                entry['etag'] = etag
+            if last_modified is not None:
+                entry['last_modified'] = last_modified
+            if body_hash is not None:
+                entry['body_hash'] = body_hash
+            entry['checked_at'] = datetime.now(timezone.utc).isoformat()
+    
+    def stage(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None,
+              body_hash: Optional[str] = None):
+        """Hold the validators of a changed feed until its articles are saved"""
+        with self._lock:
+            self.pending[url] = {'etag': etag, 'last_modified': last_modified, 'body_hash': body_hash}
+    
+    def commit(self, url: str):
+        """Record a feed's staged validators once its articles are saved"""
+        with self._lock:
+            validators = self.pending.pop(url, None)
+        if validators is not None:
+            self.update(url, **validators)
+    
+    def discard(self, url: str):
+        """Drop a feed's staged validators after a failed scrape"""
+        with self._lock:
+            self.pending.pop(url, None)
+    
+    def invalidate(self, url: str):
+        """Forget a feed so the next fetch is unconditional"""
+        with self._lock:
+            self.entries.pop(url, None)
+            self.pending.pop(url, None)
@@ -0,0 +1,219 @@
+"""
+Incremental RSS and Atom parsing
+
+Feed bodies are fed to an lxml pull parser chunk by chunk as they download, and each
+item is turned into an article as soon as its element closes, then dropped from the
+tree. Callers can stop reading once they have enough articles, so long feeds are
+neither downloaded nor parsed in full.
+
+Real-world feeds are often not well-formed XML: they use HTML named entities such as
+&rsquo; and &nbsp;, and bare ampersands in links and titles. Those are rewritten into
+numeric references and &amp; before the bytes reach the parser, which would otherwise
+drop them along with the valid entities next to them.
+"""
+
+import html
+import logging
+import re
+from html.entities import html5
+from typing import Callable, Dict, List, Optional
+
+from lxml import etree
+
+from config import SCRAPING_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+ATOM_NAMESPACE = 'http://www.w3.org/2005/Atom'
+DC_NAMESPACE = 'http://purl.org/dc/elements/1.1/'
+DCTERMS_NAMESPACE = 'http://purl.org/dc/terms/'
+
+# Namespaces of the RSS 0.9x/2.0 (none), RSS 1.0 and Atom elements read from items
+FEED_NAMESPACES = {'', ATOM_NAMESPACE, 'http://purl.org/rss/1.0/', 'http://my.netscape.com/rdf/simple/0.9/'}
+
+# Elements holding an article, and where each field is read from in order of preference
+ITEM_TAGS = {'item', 'entry'}
+TITLE_TAGS = [('', 'title')]
+SUMMARY_TAGS = [('', 'description'), ('', 'summary')]
+PUBLISHED_TAGS = [('', 'pubDate'), ('', 'published'), (DCTERMS_NAMESPACE, 'issued'),
+                  (DC_NAMESPACE, 'date'), ('', 'updated'), (DCTERMS_NAMESPACE, 'modified')]
+
+# Entities every XML parser knows; other names are HTML's, or unknown
+XML_ENTITIES = {b'amp', b'lt', b'gt', b'quot', b'apos'}
+HTML_ENTITIES = {
+    name[:-1].encode('ascii'): ''.join(f'&#{ord(char)};' for char in value).encode('ascii')
+    for name, value in html5.items() if name.endswith(';') and name[:-1].encode('ascii') not in XML_ENTITIES
+}
+
+# Ampersands and CDATA sections outside CDATA, and the references an ampersand may start
+MARKUP_PATTERN = re.compile(rb'&|<!\[CDATA\[')
+REFERENCE_PATTERN = re.compile(rb'&(?:#[0-9]+|#[xX][0-9a-fA-F]+|([A-Za-z][A-Za-z0-9]{0,31}));')
+PARTIAL_REFERENCE_PATTERN = re.compile(rb'&(?:#[xX]?[0-9a-fA-F]*|[A-Za-z][A-Za-z0-9]{0,31})?\Z')
+CDATA_START = b'<![CDATA['
+CDATA_END = b']]>'
+
+def split_tag(tag: str) -> tuple:
+    """Split an element tag into its namespace, with feed namespaces as '', and local name"""
+    namespace, _, name = tag[1:].partition('}') if tag.startswith('{') else ('', '', tag)
+    return ('' if namespace in FEED_NAMESPACES else namespace), name
+
+class EntityEscaper:
+    """Rewrites the entities and ampersands XML does not allow, as a feed's chunks go by
+    
+    HTML named entities become numeric character references, and ampersands that start
+    no reference (or an unknown one) are escaped. CDATA sections pass through as they
+    are. A reference or CDATA marker split between chunks is held back until the rest
+    of it arrives.
+    """
+    
+    def __init__(self):
+        self._pending = b''
+        self._in_cdata = False
+    
+    def feed(self, chunk: bytes) -> bytes:
+        """Rewrite the next chunk, returning the bytes that are ready for the parser"""
+        return self._rewrite(self._pending + chunk, final=False)
+    
+    def close(self) -> bytes:
+        """Rewrite whatever was held back at the end of the feed"""
+        return self._rewrite(self._pending, final=True)
+    
+    def _rewrite(self, data: bytes, final: bool) -> bytes:
+        """Rewrite data from the current CDATA state, holding back an unfinished reference or marker"""
+        output = []
+        position = 0
+        while position < len(data):
+            if self._in_cdata:
+                end = data.find(CDATA_END, position)
+                if end < 0:
+                    # Keep a possibly split ']]>' for the next chunk
+                    keep = len(data) if final else max(position, len(data) - len(CDATA_END) + 1)
+                    output.append(data[position:keep])
+                    position = keep
+                    break
+                output.append(data[position:end + len(CDATA_END)])
+                position = end + len(CDATA_END)
+                self._in_cdata = False
+                continue
+            
+            match = MARKUP_PATTERN.search(data, position)
+            if match is None:
+                # Keep a possibly split '<![CDATA[' for the next chunk
+                keep = len(data)
+                if not final:
+                    start = data.rfind(b'<', max(position, len(data) - len(CDATA_START) + 1))
+                    if start >= 0 and CDATA_START.startswith(data[start:]):
+                        keep = start
+                output.append(data[position:keep])
+                position = keep
+                break
+            
+            output.append(data[position:match.start()])
+            if match.group() == CDATA_START:
+                output.append(CDATA_START)
+                position = match.end()
+                self._in_cdata = True
+                continue
+            
+            reference = REFERENCE_PATTERN.match(data, match.start())
+            if reference is None and not final and PARTIAL_REFERENCE_PATTERN.match(data, match.start()):
+                position = match.start()
+                break
+            
+            name = reference.group(1) if reference else None
+            if reference is None:
+                output.append(b'&amp;')
+                position = match.end()
+            elif name is None or name in XML_ENTITIES:
+                output.append(reference.group())
+                position = reference.end()
+            else:
+                output.append(HTML_ENTITIES.get(name) or b'&amp;' + name + b';')
+                position = reference.end()
+        
+        self._pending = data[position:]
+        return b''.join(output)
+
+class FeedParser:
+    """Turns the items of an RSS or Atom feed into articles as its body is fed in"""
+    
+    def __init__(self, parse_date: Callable[[str], Optional[object]], max_articles: int = None):
+        self.parse_date = parse_date
+        self.max_articles = max_articles or SCRAPING_CONFIG['max_articles_per_source']
+        self.count = 0
+        self._entities = EntityEscaper()
+        self._parser = etree.XMLPullParser(events=('end',), recover=True, resolve_entities=False, no_network=True)
+    
+    @property
+    def done(self) -> bool:
+        """Whether the feed has yielded as many articles as a source keeps"""
+        return self.count >= self.max_articles
+    
+    def feed(self, chunk: bytes) -> List[Dict]:
+        """Parse the next chunk of the feed, returning the articles it completed"""
+        try:
+            self._parser.feed(self._entities.feed(chunk))
+        except etree.XMLSyntaxError as e:
+            logger.warning(f"Malformed feed: {e}")
+        return self._read_articles()
+    
+    def close(self) -> List[Dict]:
+        """Finish the feed, returning any articles completed by its end"""
+        try:
+            self._parser.feed(self._entities.close())
+            self._parser.close()
+        except etree.XMLSyntaxError as e:
+            logger.warning(f"Malformed feed: {e}")
+        return self._read_articles()
+    
+    def _read_articles(self) -> List[Dict]:
+        """Turn the items closed since the last read into articles"""
+        articles = []
+        for _, element in self._parser.read_events():
+            if self.done or not isinstance(element.tag, str) or split_tag(element.tag)[1] not in ITEM_TAGS:
+                continue
+            
+            articles.append(self._article(element))
+            self.count += 1
+            
+            # Drop parsed items so the tree stays small however long the feed is
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        return articles
+    
+    def _article(self, item) -> Dict:
+        """Read an item's title, link, published date and summary"""
+        fields = {}
+        link = permalink = None
+        for child in item:
+            if not isinstance(child.tag, str):
+                continue
+            key = split_tag(child.tag)
+            fields.setdefault(key, child)
+            
+            # Atom links are attributes; RSS links are text, with a permalink guid as the fallback
+            if key == ('', 'link') and not link:
+                if child.get('href') is not None:
+                    if child.get('rel', 'alternate') == 'alternate':
+                        link = child.get('href')
+                else:
+                    link = (child.text or '').strip()
+            elif key == ('', 'guid') and child.get('isPermaLink', 'true') == 'true':
+                permalink = (child.text or '').strip()
+        
+        def text(tags: List[tuple]) -> str:
+            for key in tags:
+                if key in fields:
+                    # CDATA and escaped HTML still hold their entities
+                    value = ''.join(fields[key].itertext())
+                    return (html.unescape(value) if '&' in value else value).strip()
+            return ''
+        
+        return {
+            'title': text(TITLE_TAGS),
+            'link': link or permalink or '',
+            'published': self.parse_date(text(PUBLISHED_TAGS)),
+            'summary': text(SUMMARY_TAGS),
+        }
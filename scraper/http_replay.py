@@ -0,0 +1,419 @@
+"""
+Record and replay the HTTP responses of the news sources for offline scrape runs
+
+Recording fetches the RSS feed and website of every source in NEWS_SOURCES and
+stores the responses on disk, or generates them from the synthetic corpus. Replay
+serves them from a local HTTP server that can add latency and limit bandwidth, per
+source if needed, and routes a scraper's session to it, so full scrapes can be
+benchmarked deterministically and offline.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import METRICS_CONFIG, NEWS_SOURCES, REPLAY_CONFIG, SCRAPING_CONFIG
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = 'index.json'
+
+# Response headers kept in a recording
+RECORDED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+# Bytes written per chunk when bandwidth is limited
+CHUNK_SIZE = 16 * 1024
+
+class Recording:
+    """Recorded responses stored in a directory, keyed by request URL"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.entries = self._load()
+    
+    def _load(self) -> Dict[str, Dict]:
+        """Load the index of recorded responses"""
+        path = os.path.join(self.directory, INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def save(self):
+        """Atomically write the index of recorded responses"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, INDEX_FILE)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+    
+    def add(self, url: str, source: str, status: int, headers: Dict[str, str], body: bytes, elapsed: float = 0):
+        """Store a response's status, headers, body and fetch time"""
+        body_file = f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}.body"
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, body_file), 'wb') as f:
+            f.write(body)
+        
+        self.entries[url] = {
+            'source': source,
+            'status': status,
+            'headers': {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            'body_file': body_file,
+            'elapsed': elapsed,
+        }
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """Get a recorded response, with its body, or None if the URL was not recorded"""
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry['body_file']), 'rb') as f:
+            return dict(entry, body=f.read())
+
+def record_sources(directory: str = None, sources: list = None) -> Recording:
+    """Fetch the RSS feed and website of each enabled source and record the responses"""
+    recording = Recording(directory or REPLAY_CONFIG['directory'])
+    session = requests.Session()
+    session.headers.update({'User-Agent': SCRAPING_CONFIG['user_agent']})
+    
+    for source_key, source_config in NEWS_SOURCES.items():
+        if sources and source_key not in sources:
+            continue
+        if not source_config.get('enabled', True):
+            continue
+        
+        for url in filter(None, [source_config.get('rss_feed'), source_config.get('url')]):
+            try:
+                response = session.get(url, timeout=SCRAPING_CONFIG['timeout'])
+                recording.add(url, source_key, response.status_code, response.headers,
+                              response.content, response.elapsed.total_seconds())
+                logger.info(f"Recorded {url}: {response.status_code}, {len(response.content)} bytes")
+            except requests.RequestException as e:
+                logger.error(f"Error recording {url}: {e}")
+            time.sleep(SCRAPING_CONFIG['request_delay'])
+    
+    recording.save()
+    logger.info(f"Recorded {len(recording.entries)} responses to {recording.directory}")
+    return recording
+
+def synthesize_recording(directory: str = None, seed: int = 0, articles_per_source: int = None) -> Recording:
+    """Record synthetic feeds and websites for every enabled source, for replays without real recordings"""
+    from synthetic_corpus import SyntheticCorpus
+    
+    corpus = SyntheticCorpus(seed)
+    articles_per_source = articles_per_source or SCRAPING_CONFIG['max_articles_per_source']
+    recording = Recording(directory or REPLAY_CONFIG['directory'])
+    
+    for source_key, source_config in NEWS_SOURCES.items():
+        if not source_config.get('enabled', True):
+            continue
+        
+        articles = corpus.articles(articles_per_source, source=source_key)
+        if source_config.get('rss_feed'):
+            recording.add(source_config['rss_feed'], source_key, 200,
+                          {'Content-Type': 'application/rss+xml', 'ETag': f'"{seed}-{source_key}"'},
+                          corpus.rss_feed(articles, title=source_config['name']))
+        recording.add(source_config['url'], source_key, 200, {'Content-Type': 'text/html; charset=utf-8'},
+                      corpus.html_page(articles))
+    
+    recording.save()
+    logger.info(f"Synthesized {len(recording.entries)} responses in {recording.directory}")
+    return recording
+
+class ReplayServer:
+    """Local HTTP server answering requests from a recording, with injected latency and bandwidth limits
+    
+    latency is seconds before the response starts, or 'recorded' to wait as long as
+    the original fetch took. bandwidth is bytes per second (None for unlimited).
+    source_latency and source_bandwidth override them for individual sources.
+    """
+    
+    def __init__(self, recording: Recording, latency=0, bandwidth: float = None,
+                 source_latency: Dict[str, float] = None, source_bandwidth: Dict[str, float] = None):
+        self.recording = recording
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.source_latency = source_latency or {}
+        self.source_bandwidth = source_bandwidth or {}
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def base_url(self) -> str:
+        """URL the server is listening on"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+    
+    def start(self):
+        """Serve requests from a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        logger.info(f"Replaying {len(self.recording.entries)} responses from {self.base_url}")
+    
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def delay_for(self, entry: Dict) -> float:
+        """Get the seconds to wait before answering with a recorded response"""
+        latency = self.source_latency.get(entry['source'], self.latency)
+        if latency == 'recorded':
+            return entry.get('elapsed', 0)
+        return float(latency or 0)
+    
+    def _handler(self):
+        """Build the request handler class bound to this server"""
+        replay = self
+        
+        class ReplayHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                with replay._lock:
+                    replay.requests_served += 1
+                
+                # Requests arrive as /<scheme>/<host>/<path>, see ReplayAdapter
+                scheme, _, rest = self.path.lstrip('/').partition('/')
+                entry = replay.recording.get(f"{scheme}://{rest}")
+                if entry is None:
+                    self.send_error(404, "Not recorded")
+                    return
+                
+                time.sleep(replay.delay_for(entry))
+                
+                headers = entry['headers']
+                if headers.get('ETag') and self.headers.get('If-None-Match') == headers['ETag']:
+                    self.send_response(304)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                
+                body = entry['body']
+                self.send_response(entry['status'])
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                
+                bandwidth = replay.source_bandwidth.get(entry['source'], replay.bandwidth)
+                if not bandwidth:
+                    self.wfile.write(body)
+                    return
+                for start in range(0, len(body), CHUNK_SIZE):
+                    chunk = body[start:start + CHUNK_SIZE]
+                    time.sleep(len(chunk) / bandwidth)
+                    self.wfile.write(chunk)
+            
+            def log_message(self, format, *args):
+                logger.debug(f"Replay {self.address_string()}: {format % args}")
+        
+        return ReplayHandler
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter sending every request of a session to a replay server
+    
+    URLs are rewritten only when the request is sent, so per-host throttling still
+    sees each source's real host.
+    """
+    
+    def __init__(self, base_url: str, **kwargs):
+        self.base_url = base_url
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        """Send a request to the replay server instead of its real host"""
+        parts = urlsplit(request.url)
+        request.url = f"{self.base_url}/{parts.scheme}/{parts.netloc}{parts.path or '/'}"
+        if parts.query:
+            request.url += f"?{parts.query}"
+        return super().send(request, **kwargs)
+
+def route_to_replay(session: requests.Session, base_url: str):
+    """Send all of a session's requests to a replay server"""
+    adapter = ReplayAdapter(base_url)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+def parse_overrides(values: list) -> Dict[str, float]:
+    """Parse source=value arguments"""
+    overrides = {}
+    for value in values or []:
+        source, _, amount = value.partition('=')
+        overrides[source] = amount if amount == 'recorded' else float(amount)
+    return overrides
+
+def _replay_runs(server: ReplayServer, runs: int) -> list:
+    """Time full scrapes against a replay server on the current (scratch) database"""
+    from database import Article, Base, get_engine
+    from news_scraper import NewsScraper
+    
+    results = []
+    for run in range(runs):
+        engine = get_engine()
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        
+        # An empty feed cache and host state, so every run fetches and parses every feed
+        # and the replayed latencies never reach the real host state
+        run_directory = tempfile.mkdtemp(prefix='newswordy-replay-')
+        SCRAPING_CONFIG['feed_cache_file'] = os.path.join(run_directory, 'feed_cache.json')
+        SCRAPING_CONFIG['host_state_file'] = os.path.join(run_directory, 'host_state.json')
+        METRICS_CONFIG['file'] = os.path.join(run_directory, 'scrape_metrics.json')
+        scraper = NewsScraper()
+        route_to_replay(scraper.transport.session, server.base_url)
+        
+        served = server.requests_served
+        start = time.perf_counter()
+        scraper.run_daily_scrape()
+        elapsed = time.perf_counter() - start
+        
+        articles = scraper.db_manager.session.query(Article).count()
+        scraper.db_manager.session.close()
+        stage_seconds = defaultdict(float)
+        for metrics in scraper.run_metrics.to_json()['sources'].values():
+            for stage, seconds in metrics['seconds'].items():
+                stage_seconds[stage] += seconds
+        results.append({
+            'seconds': elapsed,
+            'articles': articles,
+            'requests': server.requests_served - served,
+            'stage_seconds': dict(stage_seconds),
+            'metrics_file': METRICS_CONFIG['file'],
+        })
+        logger.info(f"Replay run {run + 1}: {elapsed:.2f} s, {articles} articles")
+    
+    return results
+
+def run_replay_benchmark(server: ReplayServer, runs: int = 1, database_url: str = None) -> Dict:
+    """Run full scrapes against a replay server, each on an empty scratch database
+    
+    The configured database, feed cache, host state and metrics file are left as they
+    were, and so is the configuration once the runs are done.
+    """
+    if not database_url:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='newswordy-replay-'), 'replay.db')}"
+    
+    from database import use_database
+    
+    saved_configs = [(config, dict(config)) for config in (SCRAPING_CONFIG, METRICS_CONFIG)]
+    try:
+        with use_database(database_url):
+            results = _replay_runs(server, runs)
+        report = {
+            'database': database_url.split(':', 1)[0],
+            'max_workers': SCRAPING_CONFIG['max_workers'],
+            'pipeline': SCRAPING_CONFIG['pipeline'],
+            'timeout': SCRAPING_CONFIG['timeout'],
+            'request_delay': SCRAPING_CONFIG['request_delay'],
+            'latency': server.latency,
+            'bandwidth': server.bandwidth,
+            'source_latency': server.source_latency,
+            'source_bandwidth': server.source_bandwidth,
+            'median_seconds': statistics.median(result['seconds'] for result in results),
+            'runs': results,
+        }
+    finally:
+        for config, values in saved_configs:
+            config.clear()
+            config.update(values)
+    
+    return report
+
+def main():
+    """Parse arguments and record or replay"""
+    parser = argparse.ArgumentParser(description="Record news source responses and replay them for offline scrapes")
+    parser.add_argument('--directory', default=REPLAY_CONFIG['directory'], help="recording directory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    record_parser = subparsers.add_parser('record', help="fetch and record every source's feed and website")
+    record_parser.add_argument('--sources', type=lambda value: value.split(','),
+                               help="comma-separated source keys to record (default: all enabled)")
+    
+    synthesize_parser = subparsers.add_parser('synthesize', help="record synthetic responses for every source")
+    synthesize_parser.add_argument('--seed', type=int, default=0, help="synthetic corpus seed")
+    synthesize_parser.add_argument('--articles', type=int, help="articles per source feed and page")
+    
+    replay_parser = subparsers.add_parser('replay', help="run full scrapes against the recorded responses")
+    replay_parser.add_argument('--runs', type=int, default=1, help="scrapes to run and time")
+    replay_parser.add_argument('--latency', default=REPLAY_CONFIG['latency'],
+                               help="seconds before each response starts, or 'recorded'")
+    replay_parser.add_argument('--bandwidth', type=float, default=REPLAY_CONFIG['bandwidth'],
+                               help="bytes per second per response (default: unlimited)")
+    replay_parser.add_argument('--source-latency', action='append', metavar='SOURCE=SECONDS',
+                               help="latency for one source (repeatable)")
+    replay_parser.add_argument('--source-bandwidth', action='append', metavar='SOURCE=BYTES',
+                               help="bandwidth for one source (repeatable)")
+    replay_parser.add_argument('--workers', type=int, help="sources scraped in parallel")
+    replay_parser.add_argument('--timeout', type=float, help="request timeout in seconds")
+    replay_parser.add_argument('--request-delay', type=float, help="seconds between requests to the same host")
+    replay_parser.add_argument('--no-pipeline', dest='pipeline', action='store_false', default=None,
+                               help="scrape each source whole in concurrent workers instead of the stage pipeline")
+    replay_parser.add_argument('--database-url',
+                               help="scratch database whose tables are dropped before each run "
+                                    "(default: a temporary SQLite file)")
+    replay_parser.add_argument('--output', help="write the results to this JSON file")
+    args = parser.parse_args()
+    
+    if args.command == 'record':
+        record_sources(args.directory, args.sources)
+        return
+    if args.command == 'synthesize':
+        synthesize_recording(args.directory, args.seed, args.articles)
+        return
+    
+    recording = Recording(args.directory)
+    if not recording.entries:
+        parser.error(f"no recording in {args.directory}; run the record command first")
+    
+    for name, value in [('max_workers', args.workers), ('timeout', args.timeout), ('request_delay', args.request_delay),
+                        ('pipeline', args.pipeline)]:
+        if value is not None:
+            SCRAPING_CONFIG[name] = value
+    
+    latency = args.latency if args.latency == 'recorded' else float(args.latency)
+    server = ReplayServer(
+        recording,
+        latency=latency,
+        bandwidth=args.bandwidth,
+        source_latency=parse_overrides(args.source_latency),
+        source_bandwidth=parse_overrides(args.source_bandwidth)
+    )
+    with server:
+        report = run_replay_benchmark(server, runs=args.runs, database_url=args.database_url)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
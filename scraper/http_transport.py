@@ -0,0 +1,252 @@
+"""
+Per-host HTTP transport with politeness limits, adaptive timeouts, retries and a circuit breaker
+
+Every request goes through the host's request slots and spacing, gets a read timeout
+adapted to how fast the host usually answers, and is retried with jittered backoff on
+connection errors, 429 and 5xx responses. Hosts that keep failing have their circuit
+opened, so later runs skip them straight away until it is time to probe them again.
+The latency and circuit state of each host persist between runs.
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import SCRAPING_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying; other error statuses (403, 404, ...) fail straight away
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Weight of the latest response in a host's average latency
+LATENCY_SMOOTHING = 0.3
+
+def host_of(url: str) -> str:
+    """Get the host a URL's requests are limited and tracked under"""
+    return urlparse(url).netloc.lower()
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+class HostHealth:
+    """Average latency and circuit breaker state of each host, persisted between runs
+    
+    A host's circuit opens after failure_threshold consecutive failed requests and
+    stays open for reset_after seconds, doubling each time a probe fails (up to
+    max_reset_after). Once that time has passed the host is half-open: requests are
+    let through without retries, and the first success closes the circuit again.
+    """
+    
+    def __init__(self, path: str = None, failure_threshold: int = None,
+                 reset_after: float = None, max_reset_after: float = None):
+        self.path = path
+        self.failure_threshold = failure_threshold or SCRAPING_CONFIG['circuit_failure_threshold']
+        self.reset_after = reset_after or SCRAPING_CONFIG['circuit_reset_after']
+        self.max_reset_after = max_reset_after or SCRAPING_CONFIG['circuit_max_reset_after']
+        self._lock = threading.Lock()
+        self.hosts = self._load()
+    
+    def _load(self) -> Dict[str, Dict]:
+        """Load host states from disk"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable host state {self.path}: {e}")
+            return {}
+    
+    def save(self):
+        """Write host states to disk"""
+        if not self.path:
+            return
+        
+        with self._lock:
+            data = {host: dict(state) for host, state in self.hosts.items()}
+        
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Failed to save host state {self.path}: {e}")
+    
+    def open_until(self, host: str) -> Optional[datetime]:
+        """Get when a host's open circuit may be probed again, or None if requests are allowed now"""
+        with self._lock:
+            retry_at = self.hosts.get(host, {}).get('retry_at')
+        if retry_at is None:
+            return None
+        
+        retry_at = datetime.fromisoformat(retry_at)
+        return retry_at if retry_at > datetime.now(timezone.utc) else None
+    
+    def is_half_open(self, host: str) -> bool:
+        """Check whether a host's circuit has opened and is now due for a probe"""
+        with self._lock:
+            has_opened = self.hosts.get(host, {}).get('retry_at') is not None
+        return has_opened and self.open_until(host) is None
+    
+    def read_timeout(self, host: str) -> float:
+        """Get a host's read timeout: a multiple of its average latency, within the configured bounds"""
+        with self._lock:
+            latency = self.hosts.get(host, {}).get('latency')
+        if latency is None:
+            return SCRAPING_CONFIG['timeout']
+        return min(SCRAPING_CONFIG['timeout'],
+                   max(SCRAPING_CONFIG['min_read_timeout'], latency * SCRAPING_CONFIG['latency_timeout_factor']))
+    
+    def record_success(self, host: str, latency: float):
+        """Close a host's circuit and fold the response's latency into its average"""
+        with self._lock:
+            state = self.hosts.setdefault(host, {})
+            if state.get('retry_at'):
+                logger.info(f"Circuit for {host} closed after a successful probe")
+            previous = state.get('latency')
+            state['latency'] = latency if previous is None else (
+                LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * previous
+            )
+            state['failures'] = 0
+            state['opens'] = 0
+            state.pop('retry_at', None)
+            state.pop('last_error', None)
+    
+    def record_failure(self, host: str, error: str):
+        """Count a failed request, opening the host's circuit once it keeps failing"""
+        with self._lock:
+            state = self.hosts.setdefault(host, {})
+            state['failures'] = state.get('failures', 0) + 1
+            state['last_error'] = error
+            
+            # A failed probe reopens the circuit straight away, for longer each time
+            if state['failures'] >= self.failure_threshold or state.get('retry_at'):
+                state['opens'] = state.get('opens', 0) + 1
+                delay = min(self.max_reset_after, self.reset_after * 2 ** (state['opens'] - 1))
+                retry_at = datetime.now(timezone.utc) + timedelta(seconds=delay)
+                state['retry_at'] = retry_at.isoformat()
+                logger.warning(f"Circuit for {host} opened until {retry_at:%Y-%m-%d %H:%M} UTC "
+                               f"after {state['failures']} failures: {error}")
+
+class HostTransport:
+    """HTTP layer shared by concurrent scrape workers
+    
+    Keeps a pooled session, limits in-flight requests per host and spaces them by the
+    configured delay, and applies the host's timeouts, retries and circuit breaker.
+    """
+    
+    def __init__(self, max_requests_per_host: int = None, delay: float = None, health: HostHealth = None):
+        self.max_requests_per_host = max_requests_per_host or SCRAPING_CONFIG['max_requests_per_host']
+        self.delay = SCRAPING_CONFIG['request_delay'] if delay is None else delay
+        self.health = health or HostHealth(SCRAPING_CONFIG['host_state_file'])
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': SCRAPING_CONFIG['user_agent']})
+        
+        # Keep a pool for every host a run talks to, each as large as the host's request slots
+        adapter = HTTPAdapter(pool_connections=SCRAPING_CONFIG['pool_connections'],
+                              pool_maxsize=self.max_requests_per_host)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_request_time = {}
+    
+    @contextmanager
+    def limit(self, url: str):
+        """Hold a request slot for the URL's host, spacing requests by the configured delay"""
+        host = host_of(url)
+        
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_requests_per_host)
+                self._semaphores[host] = semaphore
+        
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                request_time = max(now, self._next_request_time.get(host, now))
+                self._next_request_time[host] = request_time + self.delay
+            
+            if request_time > now:
+                time.sleep(request_time - now)
+            
+            yield
+    
+    def is_open(self, url: str) -> bool:
+        """Check whether requests to the URL's host are being skipped by its circuit breaker"""
+        return self.health.open_until(host_of(url)) is not None
+    
+    def _backoff(self, attempt: int, response: requests.Response = None) -> float:
+        """Get the seconds to wait before a retry, honouring a short Retry-After"""
+        cap = SCRAPING_CONFIG['retry_backoff_max']
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit() and int(retry_after) <= cap:
+            return float(retry_after)
+        
+        # Full jitter keeps retries of the sources that failed together from lining up
+        return random.uniform(0, min(cap, SCRAPING_CONFIG['retry_backoff'] * 2 ** attempt))
+    
+    def get(self, url: str, headers: Dict = None, timings=None, stream: bool = False) -> requests.Response:
+        """GET a URL within the host's limits, retrying transient failures
+        
+        Raises CircuitOpenError without sending anything if the host's circuit is open,
+        and the last error once the retries run out. The requests (but not waits for a
+        slot or backoff) are timed as the fetch stage of timings, a SourceTimings, if given.
+        With stream, only the headers have been read when the response is returned.
+        """
+        host = host_of(url)
+        open_until = self.health.open_until(host)
+        if open_until:
+            raise CircuitOpenError(f"Circuit for {host} is open until {open_until:%Y-%m-%d %H:%M} UTC")
+        
+        # A half-open host gets a single probe rather than the full retry budget
+        retries = 0 if self.health.is_half_open(host) else SCRAPING_CONFIG['retries']
+        timeout = (SCRAPING_CONFIG['connect_timeout'], self.health.read_timeout(host))
+        
+        for attempt in range(retries + 1):
+            response = None
+            try:
+                with self.limit(url):
+                    with timings.stage('fetch') if timings is not None else nullcontext():
+                        response = self.session.get(url, headers=headers, timeout=timeout, stream=stream)
+                
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    self.health.record_success(host, response.elapsed.total_seconds())
+                    return response
+                error = requests.HTTPError(f"{response.status_code} {response.reason} for url: {url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                # Waiting out another read timeout would cost more than the retry could win
+                if isinstance(e, requests.ReadTimeout):
+                    self.health.record_failure(host, str(e))
+                    raise
+            except requests.RequestException as e:
+                self.health.record_failure(host, str(e))
+                raise
+            
+            if response is not None:
+                response.close()
+            if attempt < retries:
+                delay = self._backoff(attempt, response)
+                logger.info(f"Retrying {url} in {delay:.1f}s after: {error}")
+                time.sleep(delay)
+        
+        self.health.record_failure(host, str(error))
+        raise error
@@ -2,266 +2,512 @@
 Main news scraper for collecting headlines from various news sources
 """
 
+import argparse
+import email.utils
+import itertools
 import requests
-import feedparser
-from bs4 import BeautifulSoup
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import time
 import logging
-from typing import List, Dict, Optional
-from urllib.parse import urljoin
+from typing import List, Dict, Optional, Tuple
 import re
 
-from config import NEWS_SOURCES, SCRAPING_CONFIG
-from database import DatabaseManager
+from config import NEWS_SOURCES, SCRAPING_CONFIG, WORD_PROCESSING_CONFIG
+from database import DatabaseManager, as_utc
+from feed_cache import FeedCache
+from feed_parser import FeedParser
+from html_extractor import extract_headlines
+from http_transport import HostTransport
+from scrape_metrics import RunMetrics, SourceTimings
+from scrape_pipeline import ScrapePipeline
+from scrape_profiler import ScrapeProfiler
+from url_index import KnownUrlIndex
 from word_processor import WordProcessor
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Feed date parsers: RFC 822 (RSS pubDate) and ISO 8601 (Atom and Dublin Core dates)
+DATE_PARSERS = [email.utils.parsedate_to_datetime, datetime.fromisoformat]
+
 class NewsScraper:
     """Main scraper class for collecting news headlines"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': SCRAPING_CONFIG['user_agent']
-        })
-        self.db_manager = DatabaseManager()
+        self.transport = HostTransport()
+        self._db_manager = None
+        self._db_manager_lock = threading.Lock()
         self.word_processor = WordProcessor()
+        self.feed_cache = FeedCache(SCRAPING_CONFIG['feed_cache_file'])
+        self._known_urls = None
+        self._known_urls_lock = threading.Lock()
+        self._ingested_range = None
+        self._ingested_range_lock = threading.Lock()
+        self.run_metrics = RunMetrics()
+        self.profiler = None
+        self._date_parsers = {}
+    
+    @property
+    def db_manager(self) -> DatabaseManager:
+        """Database session of the scraper, opened on first use so parsing and tokenizing need no database"""
+        with self._db_manager_lock:
+            if self._db_manager is None:
+                self._db_manager = DatabaseManager()
+            return self._db_manager
     
-    def get_rss_feed(self, rss_url: str) -> List[Dict]:
-        """Parse RSS feed and extract article information"""
+    @property
+    def known_urls(self) -> KnownUrlIndex:
+        """Index of stored article URLs, loaded from the database on first use"""
+        with self._known_urls_lock:
+            if self._known_urls is None:
+                self._known_urls = KnownUrlIndex.load(
+                    self.db_manager, SCRAPING_CONFIG['known_url_lookback_days']
+                )
+            return self._known_urls
+    
+    def _record_ingested(self, articles: List[Dict]):
+        """Widen the range of published dates saved during this run"""
+        dates = [as_utc(article['published_date']) for article in articles if article.get('published_date')]
+        if not dates:
+            return
+        
+        with self._ingested_range_lock:
+            if self._ingested_range:
+                dates.extend(self._ingested_range)
+            self._ingested_range = (min(dates), max(dates))
+    
+    def refresh_scoreboards(self):
+        """Promote new co-occurrence anchors and refresh cached scoreboards covering the articles saved during this run"""
+        with self._ingested_range_lock:
+            ingested_range, self._ingested_range = self._ingested_range, None
+        
+        if not ingested_range:
+            return
+        
+        try:
+            self.db_manager.promote_cooccurrence_anchors(*ingested_range)
+        except Exception as e:
+            logger.error(f"Error promoting co-occurrence anchors: {e}")
+        
+        try:
+            self.db_manager.refresh_scoreboard_cache(*ingested_range)
+        except Exception as e:
+            logger.error(f"Error refreshing scoreboard cache: {e}")
+    
+    def _fetch(self, url: str, headers: Dict = None, timings: SourceTimings = None,
+               stream: bool = False) -> requests.Response:
+        """GET a URL through the per-host transport, recording the response's latency (and size, unless streamed)"""
+        timings = timings or SourceTimings()
+        response = self.transport.get(url, headers=headers, timings=timings, stream=stream)
+        timings.record_fetch(response.elapsed.total_seconds(), 0 if stream else len(response.content))
+        return response
+    
+    def _read_chunks(self, url: str, response: requests.Response, timings: SourceTimings):
+        """Read a streamed response body in chunks up to the feed size cap, timing the reads as fetch"""
+        chunks = response.iter_content(SCRAPING_CONFIG['feed_chunk_size'])
+        received = 0
+        while received < SCRAPING_CONFIG['max_feed_bytes']:
+            with timings.stage('fetch'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            received += len(chunk)
+            timings.fetch_bytes += len(chunk)
+            yield chunk
+        logger.warning(f"Stopped reading {url} at the {received} byte cap")
+    
+    def get_rss_feed(self, rss_url: str, timings: SourceTimings = None) -> Optional[List[Dict]]:
+        """Stream and parse an RSS feed, extracting new article information, or return None if it has nothing new"""
+        timings = timings or SourceTimings()
         try:
             logger.info(f"Fetching RSS feed: {rss_url}")
             
-            response = self.session.get(rss_url, timeout=SCRAPING_CONFIG['timeout'])
-            response.raise_for_status()
+            with self._fetch(rss_url, headers=self.feed_cache.conditional_headers(rss_url), timings=timings,
+                             stream=True) as response:
+                if response.status_code == 304:
+                    logger.info(f"RSS feed not modified: {rss_url}")
+                    self.feed_cache.update(rss_url)
+                    return None
+                
+                # Fingerprint the head of the feed, which holds its newest items, before parsing anything
+                chunks = self._read_chunks(rss_url, response, timings)
+                head = b''
+                for chunk in chunks:
+                    head += chunk
+                    if len(head) >= SCRAPING_CONFIG['feed_fingerprint_bytes']:
+                        break
+                
+                body_hash = self.feed_cache.fingerprint(head)
+                validators = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'body_hash': body_hash
+                }
+                if self.feed_cache.is_unchanged(rss_url, body_hash):
+                    logger.info(f"RSS feed content unchanged: {rss_url}")
+                    self.feed_cache.update(rss_url, **validators)
+                    return None
+                
+                # Recorded once the feed's articles are saved, so a failed scrape is not skipped next time
+                self.feed_cache.stage(rss_url, **validators)
+                
+                articles = []
+                known_count = 0
+                consecutive_known = 0
+                
+                # Stop reading the feed once enough articles are parsed or the stored ones are reached
+                known_urls = self.known_urls
+                for article in self.parse_feed_articles(itertools.chain([head], chunks), timings=timings, feed=rss_url):
+                    # Feeds are newest first, so a run of stored articles means the rest are stored too
+                    if article['link'] in known_urls:
+                        known_count += 1
+                        consecutive_known += 1
+                        if consecutive_known >= SCRAPING_CONFIG['known_url_stop_after']:
+                            logger.info(f"Reached {consecutive_known} already stored articles, stopping feed early")
+                            break
+                        continue
+                    consecutive_known = 0
+                    articles.append(article)
             
-            feed = feedparser.parse(response.content)
-            articles = []
+            timings.articles_skipped += known_count
             
-            for entry in feed.entries[:SCRAPING_CONFIG['max_articles_per_source']]:
-                article = {
-                    'title': entry.get('title', ''),
-                    'link': entry.get('link', ''),
-                    'published': self._parse_date(entry.get('published', '')),
-                    'summary': entry.get('summary', '')
-                }
-                articles.append(article)
+            logger.info(f"Extracted {len(articles)} new articles from RSS feed ({known_count} already stored)")
             
-            logger.info(f"Extracted {len(articles)} articles from RSS feed")
+            if not articles and known_count:
+                self.feed_cache.commit(rss_url)
+                return None
             return articles
-            
+        
         except Exception as e:
             logger.error(f"Error fetching RSS feed {rss_url}: {e}")
+            self.feed_cache.discard(rss_url)
             return []
     
-    def scrape_website_headlines(self, source_config: Dict) -> List[Dict]:
+    def parse_feed_articles(self, content, timings: SourceTimings = None, feed: str = None):
+        """Parse an RSS or Atom feed body, given whole or as an iterable of chunks, yielding its articles in feed order
+        
+        Articles are yielded as soon as their items are parsed, and no more chunks are
+        read once the source's article limit is reached. feed (the feed's URL) keys the
+        date format remembered for the feed.
+        """
+        timings = timings or SourceTimings()
+        parser = FeedParser(lambda date_string: self._parse_date(date_string, feed))
+        
+        for chunk in ([content] if isinstance(content, bytes) else content):
+            with timings.stage('parse'):
+                articles = parser.feed(chunk)
+            yield from articles
+            if parser.done:
+                return
+        
+        with timings.stage('parse'):
+            articles = parser.close()
+        yield from articles
+    
+    def scrape_website_headlines(self, source_config: Dict, timings: SourceTimings = None) -> List[Dict]:
         """Scrape headlines directly from website"""
+        timings = timings or SourceTimings()
         try:
             logger.info(f"Scraping website: {source_config['url']}")
             
-            response = self.session.get(source_config['url'], timeout=SCRAPING_CONFIG['timeout'])
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            articles = []
+            response = self._fetch(source_config['url'], timings=timings)
             
-            # Try different selectors for headlines
-            for selector in source_config['headline_selectors']:
-                headlines = soup.select(selector)
-                if headlines:
-                    logger.info(f"Found {len(headlines)} headlines with selector: {selector}")
-                    break
-            
-            if not headlines:
-                logger.warning(f"No headlines found for {source_config['name']}")
-                return []
-            
-            # Extract article information
-            for headline in headlines[:SCRAPING_CONFIG['max_articles_per_source']]:
-                title = headline.get_text(strip=True)
-                if not title:
-                    continue
-                
-                # Try to find the article link
-                link = self._extract_article_link(headline, source_config['url'])
-                
-                article = {
-                    'title': title,
-                    'link': link,
-                    'published': None,  # Will be None for direct scraping
-                    'summary': ''
-                }
-                articles.append(article)
+            with timings.stage('parse'):
+                articles = self.parse_website_headlines(response.content, source_config)
             
             logger.info(f"Extracted {len(articles)} articles from website")
             return articles
-            
+        
         except Exception as e:
             logger.error(f"Error scraping website {source_config['url']}: {e}")
             return []
     
-    def _extract_article_link(self, headline_element, base_url: str) -> str:
-        """Extract article link from headline element"""
-        # Look for link in the headline element or its parent
-        link_element = headline_element.find('a') or headline_element.parent.find('a')
-        
-        if link_element and link_element.get('href'):
-            href = link_element.get('href')
-            # Convert relative URLs to absolute
-            if href.startswith('/'):
-                return urljoin(base_url, href)
-            elif href.startswith('http'):
-                return href
-            else:
-                return urljoin(base_url, href)
-        
-        return ""
+    def parse_website_headlines(self, content: bytes, source_config: Dict) -> List[Dict]:
+        """Extract articles from a website's HTML using the source's headline selectors"""
+        return extract_headlines(content, source_config)
     
-    def _parse_date(self, date_string: str) -> Optional[datetime]:
-        """Parse date string from RSS feed"""
+    def _parse_date(self, date_string: str, feed: str = None) -> Optional[datetime]:
+        """Parse a date from an RSS feed into an aware UTC datetime (naive dates are taken to be UTC)
+        
+        The parser that last worked for the feed is tried first, so a feed's entries
+        usually parse on the first attempt.
+        """
+        date_string = date_string.strip() if date_string else ''
         if not date_string:
             return None
         
-        try:
-            # Try common date formats
-            date_formats = [
-                '%a, %d %b %Y %H:%M:%S %z',
-                '%a, %d %b %Y %H:%M:%S %Z',
-                '%Y-%m-%dT%H:%M:%S%z',
-                '%Y-%m-%dT%H:%M:%SZ',
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%d'
-            ]
-            
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(date_string, fmt)
-                except ValueError:
-                    continue
-            
-            # If all formats fail, try to extract date using regex
-            date_match = re.search(r'(\d{4}-\d{2}-\d{2})', date_string)
-            if date_match:
-                return datetime.strptime(date_match.group(1), '%Y-%m-%d')
-            
-            logger.warning(f"Could not parse date: {date_string}")
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error parsing date {date_string}: {e}")
-            return None
+        parsers = self._date_parsers.get(feed, DATE_PARSERS)
+        for parser in parsers:
+            try:
+                parsed = parser(date_string)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                continue
+            if feed is not None and parser is not parsers[0]:
+                self._date_parsers[feed] = [parser] + [other for other in DATE_PARSERS if other is not parser]
+            return as_utc(parsed)
+        
+        # If all formats fail, try to extract date using regex
+        date_match = re.search(r'(\d{4}-\d{2}-\d{2})', date_string)
+        if date_match:
+            try:
+                return datetime.strptime(date_match.group(1), '%Y-%m-%d').replace(tzinfo=timezone.utc)
+            except ValueError:
+                pass
+        
+        logger.warning(f"Could not parse date: {date_string}")
+        return None
     
-    def scrape_source(self, source_key: str, source_config: Dict) -> List[Dict]:
+    def scrape_source(self, source_key: str, source_config: Dict,
+                      db_manager: DatabaseManager = None) -> List[Dict]:
         """Scrape articles from a single source"""
+        db_manager = db_manager or self.db_manager
         start_time = datetime.now(timezone.utc)
-        articles = []
+        timings = SourceTimings(source_key, self.profiler)
         
         try:
             logger.info(f"Starting to scrape {source_config['name']}")
-            
-            # Try RSS feed first
-            if source_config.get('rss_feed'):
-                articles = self.get_rss_feed(source_config['rss_feed'])
-            
-            # If RSS feed is empty or doesn't exist, try direct scraping
-            if not articles:
-                articles = self.scrape_website_headlines(source_config)
-            
-            # Save articles to database and process word frequencies
-            saved_count = 0
-            for article in articles:
-                try:
-                    # Save the article
-                    article_id = self.db_manager.save_article(
-                        source=source_key,
-                        headline=article['title'],
-                        url=article['link'],
-                        published_date=article['published'],
-                        content=article.get('summary', '')
-                    )
-                    
-                    # Process word frequencies for this article
-                    if article['title']:
-                        word_frequencies = self.word_processor.analyze_headlines(
-                            [article['title']], 
-                            min_frequency=1, 
-                            top_n=50
-                        )
-                        
-                        if word_frequencies:
-                            self.db_manager.save_article_words(article_id, word_frequencies)
-                    
-                    saved_count += 1
-                except Exception as e:
-                    logger.error(f"Error saving article: {e}")
-            
-            end_time = datetime.now(timezone.utc)
-            
-            # Log scraping activity
-            self.db_manager.log_scraping_activity(
-                source=source_key,
-                status='success' if saved_count > 0 else 'error',
-                articles_scraped=saved_count,
-                start_time=start_time,
-                end_time=end_time
-            )
-            
-            logger.info(f"Successfully scraped {saved_count} articles from {source_config['name']}")
-            return articles
-            
+            status, articles = self._collect_articles(source_config, timings)
+            batch = []
+            if status is None:
+                articles, batch = self._prepare_batch(articles, timings)
+            self._save_source(db_manager, source_key, source_config, status, start_time, timings, batch)
+            return articles if status is None else []
+        
         except Exception as e:
-            end_time = datetime.now(timezone.utc)
+            self._source_failed(db_manager, source_key, source_config, start_time, timings, e)
+            return []
+    
+    def _collect_articles(self, source_config: Dict, timings: SourceTimings) -> Tuple[Optional[str], List[Dict]]:
+        """Fetch and parse a source's articles
+        
+        Returns a status instead of articles when there is nothing to process:
+        'skipped' when the source's hosts have been failing, 'unchanged' when its
+        feed has not changed since the last scrape.
+        """
+        # Skip sources whose hosts have been failing until their circuits are due for a probe
+        urls = [url for url in (source_config.get('rss_feed'), source_config['url']) if url]
+        if all(self.transport.is_open(url) for url in urls):
+            logger.warning(f"Skipping {source_config['name']}: its hosts have been failing")
+            return 'skipped', []
+        
+        # Try RSS feed first
+        articles = []
+        if source_config.get('rss_feed'):
+            articles = self.get_rss_feed(source_config['rss_feed'], timings=timings)
             
-            # Log error
-            self.db_manager.log_scraping_activity(
-                source=source_key,
-                status='error',
-                error_message=str(e),
-                start_time=start_time,
-                end_time=end_time
+            # Nothing new since the last scrape, so skip processing and the website fallback
+            if articles is None:
+                logger.info(f"No changes in {source_config['name']} feed since last scrape")
+                return 'unchanged', []
+        
+        # If RSS feed is empty or doesn't exist, try direct scraping
+        if not articles:
+            articles = self.scrape_website_headlines(source_config, timings=timings)
+        return None, articles
+    
+    def _prepare_batch(self, articles: List[Dict], timings: SourceTimings) -> Tuple[List[Dict], List[Dict]]:
+        """Drop already stored articles and analyze the rest, returning the new articles and their batch to save"""
+        # Drop articles that are already stored before doing any database or word processing work
+        new_articles = [article for article in articles if self.known_urls.claim(article['link'])]
+        if len(new_articles) < len(articles):
+            logger.info(f"Skipping {len(articles) - len(new_articles)} already stored articles")
+        timings.articles_skipped += len(articles) - len(new_articles)
+        
+        # Process word frequencies for the whole source at once
+        with timings.stage('tokenize'):
+            word_frequencies = self.word_processor.analyze_headlines_batch(
+                [article['title'] for article in new_articles],
+                min_frequency=1,
+                top_n=WORD_PROCESSING_CONFIG['max_words_per_article']
             )
-            
-            logger.error(f"Error scraping {source_config['name']}: {e}")
-            return []
+        batch = [
+            {
+                'headline': article['title'],
+                'url': article['link'],
+                'published_date': article['published'],
+                'content': article.get('summary', ''),
+                'words': words
+            }
+            for article, words in zip(new_articles, word_frequencies)
+        ]
+        return new_articles, batch
     
-    def scrape_all_sources(self) -> Dict[str, List[Dict]]:
-        """Scrape all enabled news sources"""
-        results = {}
+    def _save_source(self, db_manager: DatabaseManager, source_key: str, source_config: Dict, status: Optional[str],
+                     start_time: datetime, timings: SourceTimings, batch: List[Dict]) -> int:
+        """Save a source's batch in one transaction and log its scrape, returning the number of articles saved"""
+        saved_count = 0 if status is not None else self._save_batch(db_manager, source_key, source_config, timings, batch)
+        self._log_saved_source(db_manager, source_key, source_config, status, start_time, timings, saved_count)
+        return saved_count
+    
+    def _save_batch(self, db_manager: DatabaseManager, source_key: str, source_config: Dict,
+                    timings: SourceTimings, batch: List[Dict]) -> int:
+        """Save a source's batch in one transaction, returning the number of articles saved"""
+        with timings.stage('write'):
+            inserted = db_manager.save_articles_batch(source_key, batch)
+        if source_config.get('rss_feed'):
+            self.feed_cache.commit(source_config['rss_feed'])
+        self._record_ingested([article for article in batch if article['url'] in inserted])
+        saved_count = len(inserted)
+        timings.articles_inserted = saved_count
+        timings.articles_skipped += len(batch) - saved_count
+        return saved_count
+    
+    def _log_saved_source(self, db_manager: DatabaseManager, source_key: str, source_config: Dict,
+                          status: Optional[str], start_time: datetime, timings: SourceTimings, saved_count: int):
+        """Log the scrape of a source whose batch was saved, or that had nothing to save"""
+        if status is not None:
+            error_message = "Circuit open for every host of the source" if status == 'skipped' else None
+            self._log_source(db_manager, source_key, status, start_time, timings, error_message=error_message)
+            return
+        
+        # Log scraping activity
+        self._log_source(db_manager, source_key, 'success' if saved_count > 0 else 'error', start_time, timings)
         
+        logger.info(f"Successfully scraped {saved_count} articles from {source_config['name']} "
+                    f"(fetch {timings.seconds['fetch']:.2f}s, parse {timings.seconds['parse']:.2f}s, "
+                    f"tokenize {timings.seconds['tokenize']:.2f}s, write {timings.seconds['write']:.2f}s)")
+    
+    def _source_failed(self, db_manager: DatabaseManager, source_key: str, source_config: Dict,
+                       start_time: datetime, timings: SourceTimings, error: Exception):
+        """Log a failed source scrape and make sure the source is retried in full next time"""
+        if source_config.get('rss_feed'):
+            self.feed_cache.invalidate(source_config['rss_feed'])
+        
+        # Log error
+        self._log_source(db_manager, source_key, 'error', start_time, timings, error_message=str(error))
+        
+        logger.error(f"Error scraping {source_config['name']}: {error}")
+    
+    def _log_source(self, db_manager: DatabaseManager, source_key: str, status: str, start_time: datetime,
+                    timings: SourceTimings, error_message: str = None):
+        """Log a finished source scrape with its stage timings and add it to the run's metrics"""
+        end_time = datetime.now(timezone.utc)
+        self.run_metrics.add(source_key, status, (end_time - start_time).total_seconds(), timings)
+        db_manager.log_scraping_activity(
+            source=source_key,
+            status=status,
+            articles_scraped=timings.articles_inserted,
+            error_message=error_message,
+            start_time=start_time,
+            end_time=end_time,
+            timings=timings
+        )
+    
+    def _scrape_source_worker(self, source_key: str, source_config: Dict) -> List[Dict]:
+        """Scrape a source from a worker thread with its own database session"""
+        logger.info(f"Scraping source: {source_config['name']}")
+        
+        with DatabaseManager() as db_manager:
+            return self.scrape_source(source_key, source_config, db_manager=db_manager)
+    
+    def scrape_all_sources(self, max_workers: int = None, pipeline: bool = None) -> Dict[str, int]:
+        """Scrape all enabled news sources, returning the number of new articles found per source
+        
+        By default sources go through a pipeline of fetch, tokenize and write stages
+        (see scrape_pipeline.py); without it they are scraped whole by concurrent
+        workers, or one after another if max_workers is 1.
+        """
+        enabled_sources = []
         for source_key, source_config in NEWS_SOURCES.items():
             if not source_config.get('enabled', True):
                 logger.info(f"Skipping disabled source: {source_config['name']}")
                 continue
+            enabled_sources.append((source_key, source_config))
+        
+        if max_workers is None:
+            max_workers = SCRAPING_CONFIG['max_workers']
+        
+        if pipeline is None:
+            pipeline = SCRAPING_CONFIG['pipeline']
+        
+        self.run_metrics = RunMetrics()
+        
+        if pipeline:
+            results = ScrapePipeline(self, fetch_workers=max_workers).run(enabled_sources)
+        elif max_workers > 1:
+            results = self.scrape_sources_concurrently(enabled_sources, max_workers)
+        else:
+            results = {}
             
-            logger.info(f"Scraping source: {source_config['name']}")
-            
-            # Add delay between requests
-            time.sleep(SCRAPING_CONFIG['request_delay'])
+            for source_key, source_config in enabled_sources:
+                logger.info(f"Scraping source: {source_config['name']}")
+                
+                # Add delay between requests
+                time.sleep(SCRAPING_CONFIG['request_delay'])
+                
+                results[source_key] = len(self.scrape_source(source_key, source_config))
+        
+        self.feed_cache.save()
+        self.transport.health.save()
+        self.run_metrics.write()
+        self.refresh_scoreboards()
+        return results
+    
+    def scrape_sources_concurrently(self, sources: List[tuple], max_workers: int) -> Dict[str, int]:
+        """Scrape sources in parallel, keeping requests to each host within the politeness limits"""
+        logger.info(f"Scraping {len(sources)} sources with {max_workers} workers")
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scraper') as executor:
+            futures = {
+                source_key: executor.submit(self._scrape_source_worker, source_key, source_config)
+                for source_key, source_config in sources
+            }
             
-            articles = self.scrape_source(source_key, source_config)
-            results[source_key] = articles
+            results = {}
+            for source_key, future in futures.items():
+                try:
+                    results[source_key] = len(future.result())
+                except Exception as e:
+                    logger.error(f"Error scraping source {source_key}: {e}")
+                    results[source_key] = 0
         
         return results
     
-    def run_daily_scrape(self):
-        """Run daily scraping and update word frequencies"""
+    def run_daily_scrape(self, profiler: ScrapeProfiler = None):
+        """Run daily scraping and update word frequencies, profiling each source's stages if given a profiler"""
         logger.info("Starting daily scraping process")
         
         # Scrape all sources
-        self.scrape_all_sources()
+        if profiler:
+            self.profiler = profiler
+            try:
+                with profiler:
+                    self.scrape_all_sources()
+            finally:
+                self.profiler = None
+        else:
+            self.scrape_all_sources()
         
         logger.info("Daily scraping process completed")
 
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    """Add the options that enable profiling of a scrape run"""
+    parser.add_argument('--profile', action='store_true',
+                        help="profile each source's fetch, parse, tokenize and write stages")
+    parser.add_argument('--profile-dir', help="directory the profile is written to (default: profiles/)")
+    parser.add_argument('--profile-top', type=int, help="hotspots listed in the profile summary")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="also record peak memory and the largest allocation sites with tracemalloc")
+
+def profiler_from_arguments(args: argparse.Namespace) -> Optional[ScrapeProfiler]:
+    """Create the profiler requested on the command line, if any"""
+    if not args.profile:
+        return None
+    return ScrapeProfiler(args.profile_dir, top_n=args.profile_top, trace_memory=args.trace_memory)
+
 def main():
     """Main function to run the scraper"""
+    parser = argparse.ArgumentParser(description="Scrape headlines from all enabled news sources")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
     scraper = NewsScraper()
     
     # Run daily scrape
-    scraper.run_daily_scrape()
+    scraper.run_daily_scrape(profiler=profiler_from_arguments(args))
 
 if __name__ == "__main__":
     main()
@@ -2,10 +2,11 @@
 Scheduler for running the news scraper at regular intervals
 """
 
+import argparse
 import schedule
 import time
 import logging
-from news_scraper import NewsScraper
+from news_scraper import NewsScraper, add_profile_arguments, profiler_from_arguments
 
 # Set up logging
 logging.basicConfig(
@@ -18,37 +19,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def run_scraping_job():
-    """Run the daily scraping job"""
+def run_scraping_job(args: argparse.Namespace = None):
+    """Run the daily scraping job, profiled if requested on the command line"""
     try:
         logger.info("Starting scheduled scraping job")
         scraper = NewsScraper()
-        scraper.run_daily_scrape()
+        scraper.run_daily_scrape(profiler=profiler_from_arguments(args) if args else None)
         logger.info("Scheduled scraping job completed successfully")
     except Exception as e:
         logger.error(f"Error in scheduled scraping job: {e}")
 
-def setup_schedule():
+def setup_schedule(args: argparse.Namespace = None):
     """Set up the scheduling for different jobs"""
     
     # Run scraping at specific times (morning and evening)
-    schedule.every().day.at("06:00").do(run_scraping_job)
-    schedule.every().day.at("18:00").do(run_scraping_job)
+    schedule.every().day.at("06:00").do(run_scraping_job, args)
+    schedule.every().day.at("18:00").do(run_scraping_job, args)
     
     logger.info("Scheduler setup completed")
     logger.info("Jobs scheduled:")
     logger.info("- Scraping: 6AM, 6PM")
 
-def run_scheduler():
+def run_scheduler(args: argparse.Namespace = None):
     """Run the scheduler continuously"""
     logger.info("Starting scheduler...")
     
     # Run initial jobs
     logger.info("Running initial scraping job...")
-    run_scraping_job()
+    run_scraping_job(args)
     
     # Set up schedule
-    setup_schedule()
+    setup_schedule(args)
     
     # Keep the scheduler running
     while True:
@@ -63,4 +64,6 @@ def run_scheduler():
             time.sleep(300)  # Wait 5 minutes before retrying
 
 if __name__ == "__main__":
-    run_scheduler()
+    parser = argparse.ArgumentParser(description="Run the news scraper twice a day")
+    add_profile_arguments(parser)
+    run_scheduler(parser.parse_args())
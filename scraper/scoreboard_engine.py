@@ -0,0 +1,355 @@
+"""
+In-memory scoreboard engine mirroring the scoreboard SQL functions
+
+Articles and their word counts are loaded into NumPy arrays, with article_words
+kept as a sparse word-by-article matrix in coordinate form. Scoreboards are then
+computed with vectorized operations, following rank_word_frequencies,
+rank_word_percentages, compare_word_rankings and compute_scoreboard in
+supabase/functions. This lets scoreboards be precomputed in bulk, profiled, and
+checked against the SQL without database round-trips.
+"""
+
+import argparse
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from database import DatabaseManager, as_utc
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TOP_WORDS_SCOREBOARDS = ['get_top_words_scoreboard', 'get_associated_words_scoreboard']
+COMPARATIVE_SCOREBOARDS = ['get_comparative_words_scoreboard', 'get_comparative_associated_words_scoreboard']
+
+def _epoch_microseconds(value: datetime) -> int:
+    """Convert a datetime to microseconds since the epoch (naive datetimes are taken to be UTC)"""
+    return int(pd.Timestamp(as_utc(value)).value // 1000)
+
+def competition_rank(values: np.ndarray) -> np.ndarray:
+    """Rank values in descending order the way SQL rank() does (ties share a rank, then a gap)"""
+    descending = -np.sort(values)[::-1]
+    return np.searchsorted(descending, -values, side='left') + 1
+
+def normalize_search_term(search_term: Optional[str]) -> Optional[str]:
+    """Normalize a search term like lower(trim(search_term)) in the SQL functions"""
+    return search_term.strip().lower() if search_term is not None else None
+
+class ScoreboardEngine:
+    """Scoreboards computed in memory from a sparse word-by-article count matrix"""
+    
+    def __init__(self, articles: pd.DataFrame, article_words: pd.DataFrame):
+        """Build the engine from articles (id, source, headline, url, published_date) and
+        article_words (article_id, word, frequency) data frames
+        """
+        articles = articles.sort_values('id', kind='stable').drop_duplicates('id')
+        self.article_ids = articles['id'].to_numpy(dtype=np.int64)
+        self.headlines = articles['headline'].astype(object).to_numpy()
+        self.urls = articles['url'].astype(object).to_numpy()
+        self.published_us = pd.to_datetime(articles['published_date'], utc=True).astype('int64').to_numpy() // 1000
+        
+        source_codes, self.sources = pd.factorize(articles['source'].astype(object).to_numpy())
+        self.article_source = source_codes.astype(np.int64)
+        self.source_index = {source: code for code, source in enumerate(self.sources)}
+        
+        # Keep only the words of loaded articles, as rows of (article, word, frequency)
+        positions = pd.Index(self.article_ids).get_indexer(article_words['article_id'])
+        known = positions >= 0
+        word_codes, self.words = pd.factorize(article_words['word'].astype(object).to_numpy()[known])
+        self.word_index = {word: code for code, word in enumerate(self.words)}
+        self.word_order = np.argsort(np.argsort(self.words))  # alphabetical position, for tie-breaks
+        
+        # Merge repeated (article, word) rows so each matrix cell is stored once
+        cells, inverse = np.unique(positions[known] * len(self.words) + word_codes, return_inverse=True)
+        self.row_article = cells // max(len(self.words), 1)
+        self.row_word = cells % max(len(self.words), 1)
+        self.row_frequency = np.bincount(
+            inverse, weights=article_words['frequency'].to_numpy()[known], minlength=len(cells)
+        ).astype(np.int64)
+    
+    @classmethod
+    def from_snapshot(cls, directory: str = None, start_day: date = None, end_day: date = None):
+        """Load the engine from a Parquet snapshot written by snapshot_data.py"""
+        from snapshot_data import read_snapshot
+        articles = read_snapshot('articles', directory, start_day, end_day)
+        article_words = read_snapshot('article_words', directory, start_day, end_day)
+        return cls(articles, article_words)
+    
+    @classmethod
+    def from_database(cls, start_date: datetime, end_date: datetime, batch_size: int = 5000):
+        """Load the engine with the articles of a date range streamed from the database"""
+        article_rows, word_rows = [], []
+        with DatabaseManager() as db_manager:
+            for articles in db_manager.iter_articles_by_date_range(
+                start_date, end_date,
+                columns=['id', 'source', 'headline', 'url', 'published_date'],
+                with_words=True,
+                batch_size=batch_size
+            ):
+                for article in articles:
+                    words = article.pop('words')
+                    article_rows.append(article)
+                    word_rows.extend((article['id'], word, frequency) for word, frequency in words.items())
+        
+        return cls(
+            pd.DataFrame(article_rows, columns=['id', 'source', 'headline', 'url', 'published_date']),
+            pd.DataFrame(word_rows, columns=['article_id', 'word', 'frequency'])
+        )
+    
+    def filter_articles(self, start_date: datetime, end_date: datetime, sources: List[str] = None,
+                        search_term: str = None) -> np.ndarray:
+        """Get a mask of the articles matching filter_articles_by_criteria"""
+        mask = (self.published_us >= _epoch_microseconds(start_date)) & \
+            (self.published_us < _epoch_microseconds(end_date))
+        
+        if sources is not None:
+            codes = [self.source_index[source] for source in sources if source in self.source_index]
+            mask &= np.isin(self.article_source, codes)
+        
+        if search_term is not None:
+            term = self.word_index.get(normalize_search_term(search_term))
+            with_term = np.zeros(len(self.article_ids), dtype=bool)
+            if term is not None:
+                with_term[self.row_article[self.row_word == term]] = True
+            mask &= with_term
+        
+        return mask
+    
+    def word_frequencies(self, article_mask: np.ndarray) -> np.ndarray:
+        """Total frequency of every word over the selected articles (rank_word_frequencies)"""
+        rows = article_mask[self.row_article]
+        return np.bincount(
+            self.row_word[rows], weights=self.row_frequency[rows], minlength=len(self.words)
+        ).astype(np.int64)
+    
+    def word_percentages(self, article_mask: np.ndarray) -> np.ndarray:
+        """Average percentage of each source's selected articles mentioning every word (rank_word_percentages)
+        
+        Like the SQL, a word's average only covers the sources where it appears. Words
+        that appear nowhere are NaN.
+        """
+        source_count = len(self.sources)
+        rows = article_mask[self.row_article]
+        counts = np.bincount(
+            self.row_word[rows] * source_count + self.article_source[self.row_article[rows]],
+            minlength=len(self.words) * source_count
+        ).reshape(len(self.words), source_count)
+        totals = np.bincount(self.article_source[article_mask], minlength=source_count)
+        
+        present = counts > 0
+        percents = np.divide(counts * 100.0, totals, out=np.zeros(counts.shape), where=present)
+        sources_present = present.sum(axis=1)
+        return np.divide(
+            percents.sum(axis=1), sources_present,
+            out=np.full(len(self.words), np.nan), where=sources_present > 0
+        )
+    
+    def word_articles(self, article_mask: np.ndarray, word_codes: List[int]) -> Dict[int, List[Dict]]:
+        """Get the selected articles mentioning each of the given words (word_articles), keyed by word code"""
+        rows = np.flatnonzero(article_mask[self.row_article] & np.isin(self.row_word, word_codes))
+        articles = self.row_article[rows]
+        published = np.char.add(
+            np.datetime_as_string(self.published_us[articles].astype('datetime64[us]'), unit='us'), '+00:00'
+        )
+        
+        word_articles = {code: [] for code in word_codes}
+        for code, article_id, url, source, headline, published_date in zip(
+            self.row_word[rows].tolist(),
+            self.article_ids[articles].tolist(),
+            self.urls[articles].tolist(),
+            self.sources[self.article_source[articles]].tolist(),
+            self.headlines[articles].tolist(),
+            published.tolist()
+        ):
+            word_articles[code].append({
+                'id': article_id,
+                'url': url,
+                'source': source,
+                'headline': headline,
+                'published_date': published_date,
+            })
+        return word_articles
+    
+    def top_words(self, start_date: datetime, end_date: datetime, sources: List[str] = None,
+                  search_term: str = None, size: int = 10) -> List[Dict]:
+        """Compute a top words or associated words scoreboard"""
+        mask = self.filter_articles(start_date, end_date, sources, search_term)
+        frequencies = self.word_frequencies(mask)
+        
+        present = np.flatnonzero(frequencies > 0)
+        ranks = competition_rank(frequencies[present])
+        
+        # The search term itself is ranked but never listed
+        term = self.word_index.get(normalize_search_term(search_term)) if search_term is not None else None
+        listed = present != term if term is not None else np.ones(len(present), dtype=bool)
+        listed = np.flatnonzero(listed)
+        order = listed[np.lexsort((self.word_order[present[listed]], -frequencies[present[listed]]))][:size]
+        
+        articles = self.word_articles(mask, [present[i] for i in order])
+        return [
+            {
+                'word': self.words[present[i]],
+                'frequency': int(frequencies[present[i]]),
+                'rank': int(ranks[i]),
+                'articles': articles[present[i]],
+            }
+            for i in order
+        ]
+    
+    def compare_words(self, start_date: datetime, end_date: datetime, sources_group_a: List[str],
+                      sources_group_b: List[str], search_term: str = None, size: int = 10) -> List[Dict]:
+        """Compute a comparative scoreboard of the words most favoured by each group (compare_word_rankings)"""
+        mask_a = self.filter_articles(start_date, end_date, sources_group_a, search_term)
+        mask_b = self.filter_articles(start_date, end_date, sources_group_b, search_term)
+        percent_a = np.nan_to_num(self.word_percentages(mask_a))
+        percent_b = np.nan_to_num(self.word_percentages(mask_b))
+        difference = percent_b - percent_a
+        
+        leaders = []
+        for group_name, sign in [('Group A', -1), ('Group B', 1)]:
+            candidates = np.flatnonzero(difference * sign > 0)
+            ranks = competition_rank(difference[candidates] * sign)
+            order = np.lexsort((self.word_order[candidates], ranks))[:size]
+            leaders.extend((group_name, candidates[i], int(ranks[i])) for i in order)
+        
+        word_codes = list(dict.fromkeys(code for _, code, _ in leaders))
+        articles_a = self.word_articles(mask_a, word_codes)
+        articles_b = self.word_articles(mask_b, word_codes)
+        return [
+            {
+                'group_name': group_name,
+                'word': self.words[code],
+                'avg_percent_group_a': float(percent_a[code]),
+                'avg_percent_group_b': float(percent_b[code]),
+                'leaderboard_rank': rank,
+                'articles_group_a': articles_a[code],
+                'articles_group_b': articles_b[code],
+            }
+            for group_name, code, rank in leaders
+        ]
+    
+    def compute_scoreboard(self, function_name: str, start_date: datetime, end_date: datetime,
+                           sources: List[str] = None, sources_group_b: List[str] = None,
+                           search_term: str = None, size: int = 10) -> List[Dict]:
+        """Compute a scoreboard the way the compute_scoreboard SQL function does"""
+        if function_name in TOP_WORDS_SCOREBOARDS:
+            return self.top_words(start_date, end_date, sources, search_term, size)
+        if function_name in COMPARATIVE_SCOREBOARDS:
+            return self.compare_words(start_date, end_date, sources, sources_group_b, search_term, size)
+        raise ValueError(f"Unknown scoreboard function: {function_name}")
+
+def fetch_sql_scoreboard(function_name: str, start_date: datetime, end_date: datetime,
+                         sources: List[str] = None, sources_group_b: List[str] = None,
+                         search_term: str = None, size: int = 10) -> List[Dict]:
+    """Compute a scoreboard with the compute_scoreboard SQL function (Postgres only)"""
+    from sqlalchemy import text
+    with DatabaseManager() as db_manager:
+        return db_manager.session.execute(
+            text("select compute_scoreboard(:function_name, :start_date, :end_date, :sources, "
+                 ":sources_group_b, :search_term, :size)"),
+            {
+                'function_name': function_name,
+                'start_date': as_utc(start_date),
+                'end_date': as_utc(end_date),
+                'sources': sources,
+                'sources_group_b': sources_group_b,
+                'search_term': search_term,
+                'size': size,
+            }
+        ).scalar()
+
+def compare_scoreboards(engine_rows: List[Dict], sql_rows: List[Dict], tolerance: float = 1e-9) -> List[str]:
+    """List the differences between an engine scoreboard and the SQL one
+    
+    Words tied at the cut-off may be picked differently, so for every group only the
+    scores and the words scoring above the last listed score must match. Article
+    lists are compared by ID for the words both sides listed.
+    """
+    score_keys = ['frequency', 'avg_percent_group_b', 'avg_percent_group_a']
+    differences = []
+    
+    def groups(rows):
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row.get('group_name'), []).append(row)
+        return grouped
+    
+    def score(row):
+        if 'frequency' in row:
+            return float(row['frequency'])
+        return float(row['avg_percent_group_b']) - float(row['avg_percent_group_a'])
+    
+    engine_groups, sql_groups = groups(engine_rows), groups(sql_rows)
+    for group_name in sorted(set(engine_groups) | set(sql_groups), key=str):
+        engine_group, sql_group = engine_groups.get(group_name, []), sql_groups.get(group_name, [])
+        engine_scores = sorted((score(row) for row in engine_group), key=abs, reverse=True)
+        sql_scores = sorted((score(row) for row in sql_group), key=abs, reverse=True)
+        if len(engine_scores) != len(sql_scores) or \
+                any(abs(a - b) > tolerance for a, b in zip(engine_scores, sql_scores)):
+            differences.append(f"{group_name or 'Scoreboard'}: scores {engine_scores} != {sql_scores}")
+            continue
+        
+        cut_off = abs(sql_scores[-1]) if sql_scores else 0
+        above = lambda rows: {row['word'] for row in rows if abs(score(row)) > cut_off + tolerance}
+        if above(engine_group) != above(sql_group):
+            differences.append(f"{group_name or 'Scoreboard'}: words {sorted(above(engine_group))} != "
+                               f"{sorted(above(sql_group))}")
+        
+        sql_by_word = {row['word']: row for row in sql_group}
+        for row in engine_group:
+            sql_row = sql_by_word.get(row['word'])
+            if sql_row is None:
+                continue
+            for key in [key for key in row if key.startswith('articles')]:
+                if {a['id'] for a in row[key]} != {a['id'] for a in sql_row[key]}:
+                    differences.append(f"{group_name or 'Scoreboard'}: {key} of '{row['word']}' differ")
+    
+    return differences
+
+def main():
+    """Parse arguments, compute a scoreboard in memory and optionally check it against the SQL"""
+    parser = argparse.ArgumentParser(description="Compute a scoreboard in memory")
+    parser.add_argument('function_name', choices=TOP_WORDS_SCOREBOARDS + COMPARATIVE_SCOREBOARDS)
+    parser.add_argument('--start', type=lambda value: as_utc(datetime.fromisoformat(value)), required=True,
+                        help="start of the published date range (ISO date or datetime)")
+    parser.add_argument('--end', type=lambda value: as_utc(datetime.fromisoformat(value)), required=True,
+                        help="end of the published date range, exclusive (ISO date or datetime)")
+    parser.add_argument('--sources', type=lambda value: value.split(','),
+                        help="comma-separated sources (group A for comparative scoreboards)")
+    parser.add_argument('--sources-group-b', type=lambda value: value.split(','),
+                        help="comma-separated group B sources for comparative scoreboards")
+    parser.add_argument('--search-term', help="search term for associated scoreboards")
+    parser.add_argument('--size', type=int, default=10, help="words per scoreboard (per group when comparing)")
+    parser.add_argument('--snapshot', help="load data from this Parquet snapshot instead of the database")
+    parser.add_argument('--compare-sql', action='store_true',
+                        help="check the result against compute_scoreboard in the database")
+    args = parser.parse_args()
+    
+    if args.snapshot:
+        engine = ScoreboardEngine.from_snapshot(args.snapshot, args.start.date(), args.end.date() + timedelta(days=1))
+    else:
+        engine = ScoreboardEngine.from_database(args.start, args.end)
+    logger.info(f"Loaded {len(engine.article_ids)} articles and {len(engine.row_word)} article words")
+    
+    scoreboard_args = (args.function_name, args.start, args.end, args.sources, args.sources_group_b,
+                       args.search_term, args.size)
+    scoreboard = engine.compute_scoreboard(*scoreboard_args)
+    
+    if not args.compare_sql:
+        print(json.dumps(scoreboard, indent=2))
+        return
+    
+    differences = compare_scoreboards(scoreboard, fetch_sql_scoreboard(*scoreboard_args))
+    for difference in differences:
+        logger.error(difference)
+    logger.info("Scoreboard matches the SQL" if not differences else f"{len(differences)} differences from the SQL")
+    if differences:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
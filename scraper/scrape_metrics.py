@@ -0,0 +1,171 @@
+"""
+Per-stage timings of source scrapes and the metrics file written after each run
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from config import METRICS_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Stages of a source scrape, in the order they run
+SCRAPE_STAGES = ['fetch', 'parse', 'tokenize', 'write']
+
+class SourceTimings:
+    """Time spent in each stage of one source's scrape, with fetch and row counts
+    
+    With a ScrapeProfiler, each stage is also profiled under the given source.
+    """
+    
+    def __init__(self, source: str = None, profiler=None):
+        self.source = source
+        self.profiler = profiler
+        self.seconds = dict.fromkeys(SCRAPE_STAGES, 0.0)
+        self.fetch_bytes = 0
+        self.fetch_latencies = []
+        self.articles_inserted = 0
+        self.articles_skipped = 0
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Add the time spent in the block to a stage"""
+        profile = self.profiler.profile(self.source, name) if self.profiler else nullcontext()
+        start = time.perf_counter()
+        try:
+            with profile:
+                yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+    
+    def record_fetch(self, latency: float, size: int):
+        """Record a response's time to first byte and body size"""
+        self.fetch_latencies.append(latency)
+        self.fetch_bytes += size
+    
+    def as_dict(self) -> Dict:
+        """Get the timings as a JSON-friendly dict"""
+        return {
+            'seconds': dict(self.seconds),
+            'fetch_bytes': self.fetch_bytes,
+            'fetch_latencies': list(self.fetch_latencies),
+            'articles_inserted': self.articles_inserted,
+            'articles_skipped': self.articles_skipped,
+        }
+
+class RunMetrics:
+    """Timings of every source scraped in a run, written to a Prometheus text or JSON file"""
+    
+    def __init__(self, latency_buckets: List[float] = None):
+        self.latency_buckets = sorted(latency_buckets or METRICS_CONFIG['latency_buckets'])
+        self.started_at = datetime.now(timezone.utc)
+        self.sources = {}
+        self._lock = threading.Lock()
+    
+    def add(self, source: str, status: str, duration: float, timings: SourceTimings):
+        """Record a finished source scrape"""
+        with self._lock:
+            self.sources[source] = dict(timings.as_dict(), status=status, duration_seconds=duration)
+    
+    def latency_histogram(self, latencies: List[float]) -> List[int]:
+        """Get cumulative counts of latencies at or below each bucket bound"""
+        counts = [0] * len(self.latency_buckets)
+        for latency in latencies:
+            index = bisect_left(self.latency_buckets, latency)
+            if index < len(counts):
+                counts[index] += 1
+        for index in range(1, len(counts)):
+            counts[index] += counts[index - 1]
+        return counts
+    
+    def to_json(self) -> Dict:
+        """Get the run's metrics as a JSON-friendly dict"""
+        with self._lock:
+            sources = dict(self.sources)
+        return {
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now(timezone.utc).isoformat(),
+            'latency_buckets': self.latency_buckets,
+            'sources': {
+                source: dict(metrics, fetch_latency_histogram=self.latency_histogram(metrics['fetch_latencies']))
+                for source, metrics in sources.items()
+            },
+        }
+    
+    def to_prometheus(self) -> str:
+        """Get the run's metrics in the Prometheus text exposition format"""
+        with self._lock:
+            sources = dict(self.sources)
+        
+        lines = []
+        
+        def header(name: str, kind: str, description: str):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+        
+        def sample(name: str, labels: Dict, value):
+            label_text = ','.join(f'{key}="{label}"' for key, label in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        
+        header('newswordy_scrape_last_run_timestamp_seconds', 'gauge', "Start of the last scrape run")
+        sample('newswordy_scrape_last_run_timestamp_seconds', {}, self.started_at.timestamp())
+        
+        # One gauge per source (and stage) for each value of the source's last scrape
+        gauges = [
+            ('newswordy_scrape_success', "Whether the source's last scrape succeeded",
+             lambda metrics: int(metrics['status'] in ('success', 'unchanged'))),
+            ('newswordy_scrape_duration_seconds', "Duration of the source's last scrape",
+             lambda metrics: metrics['duration_seconds']),
+            ('newswordy_fetch_bytes', "Response bytes fetched in the source's last scrape",
+             lambda metrics: metrics['fetch_bytes']),
+            ('newswordy_articles_inserted', "Articles saved in the source's last scrape",
+             lambda metrics: metrics['articles_inserted']),
+            ('newswordy_articles_skipped', "Already stored articles skipped in the source's last scrape",
+             lambda metrics: metrics['articles_skipped']),
+        ]
+        for name, description, value in gauges:
+            header(name, 'gauge', description)
+            for source, metrics in sources.items():
+                sample(name, {'source': source}, value(metrics))
+        
+        header('newswordy_scrape_stage_seconds', 'gauge', "Time spent in each stage of the source's last scrape")
+        for source, metrics in sources.items():
+            for stage in SCRAPE_STAGES:
+                sample('newswordy_scrape_stage_seconds', {'source': source, 'stage': stage}, metrics['seconds'][stage])
+        
+        header('newswordy_fetch_latency_seconds', 'histogram', "Time to the first response byte of the source's requests")
+        for source, metrics in sources.items():
+            latencies = metrics['fetch_latencies']
+            for bound, count in zip(self.latency_buckets, self.latency_histogram(latencies)):
+                sample('newswordy_fetch_latency_seconds_bucket', {'source': source, 'le': bound}, count)
+            sample('newswordy_fetch_latency_seconds_bucket', {'source': source, 'le': '+Inf'}, len(latencies))
+            sample('newswordy_fetch_latency_seconds_sum', {'source': source}, sum(latencies))
+            sample('newswordy_fetch_latency_seconds_count', {'source': source}, len(latencies))
+        
+        return '\n'.join(lines) + '\n'
+    
+    def write(self, path: str = None):
+        """Atomically write the metrics file, as JSON if the path ends in .json and Prometheus text otherwise"""
+        path = path if path is not None else METRICS_CONFIG['file']
+        if not path:
+            return
+        
+        try:
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                if path.endswith('.json'):
+                    json.dump(self.to_json(), f, indent=2)
+                else:
+                    f.write(self.to_prometheus())
+            os.replace(temp_path, path)
+            logger.info(f"Wrote scrape metrics to {path}")
+        except OSError as e:
+            logger.error(f"Failed to write scrape metrics {path}: {e}")
@@ -0,0 +1,139 @@
+"""
+Pipelined scraping of all sources
+
+Sources are fetched and parsed by a pool of workers (parsing consumes a feed's chunks
+as they download, so the two stay together), then tokenized by one worker and written
+by another, with bounded queues between the stages. One source's write overlaps the
+fetches of the next ones, a full queue blocks the stage feeding it so only a few
+sources' articles are in flight at a time, and every write and log goes through a
+single database session, so scrape workers never contend for the database.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from config import SCRAPING_CONFIG
+from database import DatabaseManager
+from scrape_metrics import SourceTimings
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class ScrapePipeline:
+    """Runs a scraper's sources through fetch, tokenize and write stages connected by bounded queues"""
+    
+    def __init__(self, scraper, fetch_workers: int = None, queue_size: int = None):
+        self.scraper = scraper
+        self.fetch_workers = fetch_workers or SCRAPING_CONFIG['max_workers']
+        queue_size = queue_size or SCRAPING_CONFIG['pipeline_queue_size']
+        self.tokenize_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.results = {}
+    
+    def run(self, sources: List[tuple]) -> Dict[str, int]:
+        """Scrape the sources, returning the number of new articles found per source"""
+        logger.info(f"Scraping {len(sources)} sources in a pipeline with {self.fetch_workers} fetch workers")
+        
+        stages = [
+            threading.Thread(target=self._tokenize_stage, name='scraper-tokenize'),
+            threading.Thread(target=self._write_stage, name='scraper-write'),
+        ]
+        for stage in stages:
+            stage.start()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='scraper-fetch') as executor:
+                for source_key, source_config in sources:
+                    executor.submit(self._fetch_stage, source_key, source_config)
+        finally:
+            # The end marker follows the last source through every stage
+            self.tokenize_queue.put(None)
+            for stage in stages:
+                stage.join()
+        
+        return self.results
+    
+    def _fetch_stage(self, source_key: str, source_config: Dict):
+        """Fetch and parse a source's articles and queue them for tokenizing"""
+        logger.info(f"Scraping source: {source_config['name']}")
+        work = {
+            'source_key': source_key,
+            'source_config': source_config,
+            'start_time': datetime.now(timezone.utc),
+            'timings': SourceTimings(source_key, self.scraper.profiler),
+            'status': None,
+            'articles': [],
+            'batch': [],
+            'error': None,
+        }
+        
+        try:
+            work['status'], work['articles'] = self.scraper._collect_articles(source_config, work['timings'])
+        except Exception as e:
+            work['error'] = e
+        
+        # Blocks while the tokenizer is behind
+        self.tokenize_queue.put(work)
+    
+    def _tokenize_stage(self):
+        """Analyze each queued source's new articles and queue the batch for writing"""
+        while True:
+            work = self.tokenize_queue.get()
+            if work is None:
+                self.write_queue.put(None)
+                return
+            
+            if work['status'] is None and work['error'] is None:
+                try:
+                    work['articles'], work['batch'] = self.scraper._prepare_batch(work['articles'], work['timings'])
+                except Exception as e:
+                    work['error'] = e
+            
+            self.results[work['source_key']] = len(work['articles']) if work['status'] is None else 0
+            work['articles'] = None
+            self.write_queue.put(work)
+    
+    def _write_stage(self):
+        """Save each queued batch and log its source's scrape, all through one database session"""
+        try:
+            with DatabaseManager() as db_manager:
+                while True:
+                    work = self.write_queue.get()
+                    if work is None:
+                        return
+                    self._write(db_manager, work)
+        except Exception as e:
+            logger.error(f"Pipeline write stage failed: {e}")
+            
+            # Keep draining, so the earlier stages never block on a full queue
+            while self.write_queue.get() is not None:
+                pass
+    
+    def _write(self, db_manager: DatabaseManager, work: Dict):
+        """Save a source's batch and log its scrape, or log why it failed"""
+        source_key = work['source_key']
+        arguments = (db_manager, source_key, work['source_config'])
+        if work['error'] is None:
+            try:
+                saved_count = 0 if work['status'] is not None else self.scraper._save_batch(
+                    *arguments, work['timings'], work['batch'])
+            except Exception as e:
+                logger.error(f"Failed to save articles of {source_key}: {e!r}")
+                work['error'] = e
+            else:
+                try:
+                    self.scraper._log_saved_source(*arguments, work['status'], work['start_time'], work['timings'],
+                                                   saved_count)
+                except Exception as e:
+                    logger.error(f"Failed to log scrape of {source_key}: {e!r}")
+                return
+        
+        self.results[source_key] = 0
+        try:
+            self.scraper._source_failed(*arguments, work['start_time'], work['timings'], work['error'])
+        except Exception as e:
+            logger.error(f"Failed to log failed scrape of {source_key}: {e!r}")
@@ -0,0 +1,161 @@
+"""
+Profiling of scrape runs, per source and per stage
+
+Up to Python 3.11 cProfile only sees the thread that enabled it, so each stage of
+each source's scrape gets its own profile, enabled in the worker thread running it,
+and the profiles are merged per source, per stage and for the whole run. From 3.12 a
+profile sees every thread but only one can be active at a time, so the whole run is
+profiled at once instead, and the per-stage times come from the scrape metrics.
+Profiles are written to a directory and summarized as the top hotspots. tracemalloc
+can also be enabled to record peak memory and the largest allocation sites.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from config import PROFILE_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Profilers built on sys.monitoring (Python 3.12+) see every thread, and only one may be active
+RUN_WIDE_PROFILING = hasattr(sys, 'monitoring')
+
+class ScrapeProfiler:
+    """Collects cProfile profiles per source and stage, and optionally tracemalloc memory usage"""
+    
+    def __init__(self, directory: str = None, top_n: int = None, trace_memory: bool = False):
+        self.directory = directory or PROFILE_CONFIG['directory']
+        self.top_n = top_n or PROFILE_CONFIG['top_n']
+        self.trace_memory = trace_memory
+        self.profiles = defaultdict(list)
+        self.output_directory = None
+        self.run_profile = None
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.save()
+    
+    def start(self):
+        """Start the run's profile where profiles see every thread, and trace memory allocations if enabled"""
+        if RUN_WIDE_PROFILING:
+            self.run_profile = self._enable()
+        if self.trace_memory:
+            tracemalloc.start(PROFILE_CONFIG['traceback_frames'])
+    
+    def _enable(self) -> Optional[cProfile.Profile]:
+        """Start a new profile, or return None if another profiler is already active"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            logger.warning(f"Not profiling: {e}")
+            return None
+        return profile
+    
+    @contextmanager
+    def profile(self, source: str, stage: str):
+        """Profile the block as part of a source's stage, unless the whole run is being profiled"""
+        profile = None if RUN_WIDE_PROFILING else self._enable()
+        if profile is None:
+            yield
+            return
+        
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self.profiles[(source, stage)].append(profile)
+    
+    def _stats(self, profiles: List[cProfile.Profile]) -> pstats.Stats:
+        """Merge profiles into one set of statistics"""
+        stats = pstats.Stats(*profiles)
+        stats.sort_stats('cumulative')
+        return stats
+    
+    def _grouped(self) -> Dict[str, List[cProfile.Profile]]:
+        """Get the profiles grouped per source, per stage and for the whole run"""
+        with self._lock:
+            profiles = {key: list(value) for key, value in self.profiles.items()}
+        
+        groups = defaultdict(list)
+        for (source, stage), stage_profiles in profiles.items():
+            groups[f"source-{source}"].extend(stage_profiles)
+            groups[f"stage-{stage}"].extend(stage_profiles)
+            groups['run'].extend(stage_profiles)
+        if self.run_profile is not None:
+            groups['run'].append(self.run_profile)
+        return groups
+    
+    def _hotspots(self, stats: pstats.Stats) -> str:
+        """Format the top functions of a set of statistics by cumulative time"""
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.print_stats(self.top_n)
+        return stream.getvalue()
+    
+    def _memory_summary(self, snapshot: tracemalloc.Snapshot) -> str:
+        """Format the peak traced memory and the largest allocation sites"""
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Traced memory: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB",
+                 f"Top {self.top_n} allocation sites:"]
+        for statistic in snapshot.statistics('lineno')[:self.top_n]:
+            lines.append(f"  {statistic}")
+        return '\n'.join(lines)
+    
+    def save(self) -> str:
+        """Write the merged profiles and the summary, returning the directory they were written to"""
+        if self.run_profile is not None:
+            self.run_profile.disable()
+        
+        self.output_directory = os.path.join(self.directory, datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ'))
+        os.makedirs(self.output_directory, exist_ok=True)
+        
+        # Snapshot memory first, so merging the profiles does not show up in it
+        memory_summary = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            snapshot.dump(os.path.join(self.output_directory, 'memory.snapshot'))
+            memory_summary = self._memory_summary(snapshot)
+            tracemalloc.stop()
+        
+        sections = []
+        groups = {name: self._stats(profiles) for name, profiles in self._grouped().items()}
+        if groups:
+            for name, stats in groups.items():
+                stats.dump_stats(os.path.join(self.output_directory, f"{name}.prof"))
+            
+            stage_times = [
+                f"  {name:<32} {stats.total_tt:8.3f} s"
+                for name, stats in sorted(groups.items()) if name != 'run'
+            ]
+            if stage_times:
+                sections.append("Profiled time by source and stage:\n" + '\n'.join(stage_times))
+            sections.append(f"Top {self.top_n} functions by cumulative time:\n" + self._hotspots(groups['run']))
+        else:
+            sections.append("No source scrapes were profiled")
+        if memory_summary:
+            sections.append(memory_summary)
+        
+        summary = '\n\n'.join(sections)
+        with open(os.path.join(self.output_directory, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(summary + '\n')
+        
+        print(summary)
+        logger.info(f"Wrote profile of the run to {self.output_directory}")
+        return self.output_directory
@@ -0,0 +1,248 @@
+"""
+Snapshot command for writing articles and article_words to partitioned Parquet files
+
+Each UTC day is written under day=YYYY-MM-DD/source=<source>/ directories of the
+snapshot, with categorical source and word columns and compact integer dtypes.
+Articles without a published date go in the day they were scraped. The manifest
+records how far articles have been snapshotted by scraped date, so later runs
+only rewrite the days that gained articles since, including earlier days whose
+articles arrived late.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List
+
+import pandas as pd
+
+from config import SNAPSHOT_CONFIG
+from database import DatabaseManager, utc_day
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TABLES = ['articles', 'article_words']
+ARTICLE_COLUMNS = ['id', 'source', 'headline', 'url', 'published_date', 'scraped_date']
+MANIFEST_FILE = '_manifest.json'
+
+
+def load_manifest(directory: str) -> Dict:
+    """Load the record of snapshotted days, or start an empty one"""
+    path = os.path.join(directory, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'days': {}}
+
+def save_manifest(directory: str, manifest: Dict):
+    """Atomically write the record of snapshotted days"""
+    manifest['updated_at'] = datetime.now(timezone.utc).isoformat()
+    path = os.path.join(directory, MANIFEST_FILE)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+def build_frames(articles: List[Dict], with_content: bool = False):
+    """Build compact articles and article_words data frames from exported article rows"""
+    article_columns = ARTICLE_COLUMNS + ['content'] if with_content else ARTICLE_COLUMNS
+    articles_frame = pd.DataFrame(
+        [[article[name] for name in article_columns] for article in articles],
+        columns=article_columns
+    )
+    articles_frame = articles_frame.astype({
+        'id': 'int32',
+        'source': 'category',
+        'headline': 'string',
+        'url': 'string',
+        **({'content': 'string'} if with_content else {}),
+    })
+    for name in ['published_date', 'scraped_date']:
+        articles_frame[name] = pd.to_datetime(articles_frame[name], utc=True)
+    
+    word_rows = [
+        (article['id'], article['source'], word, frequency)
+        for article in articles
+        for word, frequency in article['words'].items()
+    ]
+    words_frame = pd.DataFrame(word_rows, columns=['article_id', 'source', 'word', 'frequency']).astype({
+        'article_id': 'int32',
+        'source': 'category',
+        'word': 'category',
+        'frequency': 'int16',
+    })
+    
+    return {'articles': articles_frame, 'article_words': words_frame}
+
+def write_day(directory: str, day: date, frames: Dict[str, pd.DataFrame]):
+    """Write one day of every table, partitioned by source
+    
+    Each table's day is written to a hidden directory first and then renamed into
+    place, so readers never see a partially written day.
+    """
+    for table in SNAPSHOT_TABLES:
+        day_path = os.path.join(directory, table, f"day={day.isoformat()}")
+        temp_path = os.path.join(directory, table, f".day={day.isoformat()}.tmp")
+        shutil.rmtree(temp_path, ignore_errors=True)
+        
+        frame = frames[table]
+        for source, partition in frame.groupby('source', observed=True):
+            source_path = os.path.join(temp_path, f"source={source}")
+            os.makedirs(source_path, exist_ok=True)
+            partition.drop(columns='source').to_parquet(
+                os.path.join(source_path, 'part-0.parquet'), index=False
+            )
+        
+        shutil.rmtree(day_path, ignore_errors=True)
+        if os.path.exists(temp_path):
+            os.replace(temp_path, day_path)
+
+def day_runs(days: List[date]) -> List[tuple]:
+    """Group sorted days into (first day, day after the last) runs of consecutive days"""
+    runs = []
+    for day in days:
+        if runs and runs[-1][1] == day:
+            runs[-1] = (runs[-1][0], day + timedelta(days=1))
+        else:
+            runs.append((day, day + timedelta(days=1)))
+    return runs
+
+def run_snapshot(directory: str = None, start_day: date = None, end_day: date = None,
+                 rebuild: bool = False, with_content: bool = False, batch_size: int = None) -> int:
+    """Snapshot every complete UTC day with articles scraped since the last snapshot, returning the number of days written
+    
+    end_day is exclusive and defaults to today (UTC), so the day still being scraped
+    is left for a later run. With start_day every day from start_day is written again.
+    """
+    directory = directory or SNAPSHOT_CONFIG['directory']
+    batch_size = batch_size or SNAPSHOT_CONFIG['batch_size']
+    
+    if rebuild:
+        shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+    
+    manifest = load_manifest(directory)
+    started_at = datetime.now(timezone.utc)
+    end_day = end_day or started_at.date()
+    days_written = 0
+    
+    def flush(day, articles):
+        nonlocal days_written
+        if day is None:
+            return
+        
+        frames = build_frames(articles, with_content)
+        write_day(directory, day, frames)
+        manifest['days'][day.isoformat()] = {
+            'articles': len(frames['articles']),
+            'article_words': len(frames['article_words']),
+        }
+        save_manifest(directory, manifest)
+        days_written += 1
+        logger.info(f"Snapshotted {day}: {len(frames['articles'])} articles, "
+                    f"{len(frames['article_words'])} article words")
+    
+    columns = ARTICLE_COLUMNS + ['content'] if with_content else ARTICLE_COLUMNS
+    
+    with DatabaseManager() as db_manager:
+        if start_day is not None:
+            runs = [(start_day, end_day)] if start_day < end_day else []
+        else:
+            # Days gaining articles scraped since the last run, or dated on or after the day it
+            # stopped before; a manifest without these watermarks is written again in full
+            scraped_through, days_through = manifest.get('scraped_through'), manifest.get('days_through')
+            days = db_manager.get_article_days(
+                datetime.fromisoformat(scraped_through) if scraped_through else None,
+                datetime.combine(date.fromisoformat(days_through), time.min, tzinfo=timezone.utc) if days_through else None
+            )
+            runs = day_runs(sorted(day for day in days if day < end_day))
+        
+        if not runs:
+            logger.info(f"Snapshot in {directory} is up to date")
+        
+        for run_start, run_end in runs:
+            logger.info(f"Snapshotting days {run_start} to {run_end - timedelta(days=1)} into {directory}")
+            current_day, day_articles = None, []
+            batches = db_manager.iter_articles_by_date_range(
+                datetime.combine(run_start, time.min, tzinfo=timezone.utc),
+                datetime.combine(run_end, time.min, tzinfo=timezone.utc),
+                columns=columns,
+                with_words=True,
+                undated=True,
+                batch_size=batch_size
+            )
+            
+            # Articles arrive in published (else scraped) order, so each day is complete once the next one starts
+            for articles in batches:
+                for article in articles:
+                    day = utc_day(article['published_date'] or article['scraped_date'])
+                    if day >= run_end:
+                        continue
+                    if day != current_day:
+                        flush(current_day, day_articles)
+                        current_day, day_articles = day, []
+                    day_articles.append(article)
+            
+            flush(current_day, day_articles)
+    
+    # Articles committed by scrapes still running when this one started, or dated from end_day
+    # on, are picked up by the next run
+    if start_day is None:
+        overlap = timedelta(minutes=SNAPSHOT_CONFIG['overlap_minutes'])
+        manifest['scraped_through'] = (started_at - overlap).isoformat()
+        manifest['days_through'] = max(end_day.isoformat(), manifest.get('days_through', ''))
+        save_manifest(directory, manifest)
+    
+    logger.info(f"Snapshot completed: {days_written} days written to {directory}")
+    return days_written
+
+def read_snapshot(table: str, directory: str = None, start_day: date = None, end_day: date = None,
+                  sources: List[str] = None) -> pd.DataFrame:
+    """Read a snapshotted table, optionally limited to a range of days (end exclusive) and sources"""
+    if table not in SNAPSHOT_TABLES:
+        raise ValueError(f"Unknown snapshot table: {table}")
+    
+    filters = []
+    if start_day:
+        filters.append(('day', '>=', start_day.isoformat()))
+    if end_day:
+        filters.append(('day', '<', end_day.isoformat()))
+    if sources:
+        filters.append(('source', 'in', list(sources)))
+    
+    path = os.path.join(directory or SNAPSHOT_CONFIG['directory'], table)
+    return pd.read_parquet(path, filters=filters or None)
+
+def main():
+    """Parse arguments and run the snapshot"""
+    parser = argparse.ArgumentParser(description="Snapshot articles and article_words to partitioned Parquet files")
+    parser.add_argument('--directory', default=SNAPSHOT_CONFIG['directory'],
+                        help="directory the snapshot is written to")
+    parser.add_argument('--since', type=date.fromisoformat,
+                        help="first UTC day to snapshot again (default: the days with articles scraped since the last snapshot)")
+    parser.add_argument('--until', type=date.fromisoformat,
+                        help="UTC day to stop before (default: today)")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="delete the existing snapshot and write every day again")
+    parser.add_argument('--with-content', action='store_true',
+                        help="include article content in the articles table")
+    parser.add_argument('--batch-size', type=int, default=SNAPSHOT_CONFIG['batch_size'],
+                        help="articles read from the database per batch")
+    args = parser.parse_args()
+    
+    run_snapshot(
+        directory=args.directory,
+        start_day=args.since,
+        end_day=args.until,
+        rebuild=args.rebuild,
+        with_content=args.with_content,
+        batch_size=args.batch_size
+    )
+
+if __name__ == "__main__":
+    main()
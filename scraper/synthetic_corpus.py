@@ -0,0 +1,226 @@
+"""
+Seeded generator of synthetic news headlines, RSS feeds and website pages
+
+Headlines are drawn from a Zipf-distributed vocabulary of news words and
+pronounceable made-up words, mixed with stop words, possessives, contractions,
+quotes, hyphenated compounds and numbers, so they exercise every path of the
+tokenizer. The same seed always produces the same corpus.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from itertools import accumulate
+from typing import Dict, List
+
+from config import NEWS_SOURCES
+
+# Frequent headline words, roughly in order of how often they appear in real headlines
+NEWS_VOCABULARY = [
+    'trump', 'biden', 'house', 'court', 'police', 'election', 'war', 'ukraine', 'israel', 'gaza',
+    'russia', 'china', 'president', 'senate', 'state', 'judge', 'campaign', 'vote', 'killed', 'shooting',
+    'fire', 'storm', 'climate', 'economy', 'market', 'stocks', 'inflation', 'rates', 'fed', 'prices',
+    'deal', 'talks', 'ceasefire', 'attack', 'strike', 'military', 'border', 'migrants', 'immigration', 'tariffs',
+    'trade', 'budget', 'shutdown', 'congress', 'republicans', 'democrats', 'governor', 'mayor', 'city', 'school',
+    'students', 'health', 'covid', 'vaccine', 'hospital', 'doctors', 'study', 'cancer', 'drug', 'abortion',
+    'supreme', 'ruling', 'lawsuit', 'trial', 'charges', 'arrested', 'prison', 'murder', 'investigation', 'fbi',
+    'world', 'cup', 'game', 'season', 'team', 'coach', 'players', 'win', 'final', 'star',
+    'film', 'music', 'album', 'show', 'netflix', 'awards', 'dies', 'family', 'life', 'home',
+    'tech', 'apple', 'google', 'musk', 'tesla', 'twitter', 'openai', 'artificial', 'intelligence', 'jobs',
+    'workers', 'union', 'housing', 'rent', 'oil', 'energy', 'power', 'water', 'heat', 'flood',
+    'hurricane', 'earthquake', 'crash', 'plane', 'flight', 'train', 'car', 'bank', 'billion', 'million',
+    'year', 'week', 'day', 'first', 'last', 'big', 'top', 'old', 'young', 'children',
+    'women', 'men', 'people', 'country', 'nation', 'american', 'british', 'europe', 'india', 'iran',
+    'korea', 'japan', 'mexico', 'canada', 'france', 'germany', 'london', 'york', 'california', 'texas',
+    'florida', 'washington', 'white', 'black', 'back', 'plan', 'bill', 'law', 'rule', 'policy',
+    'crisis', 'threat', 'warning', 'fears', 'hopes', 'calls', 'wants', 'takes', 'gets', 'makes',
+    'faces', 'hits', 'wins', 'loses', 'leaves', 'returns', 'opens', 'closes', 'rises', 'falls',
+]
+
+# Function words that the word processor excludes, mixed in at their natural rate
+FUNCTION_WORDS = [
+    'the', 'to', 'of', 'in', 'for', 'on', 'and', 'a', 'at', 'with', 'as', 'after', 'over', 'from',
+    'by', 'is', 'new', 'says', 'could', 'will', 'be', 'his', 'her', 'their', 'about', 'more', 'into',
+]
+
+CONTRACTIONS = ["can't", "won't", "isn't", "don't", "doesn't", "it's", "what's", "here's", "gonna", 'cannot']
+
+SYLLABLES = [
+    'ba', 'be', 'bi', 'bo', 'ca', 'co', 'da', 'de', 'di', 'fa', 'fe', 'ga', 'go', 'ha', 'he', 'ka',
+    'la', 'le', 'li', 'lo', 'ma', 'me', 'mi', 'mo', 'na', 'ne', 'ni', 'no', 'pa', 'pe', 'po', 'ra',
+    're', 'ri', 'ro', 'sa', 'se', 'si', 'so', 'ta', 'te', 'ti', 'to', 'va', 've', 'vi', 'za', 'zo',
+    'bar', 'ben', 'cor', 'dan', 'fer', 'gan', 'han', 'kin', 'lan', 'mar', 'nor', 'pen', 'ran', 'son',
+    'ter', 'van', 'wel', 'ton', 'ley', 'ric', 'stan', 'berg', 'ville', 'ford',
+]
+
+# Headline punctuation and shapes, with the share of headlines that use each
+QUOTE_RATE = 0.08
+COLON_RATE = 0.12
+QUESTION_RATE = 0.05
+NUMBER_RATE = 0.15
+HYPHEN_RATE = 0.10
+POSSESSIVE_RATE = 0.10
+CONTRACTION_RATE = 0.06
+TITLE_CASE_RATE = 0.4
+
+# Share of headline words that are function words
+FUNCTION_WORD_RATE = 0.3
+
+# Zipf-Mandelbrot parameters of the vocabulary; the rank offset flattens the head so
+# the most common headline word makes up a couple of percent of words, not a tenth
+ZIPF_EXPONENT = 1.07
+ZIPF_RANK_OFFSET = 20
+
+class SyntheticCorpus:
+    """Deterministic source of synthetic headlines, articles, RSS feeds and website pages"""
+    
+    def __init__(self, seed: int = 0, vocabulary_size: int = 20000):
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.vocabulary = self._build_vocabulary(vocabulary_size)
+        self.cumulative_weights = list(accumulate(
+            1 / (rank + ZIPF_RANK_OFFSET) ** ZIPF_EXPONENT for rank in range(1, len(self.vocabulary) + 1)
+        ))
+        self.sources = list(NEWS_SOURCES)
+        self._next_article = 0
+    
+    def _build_vocabulary(self, size: int) -> List[str]:
+        """Get the real news words followed by enough made-up words to reach the vocabulary size"""
+        vocabulary = list(NEWS_VOCABULARY)
+        seen = set(vocabulary)
+        while len(vocabulary) < size:
+            word = ''.join(self.random.choice(SYLLABLES) for _ in range(self.random.choice([2, 2, 3, 3, 4])))
+            if word not in seen:
+                seen.add(word)
+                vocabulary.append(word)
+        return vocabulary
+    
+    def _word(self) -> str:
+        """Draw a vocabulary word by its Zipf weight"""
+        return self.random.choices(self.vocabulary, cum_weights=self.cumulative_weights)[0]
+    
+    def headline(self) -> str:
+        """Generate one headline"""
+        rng = self.random
+        
+        # Headline lengths cluster around ten words with a long tail of longer ones
+        length = max(3, min(24, round(rng.lognormvariate(2.25, 0.3))))
+        words = []
+        for _ in range(length):
+            if rng.random() < FUNCTION_WORD_RATE:
+                words.append(rng.choice(FUNCTION_WORDS))
+            else:
+                words.append(self._word())
+        
+        if rng.random() < POSSESSIVE_RATE:
+            index = rng.randrange(len(words))
+            words[index] += "'s"
+        if rng.random() < CONTRACTION_RATE:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(CONTRACTIONS))
+        if rng.random() < HYPHEN_RATE:
+            index = rng.randrange(len(words))
+            words[index] = f"{words[index]}-{self._word()}"
+        if rng.random() < NUMBER_RATE:
+            words.insert(rng.randrange(len(words) + 1), rng.choice([str(rng.randint(2, 500)), f"${rng.randint(1, 900)}B", '2025']))
+        if rng.random() < QUOTE_RATE:
+            start = rng.randrange(len(words))
+            end = min(len(words), start + rng.randint(1, 3))
+            words[start] = f"'{words[start]}"
+            words[end - 1] = f"{words[end - 1]}'"
+        
+        if rng.random() < TITLE_CASE_RATE:
+            words = [word[:1].upper() + word[1:] for word in words]
+        else:
+            words[0] = words[0][:1].upper() + words[0][1:]
+        
+        headline = ' '.join(words)
+        if rng.random() < COLON_RATE and len(words) > 3:
+            split = rng.randint(1, 3)
+            headline = ' '.join(words[:split]) + ': ' + ' '.join(words[split:])
+        if rng.random() < QUESTION_RATE:
+            headline += '?'
+        return headline
+    
+    def headlines(self, count: int) -> List[str]:
+        """Generate a list of headlines"""
+        return [self.headline() for _ in range(count)]
+    
+    def articles(self, count: int, source: str = None, start: datetime = None) -> List[Dict]:
+        """Generate articles in the scraper's article format, newest first
+        
+        Articles are spread over the hour before start (default: a fixed date,
+        so the corpus does not depend on when it is generated). Without a source
+        each article gets a random one.
+        """
+        rng = self.random
+        start = start or datetime(2025, 1, 1, tzinfo=timezone.utc)
+        
+        articles = []
+        for _ in range(count):
+            self._next_article += 1
+            article_source = source or rng.choice(self.sources)
+            title = self.headline()
+            articles.append({
+                'source': article_source,
+                'title': title,
+                'link': f"https://{article_source}.example.com/news/{self.seed}/{self._next_article}",
+                'published': start - timedelta(seconds=rng.randrange(3600)),
+                'summary': ' '.join(self.headline() for _ in range(rng.randint(1, 3))),
+            })
+        
+        articles.sort(key=lambda article: article['published'], reverse=True)
+        return articles
+    
+    def rss_feed(self, articles: List[Dict], title: str = 'Synthetic News') -> bytes:
+        """Render articles as an RSS 2.0 feed"""
+        items = []
+        for article in articles:
+            items.append(
+                "<item>"
+                f"<title>{escape(article['title'])}</title>"
+                f"<link>{escape(article['link'])}</link>"
+                f"<guid isPermaLink=\"true\">{escape(article['link'])}</guid>"
+                f"<pubDate>{format_datetime(article['published'])}</pubDate>"
+                f"<description><![CDATA[<p>{escape(article['summary'])}</p>]]></description>"
+                "<category>News</category>"
+                "</item>"
+            )
+        
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            f"<title>{escape(title)}</title><link>https://example.com/</link>"
+            "<description>Synthetic headlines for benchmarks</description>"
+            f"{''.join(items)}"
+            "</channel></rss>\n"
+        ).encode('utf-8')
+    
+    def html_page(self, articles: List[Dict]) -> bytes:
+        """Render articles as a news homepage with navigation, scripts and teaser markup"""
+        rng = self.random
+        navigation = ''.join(
+            f'<li><a href="/section/{word}">{word.title()}</a></li>'
+            for word in NEWS_VOCABULARY[:30]
+        )
+        
+        cards = []
+        for article in articles:
+            level = rng.choice(['h2', 'h2', 'h3'])
+            cards.append(
+                '<article class="story"><div class="media"><img src="/img/placeholder.jpg" alt=""></div>'
+                f'<{level} class="headline"><a href="{escape(article["link"])}">{escape(article["title"])}</a></{level}>'
+                f'<p class="summary">{escape(article["summary"])}</p>'
+                f'<span class="byline">By {self._word().title()} {self._word().title()}</span>'
+                '</article>'
+            )
+        
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Synthetic News</title>'
+            f"<script>window.__DATA__ = {{\"items\": [{', '.join(str(rng.random()) for _ in range(200))}]}};</script>"
+            '</head><body>'
+            f'<header><nav><ul>{navigation}</ul></nav></header>'
+            f"<main>{''.join(cards)}</main>"
+            '<footer><p>&copy; Synthetic News</p></footer>'
+            '</body></html>'
+        ).encode('utf-8')
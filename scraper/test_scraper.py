@@ -4,11 +4,15 @@ Test script for the news scraper
 
 import os
 import sys
+import tempfile
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 
 from news_scraper import NewsScraper
 from word_processor import WordProcessor
 from database import create_tables
+from url_index import KnownUrlIndex
 
 # Load environment variables
 load_dotenv()
@@ -52,6 +56,301 @@ def test_word_processor():
         print(f"❌ Word processor test failed: {e}")
         return False
 
+def test_fast_tokenizer():
+    """Test that the fast tokenizer matches the NLTK pipeline"""
+    print("\nTesting fast tokenizer...")
+    import random
+    from collections import Counter
+    from synthetic_corpus import SyntheticCorpus
+    
+    processor = WordProcessor()
+    
+    # Test headlines covering contractions, quotes, hyphens, underscores, URLs and emails
+    test_headlines = [
+        "Breaking News: President announces new policy on climate change",
+        "Trump's tariffs can't stop the 'historic' rally, experts say",
+        "Players' union rejects deal -- again; talks gonna resume Monday",
+        "COVID-19 cases rise in well-known U.S. cities (report)",
+        "Read more at https://example.com/story?id=1 or email tips@example.com",
+        "Rock'n'roll legend O'Neill dies at 82 — 'tis the end of an era",
+        "Senators cannot agree on budget as shutdown looms'",
+        "_Breaking_ senate__ vote on snake_case deB_ and __init__ rules_2025 _1st",
+        "Markets__: stocks' rally_'s end -- traders_ can't_ wanna_ sell"
+    ]
+    
+    # Synthetic headlines with punctuation, digits and underscores scattered through them
+    rng = random.Random(5)
+    for headline in SyntheticCorpus(seed=5).headlines(2000):
+        characters = list(headline)
+        for _ in range(rng.randint(1, 6)):
+            characters.insert(rng.randrange(len(characters) + 1), rng.choice("_''-—.,:;!?\"()&$%1 @#/") * rng.randint(1, 2))
+        test_headlines.append(''.join(characters))
+    
+    for headline in test_headlines:
+        expected = processor.tokenize_text(processor.clean_text(headline))
+        actual = processor.fast_tokenize(headline)
+        assert actual == expected, f"{headline!r}: expected {expected}, got {actual}"
+    
+    # The batch path follows the fast_tokenizer flag like the single-headline path
+    batch = processor.process_headlines_batch(test_headlines)
+    processor.fast_tokenizer = False
+    assert processor.process_headlines_batch(test_headlines) == batch
+    assert batch == [Counter(processor.tokenize_text(processor.clean_text(headline))) for headline in test_headlines]
+    
+    print("✅ Fast tokenizer test successful")
+    print(f"   Matched NLTK output for {len(batch)} headlines")
+
+def test_startup_imports():
+    """Test that importing the scraper does not load deferred dependencies"""
+    print("\nTesting startup imports...")
+    from benchmark_startup import check_deferred_imports
+    
+    loaded = check_deferred_imports('news_scraper')
+    if loaded:
+        raise AssertionError(f"importing news_scraper loaded {', '.join(loaded)}")
+    
+    print("✅ Startup imports test successful")
+
+def test_synthetic_parsing():
+    """Test that synthetic feeds and pages parse back into the generated articles"""
+    print("\nTesting synthetic feed parsing...")
+    from synthetic_corpus import SyntheticCorpus
+    from config import SCRAPING_CONFIG
+    
+    if SyntheticCorpus(seed=7).headlines(20) != SyntheticCorpus(seed=7).headlines(20):
+        raise AssertionError("the same seed generated different headlines")
+    
+    corpus = SyntheticCorpus(seed=7)
+    articles = corpus.articles(20)
+    scraper = NewsScraper()
+    
+    parsed = list(scraper.parse_feed_articles(corpus.rss_feed(articles)))
+    if [article['title'] for article in parsed] != [article['title'] for article in articles]:
+        raise AssertionError("RSS titles do not match the generated headlines")
+    if [article['published'] for article in parsed] != [article['published'] for article in articles]:
+        raise AssertionError("RSS published dates do not match the generated articles")
+    
+    # A long feed streamed in chunks stops being read once the article limit is reached
+    long_feed = corpus.rss_feed(corpus.articles(1000))
+    chunks = iter([long_feed[index:index + 4096] for index in range(0, len(long_feed), 4096)])
+    streamed = list(scraper.parse_feed_articles(chunks))
+    if len(streamed) != SCRAPING_CONFIG['max_articles_per_source'] or next(chunks, None) is None:
+        raise AssertionError("streaming did not stop at the article limit")
+    
+    source_config = {'name': 'Synthetic News', 'url': 'https://synthetic.example.com/',
+                     'headline_selectors': ['.headline']}
+    extracted = scraper.parse_website_headlines(corpus.html_page(articles), source_config)
+    if [article['link'] for article in extracted] != [article['link'] for article in articles]:
+        raise AssertionError("website links do not match the generated articles")
+    
+    print("✅ Synthetic feed parsing test successful")
+    print(f"   Parsed {len(parsed)} feed entries and {len(extracted)} website headlines")
+
+def test_feed_entities():
+    """Test that HTML entities and bare ampersands in a feed survive parsing, however the feed is chunked"""
+    print("\nTesting feed entities...")
+    feed = (b'<?xml version="1.0"?><rss version="2.0"><channel><item>'
+            b'<title>Trump&rsquo;s tariff plan &amp; senate&nbsp;vote</title>'
+            b'<link>https://example.com/story?x=1&y=2</link>'
+            b'<description><![CDATA[Caf&eacute; &amp; bar & grill]]></description>'
+            b'</item></channel></rss>')
+    scraper = NewsScraper()
+    
+    for chunk_size in [len(feed), 7, 1]:
+        chunks = [feed[index:index + chunk_size] for index in range(0, len(feed), chunk_size)]
+        articles = list(scraper.parse_feed_articles(iter(chunks)))
+        assert len(articles) == 1, f"expected 1 article in {chunk_size}-byte chunks, got {len(articles)}"
+        assert articles[0]['title'] == 'Trump\u2019s tariff plan & senate\xa0vote', articles[0]['title']
+        assert articles[0]['link'] == 'https://example.com/story?x=1&y=2', articles[0]['link']
+        assert articles[0]['summary'] == 'Caf\xe9 & bar & grill', articles[0]['summary']
+    
+    words = WordProcessor().fast_tokenize(articles[0]['title'])
+    assert words == ['trump', 'tariff', 'plan', 'senate', 'vote'], f"entities ran words together: {words}"
+    
+    print("✅ Feed entities test successful")
+
+@contextmanager
+def replayed_scraper(seed: int = 3, articles_per_source: int = 5):
+    """Run a scraper whose requests are answered by a replay server of synthetic sources
+    
+    The scraper starts with an empty feed cache and known-URL index and keeps them in
+    memory only, so its scrapes never touch the real cache files.
+    """
+    from http_replay import ReplayServer, route_to_replay, synthesize_recording
+    
+    recording = synthesize_recording(tempfile.mkdtemp(), seed=seed, articles_per_source=articles_per_source)
+    scraper = NewsScraper()
+    scraper.feed_cache.path = None
+    scraper._known_urls = KnownUrlIndex()
+    with ReplayServer(recording) as server:
+        route_to_replay(scraper.transport.session, server.base_url)
+        yield scraper, server
+
+def test_http_replay():
+    """Test that a replayed feed is fetched in full until its articles are saved, then answered not modified"""
+    print("\nTesting HTTP replay...")
+    from config import NEWS_SOURCES
+    
+    rss_url = NEWS_SOURCES['bbc']['rss_feed']
+    with replayed_scraper() as (scraper, server):
+        articles = scraper.get_rss_feed(rss_url)
+        
+        # Nothing was saved, so the feed must not be skipped as unchanged
+        unsaved = scraper.get_rss_feed(rss_url)
+        
+        # Saving the articles records the feed's validators
+        scraper.feed_cache.commit(rss_url)
+        repeated = scraper.get_rss_feed(rss_url)
+        requests_served = server.requests_served
+    
+    assert len(articles) == 5, f"expected 5 replayed articles, got {len(articles)}"
+    assert all(article['title'] and article['link'].startswith('http') for article in articles)
+    assert unsaved == articles, "a feed whose articles were never saved was skipped"
+    assert repeated is None, "the fetch after saving was not answered as unchanged"
+    assert requests_served == 3, f"expected 3 requests, the server answered {requests_served}"
+    
+    print("✅ HTTP replay test successful")
+    print(f"   Replayed {len(articles)} articles, then a not modified response once they were saved")
+
+def test_date_parsing():
+    """Test that feed dates in the common formats parse to aware UTC datetimes, and invalid ones to None"""
+    print("\nTesting date parsing...")
+    from datetime import datetime, timezone
+    
+    scraper = NewsScraper()
+    expected = datetime(2025, 1, 6, 14, 30, tzinfo=timezone.utc)
+    for date_string in ['Mon, 06 Jan 2025 14:30:00 +0000', 'Mon, 06 Jan 2025 14:30:00 GMT',
+                        'Mon, 06 Jan 2025 09:30:00 EST', '2025-01-06T14:30:00Z',
+                        '2025-01-06T20:00:00+05:30', '2025-01-06 14:30:00']:
+        parsed = scraper._parse_date(date_string, feed='https://example.com/rss')
+        assert parsed == expected and parsed.tzinfo == timezone.utc, f"{date_string!r} parsed as {parsed!r}"
+    
+    assert scraper._parse_date('Posted 2025-01-06 at noon') == datetime(2025, 1, 6, tzinfo=timezone.utc)
+    
+    # Dates that do not exist are dropped rather than failing the whole feed
+    for date_string in ['Posted 2025-02-30 10:00', 'Sun, 30 Feb 2025 10:00:00 GMT', '2025-13-01T00:00:00Z', 'soon']:
+        parsed = scraper._parse_date(date_string, feed='https://example.com/rss')
+        assert parsed is None, f"{date_string!r} parsed as {parsed!r}"
+    
+    feed = (b'<rss><channel><item><title>Leap year</title><link>https://example.com/a</link>'
+            b'<pubDate>Posted 2025-02-30 10:00</pubDate></item></channel></rss>')
+    articles = list(scraper.parse_feed_articles(feed))
+    assert [(article['title'], article['published']) for article in articles] == [('Leap year', None)]
+    
+    print("✅ Date parsing test successful")
+
+def test_circuit_breaker():
+    """Test that a failing host's circuit opens, persists and closes again after a successful probe"""
+    print("\nTesting circuit breaker...")
+    from datetime import datetime, timezone
+    from http_transport import CircuitOpenError, HostHealth, HostTransport
+    
+    path = os.path.join(tempfile.mkdtemp(), 'host_state.json')
+    health = HostHealth(path, failure_threshold=2)
+    health.record_failure('down.example.com', 'Read timed out')
+    health.record_failure('down.example.com', 'Read timed out')
+    health.save()
+    
+    transport = HostTransport(health=HostHealth(path, failure_threshold=2))
+    try:
+        transport.get('https://down.example.com/rss')
+        raise AssertionError("a request was sent to a host with an open circuit")
+    except CircuitOpenError:
+        pass
+    
+    # Once the circuit is due for a probe, a success closes it
+    transport.health.hosts['down.example.com']['retry_at'] = datetime.now(timezone.utc).isoformat()
+    if not transport.health.is_half_open('down.example.com'):
+        raise AssertionError("the circuit was not half-open after its reset time")
+    transport.health.record_success('down.example.com', 0.5)
+    if transport.is_open('https://down.example.com/rss'):
+        raise AssertionError("a successful probe did not close the circuit")
+    
+    print("✅ Circuit breaker test successful")
+    print(f"   Read timeout after a 0.5s response: {transport.health.read_timeout('down.example.com')}s")
+
+def test_scrape_pipeline():
+    """Test that the stage pipeline writes replayed sources to the database, then skips them as unchanged"""
+    print("\nTesting scrape pipeline...")
+    from scrape_pipeline import ScrapePipeline
+    from database import Article, DatabaseManager, ScrapingLog
+    from config import NEWS_SOURCES
+    
+    source_keys = ['bbc', 'npr', 'guardian']
+    sources = [(source_key, NEWS_SOURCES[source_key]) for source_key in source_keys]
+    
+    def stored_articles():
+        with DatabaseManager() as db_manager:
+            return {source_key: db_manager.session.query(Article).filter(Article.source == source_key).count()
+                    for source_key in source_keys}
+    
+    # A fresh seed each run, so the replayed articles are never already stored
+    create_tables()
+    before = stored_articles()
+    with replayed_scraper(seed=time.time_ns() % 10 ** 9) as (scraper, server):
+        results = ScrapePipeline(scraper, fetch_workers=2, queue_size=1).run(sources)
+        written = {source_key: count - before[source_key] for source_key, count in stored_articles().items()}
+        
+        # The feeds are cached now, so a second run is answered not modified and writes nothing
+        repeated = ScrapePipeline(scraper, fetch_workers=2, queue_size=1).run(sources)
+    
+    with DatabaseManager() as db_manager:
+        statuses = {source_key: db_manager.session.query(ScrapingLog.status).filter(ScrapingLog.source == source_key)
+                    .order_by(ScrapingLog.id.desc()).limit(1).scalar() for source_key in source_keys}
+    
+    assert results == {source_key: 5 for source_key in source_keys}, f"unexpected new article counts: {results}"
+    assert written == results, f"rows written {written} do not match the new article counts {results}"
+    assert repeated == {source_key: 0 for source_key in source_keys}, f"unexpected counts on the second run: {repeated}"
+    assert stored_articles() == {source_key: before[source_key] + 5 for source_key in source_keys}
+    assert statuses == {source_key: 'unchanged' for source_key in source_keys}, f"unexpected statuses: {statuses}"
+    
+    print("✅ Scrape pipeline test successful")
+    print(f"   Saved {sum(results.values())} articles from {len(results)} sources, then skipped them unchanged")
+
+def test_snapshot_watermark():
+    """Test that a snapshot rewrites days whose articles arrived late, and puts undated articles in their scraped day"""
+    print("\nTesting snapshot watermark...")
+    from datetime import datetime, time as day_time, timedelta, timezone
+    from database import Article, DatabaseManager, use_database
+    from snapshot_data import read_snapshot, run_snapshot
+    
+    directory = tempfile.mkdtemp()
+    snapshot_directory = os.path.join(directory, 'snapshot')
+    today = datetime.now(timezone.utc).date()
+    earlier = today - timedelta(days=3)
+    
+    def add_article(url, published_date):
+        with DatabaseManager() as db_manager:
+            db_manager.session.add(Article(source='bbc', headline=url, url=url, published_date=published_date))
+            db_manager.session.commit()
+    
+    def snapshot_urls():
+        articles = read_snapshot('articles', snapshot_directory)
+        return {(str(day), url) for day, url in zip(articles['day'], articles['url'])}
+    
+    with use_database(f"sqlite:///{os.path.join(directory, 'snapshot.db')}"):
+        create_tables()
+        add_article('https://example.com/a', datetime.combine(earlier, day_time(12), tzinfo=timezone.utc))
+        first = run_snapshot(snapshot_directory, end_day=today)
+        
+        # Scraped after the first snapshot: one published on a day already written, one undated
+        add_article('https://example.com/late', datetime.combine(earlier, day_time(18), tzinfo=timezone.utc))
+        add_article('https://example.com/undated', None)
+        second = run_snapshot(snapshot_directory, end_day=today + timedelta(days=1))
+        
+        written = snapshot_urls()
+        run_snapshot(snapshot_directory, end_day=today + timedelta(days=1))
+    
+    assert (first, second) == (1, 2), f"unexpected days written: {(first, second)}"
+    assert written == {
+        (earlier.isoformat(), 'https://example.com/a'),
+        (earlier.isoformat(), 'https://example.com/late'),
+        (today.isoformat(), 'https://example.com/undated'),
+    }, f"unexpected snapshot: {sorted(written)}"
+    assert snapshot_urls() == written, "snapshotting the same articles again changed the snapshot"
+    
+    print("✅ Snapshot watermark test successful")
+
 def test_single_source_scraping():
     """Test scraping from a single source"""
     print("\nTesting single source scraping...")
@@ -82,6 +381,15 @@ def main():
     tests = [
         ("Database Connection", test_database_connection),
         ("Word Processor", test_word_processor),
+        ("Fast Tokenizer", test_fast_tokenizer),
+        ("Startup Imports", test_startup_imports),
+        ("Synthetic Feed Parsing", test_synthetic_parsing),
+        ("Feed Entities", test_feed_entities),
+        ("HTTP Replay", test_http_replay),
+        ("Date Parsing", test_date_parsing),
+        ("Circuit Breaker", test_circuit_breaker),
+        ("Scrape Pipeline", test_scrape_pipeline),
+        ("Snapshot Watermark", test_snapshot_watermark),
         ("Single Source Scraping", test_single_source_scraping)
     ]
     
@@ -90,8 +398,13 @@ def main():
     
     for test_name, test_func in tests:
         print(f"Running {test_name} test...")
-        if test_func():
-            passed += 1
+        
+        # Tests either return whether they passed or assert, returning nothing
+        try:
+            if test_func() is not False:
+                passed += 1
+        except Exception as e:
+            print(f"❌ {test_name} test failed: {e!r}")
         print()
     
     print(f"📊 Test Results: {passed}/{total} tests passed")
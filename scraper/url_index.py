@@ -0,0 +1,45 @@
+"""
+In-process index of article URLs that are already stored in the database
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class KnownUrlIndex:
+    """Set of stored article URLs used to drop duplicates before any database or word processing work"""
+    
+    def __init__(self, urls: Iterable[str] = ()):
+        self._urls = set(urls)
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def load(cls, db_manager, lookback_days: int) -> 'KnownUrlIndex':
+        """Build the index from articles scraped within the lookback window"""
+        since = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+        index = cls(db_manager.get_recent_article_urls(since))
+        logger.info(f"Loaded {len(index)} known article URLs from the last {lookback_days} days")
+        return index
+    
+    def __contains__(self, url: str) -> bool:
+        return url in self._urls
+    
+    def __len__(self) -> int:
+        return len(self._urls)
+    
+    def add(self, url: str):
+        """Mark a URL as stored"""
+        with self._lock:
+            self._urls.add(url)
+    
+    def claim(self, url: str) -> bool:
+        """Mark a URL as stored, returning False if it was already known"""
+        with self._lock:
+            if url in self._urls:
+                return False
+            self._urls.add(url)
+            return True
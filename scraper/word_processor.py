@@ -4,41 +4,108 @@ Word processing module for analyzing headlines and extracting word frequencies
 
 import re
 import string
+import threading
 from collections import Counter
 from typing import List, Dict
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 import logging
 from config import WORD_PROCESSING_CONFIG
+from stopwords_english import ENGLISH_STOP_WORDS
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# NLTK is only needed by the legacy tokenizer, so it is imported on first use
+_word_tokenize = None
+_nltk_lock = threading.Lock()
 
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
+def get_word_tokenize():
+    """Import NLTK's word_tokenize, downloading its tokenizer data if needed"""
+    global _word_tokenize
+    with _nltk_lock:
+        if _word_tokenize is None:
+            import nltk
+            from nltk.tokenize import word_tokenize
+            
+            # Download required NLTK data
+            try:
+                nltk.data.find('tokenizers/punkt')
+            except LookupError:
+                nltk.download('punkt')
+            
+            try:
+                nltk.data.find('tokenizers/punkt_tab')
+            except LookupError:
+                nltk.download('punkt_tab')
+            
+            _word_tokenize = word_tokenize
+    return _word_tokenize
+
+def normalize_word(word: str) -> str:
+    """Get the form a word is stored and searched in (lower(trim(...)) in the SQL functions)"""
+    return word.strip().lower()
+
+def normalize_word_frequencies(word_frequencies: Dict[str, int]) -> Dict[str, int]:
+    """Normalize the words of a word frequency dict, merging words that share a normalized form"""
+    normalized = {}
+    for word, frequency in (word_frequencies or {}).items():
+        word = normalize_word(word)
+        if word:
+            normalized[word] = normalized.get(word, 0) + frequency
+    return normalized
+
+# Precompiled text cleaning patterns
+URL_PATTERN = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s\'-]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Runs of word characters, apostrophes and hyphens, i.e. the chunks left between
+# spaces once special characters are removed
+CHUNK_PATTERN = re.compile(r"[\w'-]+")
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Words that NLTK's tokenizer splits even though they contain only letters
+CONTRACTION_WORDS = {'cannot', 'gimme', 'gonna', 'gotta', 'lemme', 'wanna'}
+
+# The subset of NLTK's Treebank tokenizer rules that can still apply to a cleaned
+# chunk, grouped and ordered the way NLTK applies them
+STARTING_QUOTE_RULES = [
+    (re.compile(r"( )('{2})"), r"\1 `` "),
+    (re.compile(r"(?i)(')(?!re|ve|ll|m|t|s|d|n)(\w)\b"), r"\1 \2"),
+    (re.compile(r"([^'])' "), r"\1 ' "),
+]
+DOUBLE_DASH_RULE = (re.compile(r"--"), r" -- ")
+ENDING_QUOTE_RULES = [
+    (re.compile(r"''"), " '' "),
+    (re.compile(r"([^' ])('[sS]|'[mM]|'[dD]|') "), r"\1 \2 "),
+    (re.compile(r"([^' ])('ll|'LL|'re|'RE|'ve|'VE|n't|N'T) "), r"\1 \2 "),
+]
+CONTRACTION_RULES = [
+    (re.compile(r"(?i)\b(can)(not)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(d)('ye)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(gim)(me)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(gon)(na)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(got)(ta)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(lem)(me)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(more)('n)\b"), r" \1 \2 "),
+    (re.compile(r"(?i)\b(wan)(na)(?=\s)"), r" \1 \2 "),
+    (re.compile(r"(?i) ('t)(is)\b"), r" \1 \2 "),
+    (re.compile(r"(?i) ('t)(was)\b"), r" \1 \2 "),
+]
+CONTRACTION_PATTERN = re.compile(r"(?i)\b(?:cannot|gimme|gonna|gotta|lemme|wanna|d'ye|more'n)\b|'t(?:is|was)\b")
+
+# Number of distinct chunks whose words are memoized by the fast tokenizer
+CHUNK_CACHE_SIZE = 100000
 
 class WordProcessor:
     """Class for processing headlines and extracting word frequencies"""
     
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = set(ENGLISH_STOP_WORDS)
         self.common_words = set(WORD_PROCESSING_CONFIG['common_words_to_exclude'])
         self.min_word_length = WORD_PROCESSING_CONFIG['min_word_length']
         self.max_word_length = WORD_PROCESSING_CONFIG['max_word_length']
+        self.fast_tokenizer = WORD_PROCESSING_CONFIG['fast_tokenizer']
+        self._chunk_cache = {}
         
         # Combine stop words and common words
         self.excluded_words = self.stop_words.union(self.common_words)
@@ -64,16 +131,16 @@ class WordProcessor:
         text = text.lower()
         
         # Remove URLs
-        text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+        text = URL_PATTERN.sub('', text)
         
         # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        text = EMAIL_PATTERN.sub('', text)
         
         # Remove special characters but keep apostrophes and hyphens within words
-        text = re.sub(r'[^\w\s\'-]', ' ', text)
+        text = SPECIAL_CHARS_PATTERN.sub(' ', text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         
         return text
     
@@ -81,7 +148,7 @@ class WordProcessor:
         """Tokenize text into words"""
         try:
             # Use NLTK tokenizer
-            tokens = word_tokenize(text)
+            tokens = get_word_tokenize()(text)
             
             # Filter out non-alphabetic tokens and normalize
             words = []
@@ -94,14 +161,101 @@ class WordProcessor:
                     token.isalpha() and 
                     len(token) >= self.min_word_length and
                     len(token) <= self.max_word_length and
-                    token.lower() not in self.excluded_words):
-                    words.append(token.lower())
+                    normalize_word(token) not in self.excluded_words):
+                    words.append(normalize_word(token))
             
             return words
         except Exception as e:
             logger.error(f"Error tokenizing text: {e}")
             return []
     
+    def _split_chunk(self, chunk: str, first: bool, last: bool) -> List[str]:
+        """Split a chunk containing quotes, dashes or contractions the way NLTK's tokenizer does"""
+        has_quote = "'" in chunk
+        
+        # NLTK applies these rules before padding the text, so the first and last
+        # chunks of a headline have no surrounding space to match against
+        text = ('' if first else ' ') + chunk + ('' if last else ' ')
+        if has_quote:
+            for pattern, replacement in STARTING_QUOTE_RULES:
+                text = pattern.sub(replacement, text)
+        if '--' in chunk:
+            pattern, replacement = DOUBLE_DASH_RULE
+            text = pattern.sub(replacement, text)
+        
+        text = f" {text} "
+        if has_quote:
+            for pattern, replacement in ENDING_QUOTE_RULES:
+                text = pattern.sub(replacement, text)
+        if CONTRACTION_PATTERN.search(text):
+            for pattern, replacement in CONTRACTION_RULES:
+                text = pattern.sub(replacement, text)
+        
+        return text.split()
+    
+    def _chunk_words(self, chunk: str, first: bool, last: bool) -> tuple:
+        """Get the valid words in a single cleaned chunk"""
+        if chunk.isalpha():
+            if chunk in CONTRACTION_WORDS:
+                tokens = self._split_chunk(chunk, first, last)
+            else:
+                tokens = (chunk,)
+        elif "'" in chunk or '-' in chunk:
+            if "'" in chunk or '--' in chunk or CONTRACTION_PATTERN.search(chunk):
+                tokens = self._split_chunk(chunk, first, last)
+            else:
+                tokens = (chunk,)
+        elif chunk.isalnum():
+            # Digits are never stripped, so the chunk cannot become a word
+            return ()
+        else:
+            # Underscores are word characters to the tokenizer but punctuation to the
+            # strip below, so a chunk like '_word_' still yields 'word'
+            tokens = (chunk,)
+        
+        words = []
+        for token in tokens:
+            token = token.strip(string.punctuation)
+            if (token and 
+                token.isalpha() and 
+                self.min_word_length <= len(token) <= self.max_word_length and
+                token not in self.excluded_words):
+                words.append(token)
+        return tuple(words)
+    
+    def fast_tokenize(self, text: str) -> List[str]:
+        """Clean and tokenize raw text in a single regex pass
+        
+        Produces the same words as tokenize_text(clean_text(text)) without running
+        NLTK's sentence splitter and full Treebank rule set on every headline.
+        """
+        if not text:
+            return []
+        
+        text = text.lower()
+        if 'http' in text:
+            text = URL_PATTERN.sub('', text)
+        if '@' in text:
+            text = EMAIL_PATTERN.sub('', text)
+        
+        chunks = CHUNK_PATTERN.findall(text)
+        last_index = len(chunks) - 1
+        cache = self._chunk_cache
+        
+        words = []
+        for index, chunk in enumerate(chunks):
+            # Only quote rules depend on where the chunk sits in the headline
+            key = (chunk, index == 0, index == last_index) if "'" in chunk else chunk
+            chunk_words = cache.get(key)
+            if chunk_words is None:
+                chunk_words = self._chunk_words(chunk, index == 0, index == last_index)
+                if len(cache) >= CHUNK_CACHE_SIZE:
+                    cache.clear()
+                cache[key] = chunk_words
+            words.extend(chunk_words)
+        
+        return words
+    
     def process_headlines(self, headlines: List[str]) -> Dict[str, int]:
         """Process a list of headlines and return word frequencies"""
         word_counter = Counter()
@@ -110,17 +264,26 @@ class WordProcessor:
             if not headline:
                 continue
             
-            # Clean the headline
-            cleaned_headline = self.clean_text(headline)
-            
-            # Tokenize into words
-            words = self.tokenize_text(cleaned_headline)
+            if self.fast_tokenizer:
+                words = self.fast_tokenize(headline)
+            else:
+                # Clean the headline
+                cleaned_headline = self.clean_text(headline)
+                
+                # Tokenize into words
+                words = self.tokenize_text(cleaned_headline)
             
             # Add to counter
             word_counter.update(words)
         
         return dict(word_counter)
     
+    def process_headlines_batch(self, headlines: List[str]) -> List[Counter]:
+        """Process many headlines at once and return a word counter for each one"""
+        if self.fast_tokenizer:
+            return [Counter(self.fast_tokenize(headline)) for headline in headlines]
+        return [Counter(self.tokenize_text(self.clean_text(headline))) for headline in headlines]
+    
     def get_top_words(self, word_frequencies: Dict[str, int], top_n: int = 100) -> Dict[str, int]:
         """Get the top N most frequent words"""
         sorted_words = sorted(word_frequencies.items(), key=lambda x: x[1], reverse=True)
@@ -151,6 +314,15 @@ class WordProcessor:
         
         return top_words
     
+    def analyze_headlines_batch(self, headlines: List[str], 
+                                min_frequency: int = 1, 
+                                top_n: int = 50) -> List[Dict[str, int]]:
+        """Analyze each headline separately, returning one word frequency dict per headline"""
+        return [
+            self.get_top_words(self.filter_words_by_frequency(counter, min_frequency), top_n)
+            for counter in self.process_headlines_batch(headlines)
+        ]
+    
     def get_word_statistics(self, word_frequencies: Dict[str, int]) -> Dict:
         """Get statistics about word frequencies"""
         if not word_frequencies:
@@ -0,0 +1,23 @@
+-- EXPLAIN ANALYZE of uncached scoreboard computations over the synthetic data (see synthetic_data.sql)
+-- Usage: psql "$DATABASE_URL" -f explain_scoreboards.sql | grep -E "^-- |Execution Time"
+
+\echo '-- top words, past month, all sources, size 10'
+explain (analyze, buffers) select compute_scoreboard('get_top_words_scoreboard', '2024-06-01 04:00+00', '2024-07-01 04:00+00', null, null, null, 10);
+
+\echo '-- top words, past month, 4 sources, size 10'
+explain (analyze, buffers) select compute_scoreboard('get_top_words_scoreboard', '2024-06-01 04:00+00', '2024-07-01 04:00+00', '{source_1,source_2,source_3,source_4}', null, null, 10);
+
+\echo '-- top words, past year, all sources, size 10'
+explain (analyze, buffers) select compute_scoreboard('get_top_words_scoreboard', '2024-01-01 05:00+00', '2025-01-01 05:00+00', null, null, null, 10);
+
+\echo '-- associated words, past month, all sources, size 10'
+explain (analyze, buffers) select compute_scoreboard('get_associated_words_scoreboard', '2024-06-01 04:00+00', '2024-07-01 04:00+00', null, null, 'word_3', 10);
+
+\echo '-- comparative words, past month, 3 vs 3 sources, size 10'
+explain (analyze, buffers) select compute_scoreboard('get_comparative_words_scoreboard', '2024-06-01 04:00+00', '2024-07-01 04:00+00', '{source_1,source_2,source_3}', '{source_4,source_5,source_6}', null, 10);
+
+\echo '-- comparative associated words, past month, 3 vs 3 sources, size 10'
+explain (analyze, buffers) select compute_scoreboard('get_comparative_associated_words_scoreboard', '2024-06-01 04:00+00', '2024-07-01 04:00+00', '{source_1,source_2,source_3}', '{source_4,source_5,source_6}', 'word_3', 10);
+
+\echo '-- comparative words, past year, 3 vs 3 sources, size 10'
+explain (analyze, buffers) select compute_scoreboard('get_comparative_words_scoreboard', '2024-01-01 05:00+00', '2025-01-01 05:00+00', '{source_1,source_2,source_3}', '{source_4,source_5,source_6}', null, 10);
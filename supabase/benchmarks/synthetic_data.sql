@@ -0,0 +1,46 @@
+-- Synthetic articles for benchmarking the scoreboard functions
+-- WARNING: Run this against a scratch database only. It appends rows to articles and article_words
+-- and rebuilds the daily rollups from scratch.
+--
+-- 16 sources x 365 days x 40 articles (233,600 articles, about 1.4M article_words) with a
+-- long-tailed vocabulary so a few words dominate every board, as with real headlines.
+
+insert into articles (source, headline, url, published_date, scraped_date)
+select
+  'source_' || (g % 16),
+  'Synthetic headline ' || g,
+  'https://example.com/synthetic/' || g,
+  timestamp with time zone '2024-01-01 00:00+00' + (g / 640) * interval '1 day' + random() * interval '1 day',
+  now()
+from generate_series(0, 233599) g;
+
+insert into article_words (article_id, word, frequency, created_date)
+select a.id, w.word, 1 + (random() < 0.05)::int, now()
+from articles a
+cross join lateral (
+  -- Log-uniform word ids give a Zipf-like frequency distribution
+  select distinct 'word_' || floor(exp(random() * ln(20000)))::int as word
+  from generate_series(1, 4 + a.id % 5)
+) w
+where a.url like 'https://example.com/synthetic/%';
+
+delete from word_daily_rollup;
+delete from source_daily_totals;
+
+insert into source_daily_totals (day, source, article_count)
+select (published_date at time zone 'UTC')::date, source, count(*)
+from articles
+where published_date is not null
+group by 1, 2;
+
+insert into word_daily_rollup (day, source, word, frequency, article_count)
+select (a.published_date at time zone 'UTC')::date, a.source, aw.word, sum(aw.frequency), count(distinct a.id)
+from article_words aw
+join articles a on a.id = aw.article_id
+where a.published_date is not null
+group by 1, 2, 3;
+
+analyze articles;
+analyze article_words;
+analyze word_daily_rollup;
+analyze source_daily_totals;
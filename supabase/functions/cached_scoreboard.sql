@@ -0,0 +1,29 @@
+-- Function: cached_scoreboard
+-- Description: Get a scoreboard, served from the scoreboard cache for game presets and computed directly otherwise
+
+CREATE OR REPLACE FUNCTION cached_scoreboard(function_name text, start_date timestamp with time zone, end_date timestamp with time zone, sources text[], sources_group_b text[], search_term text, size integer)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  normalized_sources text[] := normalize_sources(sources);
+  normalized_sources_group_b text[] := normalize_sources(sources_group_b);
+  bucket_start timestamp with time zone := scoreboard_day_bucket(start_date);
+  bucket_end timestamp with time zone := scoreboard_day_bucket(end_date);
+BEGIN
+  -- Presets share one entry per UTC day whatever the player's timezone; anything else is not stored
+  if is_preset_scoreboard(function_name, bucket_start, bucket_end, normalized_sources, normalized_sources_group_b, search_term, size) then
+    return preset_scoreboard(function_name, bucket_start, bucket_end, normalized_sources, normalized_sources_group_b, size);
+  end if;
+
+  return compute_scoreboard(
+    function_name,
+    start_date,
+    end_date,
+    normalized_sources,
+    normalized_sources_group_b,
+    nullif(lower(trim(search_term)), ''),
+    size
+  );
+END;
+$$;
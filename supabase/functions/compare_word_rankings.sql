@@ -5,48 +5,28 @@ CREATE OR REPLACE FUNCTION compare_word_rankings(start_date timestamp with time
 RETURNS TABLE (group_name text, word text, avg_percent_group_a numeric, avg_percent_group_b numeric, leaderboard_rank bigint, articles_group_a jsonb, articles_group_b jsonb)
 LANGUAGE sql
 AS $$
-BEGIN
   with word_ranks_a as (
-    select * from aggregate_word_percentages(start_date, end_date, sources_group_a, search_term)
+    select * from rank_word_percentages(start_date, end_date, sources_group_a, search_term)
   ),
   word_ranks_b as (
-    select * from aggregate_word_percentages(start_date, end_date, sources_group_b, search_term)
+    select * from rank_word_percentages(start_date, end_date, sources_group_b, search_term)
   ),
-  combined_rankings as (
+  with_metrics as (
     select
       coalesce(a.word, b.word) as word,
-      case
-        when a.frequency is null then 0
-        else a.frequency
-      end as percent_a,
-      case
-        when b.frequency is null then 0
-        else b.frequency
-      end as percent_b,
-      coalesce(a.articles, '[]'::jsonb) as articles_a,
-      coalesce(b.articles, '[]'::jsonb) as articles_b
+      coalesce(a.frequency, 0)::numeric as avg_percent_group_a,
+      coalesce(b.frequency, 0)::numeric as avg_percent_group_b,
+      coalesce(b.frequency, 0) - coalesce(a.frequency, 0) as percent_difference
     from word_ranks_a a
     full outer join word_ranks_b b on a.word = b.word
   ),
-  with_metrics as (
-    select
-      word,
-      percent_a::numeric as avg_percent_group_a,
-      percent_b::numeric as avg_percent_group_b,
-      percent_b - percent_a as percent_difference,
-      articles_a,
-      articles_b
-    from combined_rankings
-  ),
   group_a_leaders as (
     select
       'Group A' as group_name,
       word,
       avg_percent_group_a,
       avg_percent_group_b,
-      rank() over (order by percent_difference asc) as leaderboard_rank,
-      articles_a as articles_group_a,
-      articles_b as articles_group_b
+      rank() over (order by percent_difference asc) as leaderboard_rank
     from with_metrics
     where percent_difference < 0
     order by percent_difference asc
@@ -58,17 +38,34 @@ BEGIN
       word,
       avg_percent_group_a,
       avg_percent_group_b,
-      rank() over (order by percent_difference desc) as leaderboard_rank,
-      articles_a as articles_group_a,
-      articles_b as articles_group_b
+      rank() over (order by percent_difference desc) as leaderboard_rank
     from with_metrics
     where percent_difference > 0
     order by percent_difference desc
     limit size
+  ),
+  leaders as (
+    select * from group_a_leaders
+    union all
+    select * from group_b_leaders
+  ),
+  -- Article lists are only built for the words that made a leaderboard
+  articles_a as (
+    select * from word_articles(start_date, end_date, sources_group_a, search_term, (select array_agg(word) from leaders))
+  ),
+  articles_b as (
+    select * from word_articles(start_date, end_date, sources_group_b, search_term, (select array_agg(word) from leaders))
   )
-  select * from group_a_leaders
-  union all
-  select * from group_b_leaders
-  order by group_name, leaderboard_rank
-END;
+  select
+    l.group_name,
+    l.word,
+    l.avg_percent_group_a,
+    l.avg_percent_group_b,
+    l.leaderboard_rank,
+    coalesce(aa.articles, '[]'::jsonb) as articles_group_a,
+    coalesce(ab.articles, '[]'::jsonb) as articles_group_b
+  from leaders l
+  left join articles_a aa on aa.word = l.word
+  left join articles_b ab on ab.word = l.word
+  order by l.group_name, l.leaderboard_rank
 $$;
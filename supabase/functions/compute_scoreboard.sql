@@ -0,0 +1,49 @@
+-- Function: compute_scoreboard
+-- Description: Compute a scoreboard as a JSON array of rows, for storing in the scoreboard cache
+
+CREATE OR REPLACE FUNCTION compute_scoreboard(function_name text, start_date timestamp with time zone, end_date timestamp with time zone, sources text[], sources_group_b text[], search_term text, size integer)
+RETURNS jsonb
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  result jsonb;
+BEGIN
+  if function_name in ('get_top_words_scoreboard', 'get_associated_words_scoreboard') then
+    -- Rank and cut to size first so article lists are only built for the returned words
+    with ranked as (
+      select
+        word,
+        frequency,
+        rank() over (order by frequency desc) as rank
+      from rank_word_frequencies(start_date, end_date, sources, search_term)
+    ),
+    top_words as (
+      select word, frequency, rank
+      from ranked
+      where search_term is null or word != lower(trim(search_term))
+      order by frequency desc
+      limit size
+    )
+    select jsonb_agg(
+      jsonb_build_object(
+        'word', tw.word,
+        'frequency', tw.frequency,
+        'rank', tw.rank,
+        'articles', wa.articles
+      )
+      order by tw.rank
+    )
+    into result
+    from top_words tw
+    join word_articles(start_date, end_date, sources, search_term, (select array_agg(word) from top_words)) wa on wa.word = tw.word;
+  elsif function_name in ('get_comparative_words_scoreboard', 'get_comparative_associated_words_scoreboard') then
+    select jsonb_agg(to_jsonb(s) order by s.group_name, s.leaderboard_rank)
+    into result
+    from compare_word_rankings(start_date, end_date, sources, sources_group_b, search_term, size) s;
+  else
+    raise exception 'Unknown scoreboard function: %', function_name;
+  end if;
+
+  return coalesce(result, '[]'::jsonb);
+END;
+$$;
@@ -0,0 +1,45 @@
+-- Function: cooccurrence_word_frequencies
+-- Description: Total word frequencies in the articles mentioning a tracked anchor word for a given time period and sources, using the co-occurrence index for whole days
+
+CREATE OR REPLACE FUNCTION cooccurrence_word_frequencies(start_date timestamp with time zone, end_date timestamp with time zone, sources text[], search_term text)
+RETURNS TABLE (word text, frequency bigint)
+LANGUAGE sql
+AS $$
+  with bounds as (
+    select * from rollup_day_bounds(start_date, end_date)
+  ),
+  edge_articles as (
+    select a.id
+    from articles a
+    -- Check each edge article for the term instead of scanning every article mentioning it
+    cross join lateral (
+      select 1
+      from article_words w
+      where w.article_id = a.id
+        and w.word = lower(trim(search_term))
+      limit 1
+    ) mentions
+    where (sources is null or a.source = any(sources))
+      and (
+        (a.published_date >= start_date and a.published_date < (select head_end from bounds))
+        or (a.published_date >= (select tail_start from bounds) and a.published_date < end_date)
+      )
+  ),
+  counts as (
+    select c.co_word as word, c.frequency
+    from word_cooccurrence c, bounds b
+    where c.word = lower(trim(search_term))
+      and c.day >= b.first_day
+      and c.day < b.end_day
+      and (sources is null or c.source = any(sources))
+    union all
+    select aw.word, aw.frequency
+    from article_words aw
+    join edge_articles ea on aw.article_id = ea.id
+  )
+  select
+    word,
+    sum(frequency) as frequency
+  from counts
+  group by word
+$$;
@@ -0,0 +1,74 @@
+-- Function: cooccurrence_word_percentages
+-- Description: Average percentage of each source's articles mentioning a tracked anchor word that also mention each word, using the co-occurrence index for whole days
+
+CREATE OR REPLACE FUNCTION cooccurrence_word_percentages(start_date timestamp with time zone, end_date timestamp with time zone, sources text[], search_term text)
+RETURNS TABLE (word text, frequency numeric)
+LANGUAGE sql
+AS $$
+  with bounds as (
+    select * from rollup_day_bounds(start_date, end_date)
+  ),
+  edge_articles as (
+    select a.id, a.source
+    from articles a
+    -- Check each edge article for the term instead of scanning every article mentioning it
+    cross join lateral (
+      select 1
+      from article_words w
+      where w.article_id = a.id
+        and w.word = lower(trim(search_term))
+      limit 1
+    ) mentions
+    where (sources is null or a.source = any(sources))
+      and (
+        (a.published_date >= start_date and a.published_date < (select head_end from bounds))
+        or (a.published_date >= (select tail_start from bounds) and a.published_date < end_date)
+      )
+  ),
+  pairs as (
+    select c.co_word, c.source, c.article_count
+    from word_cooccurrence c, bounds b
+    where c.word = lower(trim(search_term))
+      and c.day >= b.first_day
+      and c.day < b.end_day
+      and (sources is null or c.source = any(sources))
+  ),
+  source_totals as (
+    -- The anchor's pair with itself counts the articles mentioning it
+    select
+      source,
+      sum(article_count) as total_articles
+    from (
+      select source, article_count
+      from pairs
+      where co_word = lower(trim(search_term))
+      union all
+      select source, count(*)
+      from edge_articles
+      group by source
+    ) totals
+    group by source
+  ),
+  word_by_source as (
+    select
+      word,
+      source,
+      sum(article_count) as articles_with_word
+    from (
+      select co_word as word, source, article_count
+      from pairs
+      union all
+      select aw.word, ea.source, count(distinct ea.id)
+      from article_words aw
+      join edge_articles ea on aw.article_id = ea.id
+      group by aw.word, ea.source
+    ) counts
+    group by word, source
+  )
+  select
+    wbs.word,
+    avg(wbs.articles_with_word::numeric / st.total_articles * 100) as frequency
+  from word_by_source wbs
+  join source_totals st on wbs.source = st.source
+  group by wbs.word
+$$;
@@ -4,21 +4,25 @@
 CREATE OR REPLACE FUNCTION filter_articles_by_criteria(start_date timestamp with time zone, end_date timestamp with time zone, sources text[], search_term text)
 RETURNS TABLE (id bigint, source text, headline text, url text, published_date timestamp with time zone)
 LANGUAGE sql
+STABLE
 AS $$
-BEGIN
   select id, source, headline, url, published_date
   from articles a
   where a.published_date >= start_date
     and a.published_date < end_date
     and (sources is null or a.source = any(sources))
-    and (
-      search_term is null
-      or exists (
-        select 1
-        from article_words w
-        where w.article_id = a.id
-          and lower(w.word) = lower(search_term)
-      )
+    and search_term is null
+  union all
+  -- Words are stored normalized, so a search starts from the articles containing the term (idx_word_article)
+  select id, source, headline, url, published_date
+  from articles a
+  where a.published_date >= start_date
+    and a.published_date < end_date
+    and (sources is null or a.source = any(sources))
+    and search_term is not null
+    and a.id in (
+      select w.article_id
+      from article_words w
+      where w.word = lower(trim(search_term))
     )
-END;
 $$;
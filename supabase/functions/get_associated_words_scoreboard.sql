@@ -5,10 +5,15 @@ CREATE OR REPLACE FUNCTION get_associated_words_scoreboard(start_date timestamp
 RETURNS TABLE (word text, frequency bigint, rank bigint, articles jsonb)
 LANGUAGE sql
 AS $$
-BEGIN
-  select word, frequency, rank, articles
-  from aggregate_word_frequencies(start_date, end_date, sources, search_term)
-  where lower(word) != lower(search_term)
-  limit size
-END;
+  -- Computed on each call, as search term lookups are not cached (see cached_scoreboard)
+  select *
+  from jsonb_to_recordset(cached_scoreboard(
+    'get_associated_words_scoreboard',
+    start_date,
+    end_date,
+    sources,
+    null,
+    search_term,
+    size
+  )) as s(word text, frequency bigint, rank bigint, articles jsonb)
 $$;
@@ -5,14 +5,15 @@ CREATE OR REPLACE FUNCTION get_comparative_words_scoreboard(start_date timestamp
 RETURNS TABLE (group_name text, word text, avg_percent_group_a numeric, avg_percent_group_b numeric, leaderboard_rank bigint, articles_group_a jsonb, articles_group_b jsonb)
 LANGUAGE sql
 AS $$
-BEGIN
-  select * from compare_word_rankings(
+  -- Game presets are served from the scoreboard cache, which the scraper refreshes after each ingest
+  select *
+  from jsonb_to_recordset(cached_scoreboard(
+    'get_comparative_words_scoreboard',
     start_date,
     end_date,
     sources_group_a,
     sources_group_b,
     null,
     size
-  )
-END;
+  )) as s(group_name text, word text, avg_percent_group_a numeric, avg_percent_group_b numeric, leaderboard_rank bigint, articles_group_a jsonb, articles_group_b jsonb)
 $$;
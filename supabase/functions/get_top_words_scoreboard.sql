@@ -5,9 +5,15 @@ CREATE OR REPLACE FUNCTION get_top_words_scoreboard(start_date timestamp with ti
 RETURNS TABLE (word text, frequency bigint, rank bigint, articles jsonb)
 LANGUAGE sql
 AS $$
-BEGIN
-  select word, frequency, rank, articles
-  from aggregate_word_frequencies(start_date, end_date, sources, null)
-  limit size
-END;
+  -- Game presets are served from the scoreboard cache, which the scraper refreshes after each ingest
+  select *
+  from jsonb_to_recordset(cached_scoreboard(
+    'get_top_words_scoreboard',
+    start_date,
+    end_date,
+    sources,
+    null,
+    null,
+    size
+  )) as s(word text, frequency bigint, rank bigint, articles jsonb)
 $$;
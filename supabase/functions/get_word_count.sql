@@ -5,20 +5,6 @@ CREATE OR REPLACE FUNCTION get_word_count(start_date timestamp with time zone, e
 RETURNS bigint
 LANGUAGE sql
 AS $$
-BEGIN
   select count(*)
-  from articles a
-  where a.published_date >= start_date
-    and a.published_date < end_date
-    and (sources is null or source = any(sources))
-    and (
-      search_term is null
-      or exists (
-        select 1
-        from article_words w
-        where w.article_id = a.id
-          and lower(w.word) = lower(search_term)
-      )
-    )
-END;
+  from filter_articles_by_criteria(start_date, end_date, sources, search_term)
 $$;
@@ -0,0 +1,29 @@
+-- Function: is_preset_scoreboard
+-- Description: Check whether a scoreboard, given with bucketed bounds and normalized sources, is one of the game presets the scoreboard cache stores
+
+CREATE OR REPLACE FUNCTION is_preset_scoreboard(function_name text, start_date timestamp with time zone, end_date timestamp with time zone, sources text[], sources_group_b text[], search_term text, size integer)
+RETURNS boolean
+LANGUAGE sql
+STABLE
+AS $$
+  select
+    -- No search term lookups, and no larger boards than a game can ask for (MAX_SCOREBOARD_SIZE)
+    coalesce(search_term, '') = ''
+    and size between 1 and 50
+    -- Past day or week, last week, past or last month and past or last year, ending by tomorrow
+    and start_date = scoreboard_day_bucket(start_date)
+    and end_date = scoreboard_day_bucket(end_date)
+    and end_date <= scoreboard_day_bucket(now()) + interval '1 day'
+    and (
+      end_date - start_date in (interval '1 day', interval '7 days')
+      or (start_date at time zone 'UTC') + interval '1 month' = (end_date at time zone 'UTC')
+      or (start_date at time zone 'UTC') + interval '1 year' = (end_date at time zone 'UTC')
+    )
+    and exists (
+      select 1
+      from scoreboard_presets() p
+      where p.function_name = is_preset_scoreboard.function_name
+        and p.sources is not distinct from is_preset_scoreboard.sources
+        and p.sources_group_b is not distinct from is_preset_scoreboard.sources_group_b
+    )
+$$;
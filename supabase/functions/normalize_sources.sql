@@ -0,0 +1,13 @@
+-- Function: normalize_sources
+-- Description: Sort and deduplicate a list of sources so equivalent selections share a scoreboard cache entry
+
+CREATE OR REPLACE FUNCTION normalize_sources(sources text[])
+RETURNS text[]
+LANGUAGE sql
+AS $$
+  select
+    case
+      when sources is null then null
+      else coalesce((select array_agg(distinct s order by s) from unnest(sources) s), '{}')
+    end
+$$;
@@ -0,0 +1,60 @@
+-- Function: preset_scoreboard
+-- Description: Get a preset scoreboard from the scoreboard cache, computing and storing it on a miss
+
+CREATE OR REPLACE FUNCTION preset_scoreboard(function_name text, start_date timestamp with time zone, end_date timestamp with time zone, sources text[], sources_group_b text[], size integer)
+RETURNS jsonb
+LANGUAGE plpgsql
+-- Runs as the owner so anonymous players can fill the cache, which is why it only ever stores
+-- presets, computed here
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  cache_sources_key text := coalesce(array_to_string(sources, ','), '*')
+    || coalesce('|' || array_to_string(sources_group_b, ','), '');
+  cached jsonb;
+BEGIN
+  if not is_preset_scoreboard(function_name, start_date, end_date, sources, sources_group_b, null, size) then
+    raise exception 'Not a preset scoreboard: % from % to %', function_name, start_date, end_date;
+  end if;
+
+  select c.result
+  into cached
+  from scoreboard_cache c
+  where c.function_name = preset_scoreboard.function_name
+    and c.start_date = preset_scoreboard.start_date
+    and c.end_date = preset_scoreboard.end_date
+    and c.sources_key = cache_sources_key
+    and c.search_term = ''
+    and c.size = preset_scoreboard.size;
+
+  if cached is not null then
+    -- Record hits at most hourly so hot entries are not rewritten on every game
+    update scoreboard_cache c
+    set last_hit_at = now()
+    where c.function_name = preset_scoreboard.function_name
+      and c.start_date = preset_scoreboard.start_date
+      and c.end_date = preset_scoreboard.end_date
+      and c.sources_key = cache_sources_key
+      and c.search_term = ''
+      and c.size = preset_scoreboard.size
+      and c.last_hit_at < now() - interval '1 hour';
+    return cached;
+  end if;
+
+  cached := compute_scoreboard(function_name, start_date, end_date, sources, sources_group_b, null, size);
+
+  insert into scoreboard_cache as c (
+    function_name, start_date, end_date, sources_key, search_term, size,
+    sources, sources_group_b, result, computed_at, last_hit_at
+  )
+  values (
+    function_name, start_date, end_date, cache_sources_key, '', size,
+    sources, sources_group_b, cached, now(), now()
+  )
+  on conflict on constraint scoreboard_cache_pkey do update
+  set result = excluded.result, computed_at = excluded.computed_at, last_hit_at = excluded.last_hit_at;
+
+  return cached;
+END;
+$$;
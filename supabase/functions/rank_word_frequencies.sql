@@ -0,0 +1,28 @@
+-- Function: rank_word_frequencies
+-- Description: Total word frequencies for a given time period, sources, and search term, without article lists
+
+CREATE OR REPLACE FUNCTION rank_word_frequencies(start_date timestamp with time zone, end_date timestamp with time zone, sources text[], search_term text)
+RETURNS TABLE (word text, frequency bigint)
+LANGUAGE sql
+AS $$
+  with filtered_articles as (
+    select * from filter_articles_by_criteria(start_date, end_date, sources, search_term)
+  )
+  -- Without a search term the totals come from the daily rollup instead of raw rows
+  select word, frequency
+  from rollup_word_frequencies(start_date, end_date, sources)
+  where search_term is null
+  union all
+  -- Search terms tracked in the co-occurrence index read the words around them directly
+  select word, frequency
+  from cooccurrence_word_frequencies(start_date, end_date, sources, search_term)
+  where search_term is not null
+    and exists (select 1 from cooccurrence_anchors ca where ca.word = lower(trim(search_term)))
+  union all
+  select aw.word, sum(aw.frequency) as frequency
+  from article_words as aw
+  join filtered_articles fa on aw.article_id = fa.id
+  where search_term is not null
+    and not exists (select 1 from cooccurrence_anchors ca where ca.word = lower(trim(search_term)))
+  group by aw.word
+$$;
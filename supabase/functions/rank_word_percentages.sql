@@ -0,0 +1,46 @@
+-- Function: rank_word_percentages
+-- Description: Average percentage of each source's articles mentioning a word for a given time period, sources, and search term, without article lists
+
+CREATE OR REPLACE FUNCTION rank_word_percentages(start_date timestamp with time zone, end_date timestamp with time zone, sources text[], search_term text)
+RETURNS TABLE (word text, frequency numeric)
+LANGUAGE sql
+AS $$
+  with filtered_articles as (
+    select * from filter_articles_by_criteria(start_date, end_date, sources, search_term)
+  ),
+  source_totals as (
+    select
+      source,
+      count(distinct id) as total_articles
+    from filtered_articles
+    group by source
+  ),
+  word_by_source as (
+    select
+      aw.word,
+      fa.source,
+      count(distinct fa.id) as articles_with_word
+    from article_words as aw
+    join filtered_articles fa on aw.article_id = fa.id
+    group by aw.word, fa.source
+  )
+  -- Without a search term the percentages come from the daily rollups instead of raw rows
+  select word, frequency
+  from rollup_word_percentages(start_date, end_date, sources)
+  where search_term is null
+  union all
+  -- Search terms tracked in the co-occurrence index read the words around them directly
+  select word, frequency
+  from cooccurrence_word_percentages(start_date, end_date, sources, search_term)
+  where search_term is not null
+    and exists (select 1 from cooccurrence_anchors ca where ca.word = lower(trim(search_term)))
+  union all
+  select
+    wbs.word,
+    avg(wbs.articles_with_word::numeric / st.total_articles * 100) as frequency
+  from word_by_source wbs
+  join source_totals st on wbs.source = st.source
+  where search_term is not null
+    and not exists (select 1 from cooccurrence_anchors ca where ca.word = lower(trim(search_term)))
+  group by wbs.word
+$$;
@@ -0,0 +1,60 @@
+-- Function: refresh_scoreboard_cache
+-- Description: Recompute the most played cached scoreboards whose time period overlaps newly ingested articles, and drop the other overlapping entries and those no longer played
+
+CREATE OR REPLACE FUNCTION refresh_scoreboard_cache(changed_start timestamp with time zone, changed_end timestamp with time zone, max_refreshed integer DEFAULT 50)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  entry record;
+  refreshed integer := 0;
+BEGIN
+  -- Entries not played for a week, or stored before the cache was limited to presets
+  delete from scoreboard_cache c
+  where c.last_hit_at < now() - interval '7 days'
+    or not is_preset_scoreboard(c.function_name, c.start_date, c.end_date, c.sources, c.sources_group_b, c.search_term, c.size);
+
+  -- A null bound leaves that side of the changed period open. Only the most recently played
+  -- entries are recomputed; the rest are stale, so they are dropped and recomputed on their next hit
+  for entry in
+    select *
+    from scoreboard_cache c
+    where (changed_end is null or c.start_date <= changed_end)
+      and (changed_start is null or c.end_date > changed_start)
+    order by c.last_hit_at desc
+  loop
+    if refreshed >= max_refreshed then
+      delete from scoreboard_cache c
+      where c.function_name = entry.function_name
+        and c.start_date = entry.start_date
+        and c.end_date = entry.end_date
+        and c.sources_key = entry.sources_key
+        and c.search_term = entry.search_term
+        and c.size = entry.size;
+      continue;
+    end if;
+
+    update scoreboard_cache c
+    set
+      result = compute_scoreboard(
+        entry.function_name,
+        entry.start_date,
+        entry.end_date,
+        entry.sources,
+        entry.sources_group_b,
+        null,
+        entry.size
+      ),
+      computed_at = now()
+    where c.function_name = entry.function_name
+      and c.start_date = entry.start_date
+      and c.end_date = entry.end_date
+      and c.sources_key = entry.sources_key
+      and c.search_term = entry.search_term
+      and c.size = entry.size;
+    refreshed := refreshed + 1;
+  end loop;
+
+  return refreshed;
+END;
+$$;
@@ -0,0 +1,24 @@
+-- Function: rollup_day_bounds
+-- Description: Split a time period into whole UTC days served by the daily rollups and partial days at either end that must be read from raw rows
+
+CREATE OR REPLACE FUNCTION rollup_day_bounds(start_date timestamp with time zone, end_date timestamp with time zone)
+RETURNS TABLE (first_day date, end_day date, head_end timestamp with time zone, tail_start timestamp with time zone)
+LANGUAGE sql
+ROWS 1
+AS $$
+  with days as (
+    select
+      case
+        when (start_date at time zone 'UTC')::time = '00:00' then (start_date at time zone 'UTC')::date
+        else (start_date at time zone 'UTC')::date + 1
+      end as first_day,
+      (end_date at time zone 'UTC')::date as end_day
+  )
+  -- Whole days are [first_day, end_day), raw rows cover [start_date, head_end) and [tail_start, end_date)
+  select
+    first_day,
+    end_day,
+    least(end_date, first_day::timestamp at time zone 'UTC') as head_end,
+    greatest(start_date, first_day::timestamp at time zone 'UTC', end_day::timestamp at time zone 'UTC') as tail_start
+  from days
+$$;
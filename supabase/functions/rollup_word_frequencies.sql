@@ -0,0 +1,36 @@
+-- Function: rollup_word_frequencies
+-- Description: Total word frequencies for a given time period and sources, using the daily rollup for whole days
+
+CREATE OR REPLACE FUNCTION rollup_word_frequencies(start_date timestamp with time zone, end_date timestamp with time zone, sources text[])
+RETURNS TABLE (word text, frequency bigint)
+LANGUAGE sql
+AS $$
+  with bounds as (
+    select * from rollup_day_bounds(start_date, end_date)
+  ),
+  edge_articles as (
+    select a.id
+    from articles a
+    where (sources is null or a.source = any(sources))
+      and (
+        (a.published_date >= start_date and a.published_date < (select head_end from bounds))
+        or (a.published_date >= (select tail_start from bounds) and a.published_date < end_date)
+      )
+  ),
+  counts as (
+    select r.word, r.frequency
+    from word_daily_rollup r, bounds b
+    where r.day >= b.first_day
+      and r.day < b.end_day
+      and (sources is null or r.source = any(sources))
+    union all
+    select aw.word, aw.frequency
+    from article_words aw
+    join edge_articles ea on aw.article_id = ea.id
+  )
+  select
+    word,
+    sum(frequency) as frequency
+  from counts
+  group by word
+$$;
@@ -0,0 +1,62 @@
+-- Function: rollup_word_percentages
+-- Description: Average percentage of each source's articles mentioning a word for a given time period and sources, using the daily rollups for whole days
+
+CREATE OR REPLACE FUNCTION rollup_word_percentages(start_date timestamp with time zone, end_date timestamp with time zone, sources text[])
+RETURNS TABLE (word text, frequency numeric)
+LANGUAGE sql
+AS $$
+  with bounds as (
+    select * from rollup_day_bounds(start_date, end_date)
+  ),
+  edge_articles as (
+    select a.id, a.source
+    from articles a
+    where (sources is null or a.source = any(sources))
+      and (
+        (a.published_date >= start_date and a.published_date < (select head_end from bounds))
+        or (a.published_date >= (select tail_start from bounds) and a.published_date < end_date)
+      )
+  ),
+  source_totals as (
+    select
+      source,
+      sum(article_count) as total_articles
+    from (
+      select t.source, t.article_count
+      from source_daily_totals t, bounds b
+      where t.day >= b.first_day
+        and t.day < b.end_day
+        and (sources is null or t.source = any(sources))
+      union all
+      select source, count(*)
+      from edge_articles
+      group by source
+    ) totals
+    group by source
+  ),
+  word_by_source as (
+    select
+      word,
+      source,
+      sum(article_count) as articles_with_word
+    from (
+      select r.word, r.source, r.article_count
+      from word_daily_rollup r, bounds b
+      where r.day >= b.first_day
+        and r.day < b.end_day
+        and (sources is null or r.source = any(sources))
+      union all
+      select aw.word, ea.source, count(distinct ea.id)
+      from article_words aw
+      join edge_articles ea on aw.article_id = ea.id
+      group by aw.word, ea.source
+    ) counts
+    group by word, source
+  )
+  select
+    wbs.word,
+    avg(wbs.articles_with_word::numeric / st.total_articles * 100) as frequency
+  from word_by_source wbs
+  join source_totals st on wbs.source = st.source
+  group by wbs.word
+$$;
@@ -0,0 +1,10 @@
+-- Function: scoreboard_day_bucket
+-- Description: Round a period bound to the nearest UTC midnight, so the local-midnight bounds sent by players in every timezone share one scoreboard cache key
+
+CREATE OR REPLACE FUNCTION scoreboard_day_bucket(value timestamp with time zone)
+RETURNS timestamp with time zone
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  select date_trunc('day', (value at time zone 'UTC') + interval '12 hours') at time zone 'UTC'
+$$;
@@ -0,0 +1,23 @@
+-- Function: scoreboard_presets
+-- Description: List the source selections whose scoreboards are cached: all sources and the standard groups for top words, and the compare presets (COMPARE_PRESETS in the frontend) for comparative words
+
+CREATE OR REPLACE FUNCTION scoreboard_presets()
+RETURNS TABLE (function_name text, sources text[], sources_group_b text[])
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  with source_groups (group_a, group_b) as (
+    -- Sorted as normalize_sources leaves them
+    values
+      ('{guardian,npr,nyt,washington_post}'::text[], '{fox_news,new_york_post,newsmax,wall_street_journal}'::text[]),
+      ('{abc,cbs,los_angeles_times,nbc_news,npr,nyt,washington_post}'::text[], '{al_jazeera,bbc,guardian}'::text[]),
+      ('{fox_news,guardian,wall_street_journal}'::text[], '{abc,axios,bbc,cbs,npr}'::text[])
+  )
+  select 'get_top_words_scoreboard', null::text[], null::text[]
+  union all
+  select 'get_top_words_scoreboard', g.sources, null
+  from source_groups, lateral (values (group_a), (group_b)) as g(sources)
+  union all
+  select 'get_comparative_words_scoreboard', p.sources, p.sources_group_b
+  from source_groups, lateral (values (group_a, group_b), (group_b, group_a)) as p(sources, sources_group_b)
+$$;
@@ -0,0 +1,46 @@
+-- Function: word_articles
+-- Description: Get the articles mentioning each of the given words for a given time period, sources, and search term
+
+CREATE OR REPLACE FUNCTION word_articles(start_date timestamp with time zone, end_date timestamp with time zone, sources text[], search_term text, words text[])
+RETURNS TABLE (word text, articles jsonb)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  word_matches text;
+BEGIN
+  IF end_date - start_date <= interval '31 days' THEN
+    -- Short ranges: look words up per article so the cost follows the articles in range
+    word_matches := '
+      filter_articles_by_criteria($1, $2, $3, $4) fa
+      cross join lateral (
+        select w.word
+        from article_words w
+        where w.article_id = fa.id
+          and w.word = any($5)
+        offset 0
+      ) aw';
+  ELSE
+    -- Long ranges: most of each word''s history is in range, so read it by word instead
+    word_matches := '
+      filter_articles_by_criteria($1, $2, $3, $4) fa
+      join article_words aw on aw.article_id = fa.id and aw.word = any($5)';
+  END IF;
+
+  -- Planned per call with the actual arguments rather than a generic plan
+  RETURN QUERY EXECUTE format('
+    select
+      aw.word::text,
+      jsonb_agg(
+        jsonb_build_object(
+          ''id'', fa.id,
+          ''url'', fa.url,
+          ''source'', fa.source,
+          ''headline'', fa.headline,
+          ''published_date'', fa.published_date
+        )
+      )
+    from %s
+    group by aw.word', word_matches)
+  USING start_date, end_date, sources, search_term, words;
+END;
+$$;
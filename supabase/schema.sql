@@ -111,6 +111,11 @@ CREATE TABLE public.compare_guesses (
   CONSTRAINT compare_guesses_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id),
   CONSTRAINT compare_guesses_game_id_fkey1 FOREIGN KEY (game_id) REFERENCES public.compare_games(id)
 );
+CREATE TABLE public.cooccurrence_anchors (
+  word character varying NOT NULL,
+  promoted_date timestamp without time zone,
+  CONSTRAINT cooccurrence_anchors_pkey PRIMARY KEY (word)
+);
 CREATE TABLE public.games (
   id text NOT NULL DEFAULT gen_random_uuid(),
   score integer NOT NULL DEFAULT 0,
@@ -140,6 +145,20 @@ CREATE TABLE public.guesses (
   CONSTRAINT guesses_game_id_fkey FOREIGN KEY (game_id) REFERENCES public.games(id),
   CONSTRAINT guesses_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.users(id)
 );
+CREATE TABLE public.scoreboard_cache (
+  function_name text NOT NULL,
+  start_date timestamp with time zone NOT NULL,
+  end_date timestamp with time zone NOT NULL,
+  sources_key text NOT NULL,
+  search_term text NOT NULL DEFAULT ''::text,
+  size integer NOT NULL,
+  sources ARRAY,
+  sources_group_b ARRAY,
+  result jsonb NOT NULL,
+  computed_at timestamp with time zone NOT NULL DEFAULT now(),
+  last_hit_at timestamp with time zone NOT NULL DEFAULT now(),
+  CONSTRAINT scoreboard_cache_pkey PRIMARY KEY (function_name, start_date, end_date, sources_key, search_term, size)
+);
 CREATE TABLE public.scraping_logs (
   id integer NOT NULL DEFAULT nextval('scraping_logs_id_seq'::regclass),
   source character varying NOT NULL,
@@ -149,8 +168,21 @@ CREATE TABLE public.scraping_logs (
   start_time timestamp without time zone,
   end_time timestamp without time zone,
   duration_seconds double precision,
+  fetch_seconds double precision,
+  fetch_bytes integer,
+  fetch_latency_seconds double precision,
+  parse_seconds double precision,
+  tokenize_seconds double precision,
+  write_seconds double precision,
+  articles_skipped integer,
   CONSTRAINT scraping_logs_pkey PRIMARY KEY (id)
 );
+CREATE TABLE public.source_daily_totals (
+  day date NOT NULL,
+  source character varying NOT NULL,
+  article_count integer NOT NULL,
+  CONSTRAINT source_daily_totals_pkey PRIMARY KEY (day, source)
+);
 CREATE TABLE public.users (
   id text NOT NULL,
   email text NOT NULL,
@@ -163,3 +195,20 @@ CREATE TABLE public.users (
   updated_at timestamp without time zone NOT NULL,
   CONSTRAINT users_pkey PRIMARY KEY (id)
 );
+CREATE TABLE public.word_cooccurrence (
+  word character varying NOT NULL,
+  day date NOT NULL,
+  source character varying NOT NULL,
+  co_word character varying NOT NULL,
+  frequency integer NOT NULL,
+  article_count integer NOT NULL,
+  CONSTRAINT word_cooccurrence_pkey PRIMARY KEY (word, day, source, co_word)
+);
+CREATE TABLE public.word_daily_rollup (
+  day date NOT NULL,
+  source character varying NOT NULL,
+  word character varying NOT NULL,
+  frequency integer NOT NULL,
+  article_count integer NOT NULL,
+  CONSTRAINT word_daily_rollup_pkey PRIMARY KEY (day, source, word)
+);